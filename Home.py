@@ -198,6 +198,7 @@ tools = [
     ("📈", "Financial Ratios Dashboard", "Financial Statement Dashboard", False),
     ("🏦", "Bond Pricing Tool", "Bond Pricing Tool", False),
     ("🧮", "WACC Calculator", "WACC Calculator", False),
+    ("🏠", "Loan Amortization Schedule", "Loan Amortization Schedule", False),
 ]
 
 cols = st.columns(3)
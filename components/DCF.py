@@ -1,8 +1,159 @@
+import io
+import os
+import tempfile
+
 import streamlit as st
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from components.dcf_engine import (
+    ASSUMPTION_PROFILES,
+    assumption_path,
+    cached_valuation,
+    projection_table,
+    sensitivity_grid,
+)
+from components.dcf_batch import COMPANY_COLUMNS, DEFAULT_CHUNK_ROWS, FADE_COLUMNS, run_batch
+from components.dcf_simulation import DISTRIBUTIONS, DRIVERS, simulate_dcf, sketch_summary
+from components.goal_seek import dcf_model
+from components.goal_seek_tool import render_goal_seek
+from components.sensitivity_tool import render_sensitivity
 from components.utils import scroll_top
 
 scroll_top()
 
+GRID_OUTPUTS = {
+    "Value per Share": "value_per_share",
+    "Enterprise Value": "enterprise_value",
+    "Equity Value": "equity_value",
+}
+
+
+SIMULATION_BREAKDOWN = {
+    "PV of Forecast FCFs": "pv_fcfs",
+    "PV of Terminal Value": "pv_terminal",
+    "Undiscounted Terminal Value": "terminal_value",
+    "Enterprise Value": "enterprise_value",
+    "Equity Value": "equity_value",
+    "Value per Share": "value_per_share",
+}
+SENSITIVITY_DRIVERS = {
+    "revenue_growth": "Revenue Growth",
+    "ebit_margin": "EBIT Margin",
+    "capex_percent": "Capex % of Revenue",
+    "tax_rate": "Tax Rate",
+    "wacc": "WACC",
+    "terminal_growth": "Terminal Growth",
+    "starting_revenue": "Current Revenue",
+    "net_debt": "Net Debt",
+}
+DEFAULT_CORRELATION = np.array([
+    [1.0, 0.3, 0.2, 0.0],
+    [0.3, 1.0, 0.0, 0.0],
+    [0.2, 0.0, 1.0, 0.0],
+    [0.0, 0.0, 0.0, 1.0],
+])
+
+
+def sensitivity_heatmap(values, wacc_values, growth_values, title):
+    """Heatmap table of a WACC x terminal-growth grid; NaN cells (r <= g) stay blank."""
+    fig = go.Figure(go.Heatmap(
+        z=values,
+        x=[f"{g:.2f}%" for g in growth_values],
+        y=[f"{w:.2f}%" for w in wacc_values],
+        colorscale="RdYlGn",
+        texttemplate="%{z:,.2f}",
+        hoverongaps=False,
+        colorbar=dict(title="$"),
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title="Terminal Growth Rate",
+        yaxis_title="WACC",
+        yaxis_autorange="reversed",
+        template="simple_white",
+        height=120 + 45 * len(wacc_values)
+    )
+    return fig
+
+
+def render_dcf_batch():
+    st.markdown("---")
+    st.header("📥 Batch Valuation (Company Universe)")
+
+    st.markdown(f"""
+Upload a **CSV or Parquet** file with one company per row and the columns:
+
+`{', '.join(COMPANY_COLUMNS)}`
+
+Rates are in percent, as above, and `years` may differ from company to company.
+Optional `{'`, `'.join(FADE_COLUMNS)}` columns fade growth and the margin linearly
+to the final forecast year. The file is read in chunks that are valued across
+worker processes, so universes of hundreds of thousands of companies fit in memory.
+Run `python -m components.dcf_batch assumptions.csv results.parquet` for files
+too large to upload.
+""")
+
+    colA, colB, colC = st.columns(3)
+
+    with colA:
+        uploaded = st.file_uploader("Company file", type=["csv", "parquet"], key="dcf_batch_file")
+
+    with colB:
+        processes = st.number_input(
+            "Worker Processes", min_value=1, max_value=64, value=min(os.cpu_count() or 1, 64), step=1
+        )
+
+    with colC:
+        chunk_rows = st.number_input(
+            "Companies per Chunk", min_value=1_000, value=DEFAULT_CHUNK_ROWS, step=1_000
+        )
+
+    if uploaded is None:
+        st.session_state.pop("dcf_batch", None)
+        return
+
+    # The universe is only valued on request; results stay in session state so
+    # other widgets on the page rerun without starting a new process pool.
+    upload_id = getattr(uploaded, "file_id", uploaded.name)
+    batch = st.session_state.get("dcf_batch")
+    if batch is not None and batch["upload_id"] != upload_id:
+        batch = st.session_state["dcf_batch"] = None
+
+    if st.button("Run Batch Valuation", use_container_width=True):
+        with tempfile.TemporaryFile() as output:
+            try:
+                with st.spinner("Valuing companies..."):
+                    stats = run_batch(uploaded, output, int(chunk_rows), int(processes), file_format="csv")
+            except (ValueError, KeyError) as exc:
+                st.error(f"Could not value the uploaded companies: {exc}")
+                return
+            output.seek(0)
+            batch = st.session_state["dcf_batch"] = {
+                "upload_id": upload_id, "stats": stats, "results_csv": output.read()
+            }
+
+    if batch is None:
+        return
+
+    stats, results_csv = batch["stats"], batch["results_csv"]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("🏢 Companies", f"{stats['companies']:,}")
+    col2.metric("⏱️ Run Time", f"{stats['seconds']:.2f} s")
+    col3.metric("⚡ Throughput", f"{stats['companies_per_second']:,.0f} / s")
+
+    st.subheader("📋 Valuations (first 1,000 companies)")
+    st.dataframe(pd.read_csv(io.BytesIO(results_csv), nrows=1_000), use_container_width=True)
+
+    st.download_button(
+        "Download valuations (CSV)",
+        results_csv,
+        file_name="dcf_valuations.csv",
+        mime="text/csv",
+    )
+
+
 def render_dcf_tool():
 
     # ---------------------------------------------------------
@@ -51,6 +202,19 @@ def render_dcf_tool():
         wc_percent = st.number_input("Change in Working Capital as % of Revenue [%]", value=2.0, step=0.5)
         da_percent = st.number_input("Depreciation & Amortisation as % of Revenue [%]", value=4.0, step=0.5)
 
+    profile = st.radio("Growth & Margin Profile", ASSUMPTION_PROFILES, horizontal=True)
+
+    final_growth, final_margin = revenue_growth, ebit_margin
+    if profile == "Linear Fade":
+        col_f1, col_f2 = st.columns(2)
+        with col_f1:
+            final_growth = st.number_input("Final-Year Revenue Growth Rate [%]", value=2.0, step=0.5)
+        with col_f2:
+            final_margin = st.number_input("Final-Year EBIT Margin [%]", value=20.0, step=0.5)
+        st.caption(
+            "Revenue growth fades and the EBIT margin ramps in equal steps from year 1 to the final forecast year."
+        )
+
     st.markdown("---")
 
     # ---------------------------------------------------------
@@ -81,64 +245,96 @@ def render_dcf_tool():
     st.markdown("---")
 
     # ---------------------------------------------------------
-    # CALCULATION
+    # SENSITIVITY GRID SETTINGS
     # ---------------------------------------------------------
-    if st.button("Run DCF Valuation", use_container_width=True):
+    with st.expander("Sensitivity Grid Settings (WACC × Terminal Growth)"):
+        col_s1, col_s2, col_s3 = st.columns(3)
 
-        r = wacc / 100.0
-        g = terminal_growth / 100.0
-        t = tax_rate / 100.0
-        rev_growth = revenue_growth / 100.0
-        ebit_m = ebit_margin / 100.0
-        capex_p = capex_percent / 100.0
-        wc_p = wc_percent / 100.0
-        da_p = da_percent / 100.0
-
-        revenues = []
-        ebits = []
-        taxes = []
-        da_list = []
-        capex_list = []
-        wc_changes = []
-        fcfs = []
-
-        revenue = starting_revenue
-
-        for year in range(1, int(years) + 1):
-            revenue = revenue * (1 + rev_growth)
-            revenues.append(revenue)
-
-            ebit = revenue * ebit_m
-            ebits.append(ebit)
+        with col_s1:
+            wacc_step = st.number_input("WACC Step [%]", min_value=0.05, value=0.5, step=0.05)
+            wacc_points = st.number_input("WACC Points", min_value=3, max_value=41, value=7, step=2)
 
-            tax = ebit * t
-            taxes.append(tax)
+        with col_s2:
+            growth_step = st.number_input("Terminal Growth Step [%]", min_value=0.05, value=0.5, step=0.05)
+            growth_points = st.number_input("Terminal Growth Points", min_value=3, max_value=41, value=7, step=2)
 
-            da = revenue * da_p
-            da_list.append(da)
+        with col_s3:
+            grid_output = st.selectbox("Show", list(GRID_OUTPUTS.keys()))
+            margin_step = st.number_input(
+                "EBIT Margin Step [pp] (0 = no margin axis)", min_value=0.0, value=0.0, step=0.5
+            )
 
-            capex = revenue * capex_p
-            capex_list.append(capex)
-
-            wc_change = revenue * wc_p
-            wc_changes.append(wc_change)
+    # ---------------------------------------------------------
+    # MONTE CARLO SETTINGS
+    # ---------------------------------------------------------
+    with st.expander("Monte Carlo Settings (Correlated Drivers)"):
+        run_simulation = st.toggle("Also run a Monte Carlo valuation")
+
+        col_m1, col_m2 = st.columns(2)
+        with col_m1:
+            n_paths = int(st.number_input(
+                "Number of Paths", min_value=1_000, max_value=10_000_000, value=200_000, step=100_000
+            ))
+        with col_m2:
+            seed = int(st.number_input("Random Seed", min_value=0, value=42, step=1))
+
+        st.markdown("**Driver uncertainty** (spread in percentage points: standard deviation for Normal, ± range otherwise)")
+        driver_table = st.data_editor(
+            pd.DataFrame({
+                "Driver": list(DRIVERS.values()),
+                "Distribution": ["Normal", "Normal", "Uniform", "Normal"],
+                "Spread [pp]": [2.0, 2.0, 1.0, 1.0],
+            }),
+            disabled=["Driver"],
+            hide_index=True,
+            num_rows="fixed",
+            use_container_width=True,
+            column_config={"Distribution": st.column_config.SelectboxColumn(options=DISTRIBUTIONS, required=True)},
+        )
+
+        st.markdown("**Correlation matrix**")
+        correlation_table = st.data_editor(
+            pd.DataFrame(DEFAULT_CORRELATION, index=list(DRIVERS.values()), columns=list(DRIVERS.values())),
+            use_container_width=True,
+        )
 
-            fcf = ebit * (1 - t) + da - capex - wc_change
-            fcfs.append(fcf)
+    # ---------------------------------------------------------
+    # CALCULATION
+    # ---------------------------------------------------------
+    if st.button("Run DCF Valuation", use_container_width=True):
 
-        pv_fcfs = sum(fcf / ((1 + r) ** (i + 1)) for i, fcf in enumerate(fcfs))
+        r = wacc / 100.0
+        g = terminal_growth / 100.0
 
-        last_fcf = fcfs[-1]
-        if r <= g:
-            terminal_value = float("nan")
-            pv_terminal = float("nan")
+        # Per-year growth and margin vectors; the projection, its present
+        # value and the equity bridge are cached separately, so an edit only
+        # recomputes the stages that depend on it.
+        result, recomputed = cached_valuation(
+            starting_revenue,
+            assumption_path(revenue_growth / 100.0, final_growth / 100.0, years, profile),
+            assumption_path(ebit_margin / 100.0, final_margin / 100.0, years, profile),
+            tax_rate / 100.0,
+            da_percent / 100.0,
+            capex_percent / 100.0,
+            wc_percent / 100.0,
+            years,
+            r,
+            g,
+            net_debt,
+            shares_outstanding,
+        )
+
+        pv_fcfs = float(result["pv_fcfs"])
+        terminal_value = float(result["terminal_value"])
+        pv_terminal = float(result["pv_terminal"])
+        enterprise_value = float(result["enterprise_value"])
+        equity_value = float(result["equity_value"])
+        value_per_share = float(result["value_per_share"])
+
+        if recomputed:
+            st.caption(f"Recomputed: {', '.join(recomputed)}; everything else came from the cache.")
         else:
-            terminal_value = last_fcf * (1 + g) / (r - g)
-            pv_terminal = terminal_value / ((1 + r) ** years)
-
-        enterprise_value = pv_fcfs + pv_terminal
-        equity_value = enterprise_value - net_debt
-        value_per_share = equity_value / shares_outstanding if shares_outstanding > 0 else float("nan")
+            st.caption("Served entirely from the cache.")
 
         # ---------------------------------------------------------
         # OUTPUT
@@ -150,6 +346,126 @@ def render_dcf_tool():
 
         st.markdown("---")
 
+        st.markdown("### 📈 Projected Free Cash Flows")
+
+        table = projection_table(result).rename(columns={
+            "revenue": "Revenue",
+            "ebit": "EBIT",
+            "tax": "Taxes",
+            "da": "D&A",
+            "capex": "Capex",
+            "wc_change": "Δ Working Capital",
+            "fcff": "FCFF",
+            "pv_fcff": "PV of FCFF",
+        })
+        st.dataframe(table.style.format("${:,.0f}"), use_container_width=True)
+
+        st.markdown("---")
+
+        # ---------------------------------------------------------
+        # SENSITIVITY GRID
+        # ---------------------------------------------------------
+        st.markdown("### 🧮 Sensitivity: WACC × Terminal Growth")
+
+        wacc_values = wacc + wacc_step * (np.arange(wacc_points) - wacc_points // 2)
+        growth_values = terminal_growth + growth_step * (np.arange(growth_points) - growth_points // 2)
+        margin_shifts = margin_step * np.array([-1.0, 0.0, 1.0]) if margin_step > 0 else None
+
+        # The FCFF stream is projected once; every cell only re-discounts it
+        grid = sensitivity_grid(
+            result["fcff"], wacc_values / 100.0, growth_values / 100.0, net_debt, shares_outstanding,
+            None if margin_shifts is None else margin_shifts / 100.0, result["revenue"], tax_rate / 100.0,
+        )[GRID_OUTPUTS[grid_output]]
+
+        if margin_shifts is None:
+            st.plotly_chart(
+                sensitivity_heatmap(grid, wacc_values, growth_values, grid_output), use_container_width=True
+            )
+        else:
+            tabs = st.tabs([f"EBIT Margin {ebit_margin + shift:.2f}%" for shift in margin_shifts])
+            for tab, shift, layer in zip(tabs, margin_shifts, grid):
+                with tab:
+                    st.plotly_chart(
+                        sensitivity_heatmap(
+                            layer, wacc_values, growth_values,
+                            f"{grid_output} (EBIT margin {shift:+.2f} pp)"
+                        ),
+                        use_container_width=True
+                    )
+
+        st.caption("Blank cells have WACC ≤ terminal growth, where the terminal value is undefined.")
+
+        st.markdown("---")
+
+        # ---------------------------------------------------------
+        # MONTE CARLO VALUATION
+        # ---------------------------------------------------------
+        if run_simulation:
+            st.markdown("### 🎲 Monte Carlo Valuation")
+
+            base = {
+                "starting_revenue": starting_revenue,
+                "revenue_growth": assumption_path(revenue_growth / 100.0, final_growth / 100.0, years, profile),
+                "ebit_margin": assumption_path(ebit_margin / 100.0, final_margin / 100.0, years, profile),
+                "tax_rate": tax_rate / 100.0,
+                "da_percent": da_percent / 100.0,
+                "capex_percent": capex_percent / 100.0,
+                "wc_percent": wc_percent / 100.0,
+                "years": years,
+                "wacc": r,
+                "terminal_growth": g,
+                "net_debt": net_debt,
+                "shares_outstanding": shares_outstanding,
+            }
+            drivers = {
+                key: (row["Distribution"], row["Spread [pp]"] / 100.0)
+                for key, (_, row) in zip(DRIVERS, driver_table.iterrows())
+            }
+
+            try:
+                with st.spinner(f"Simulating {n_paths:,} paths..."):
+                    sketches = simulate_dcf(base, drivers, correlation_table.to_numpy(dtype=float), n_paths, seed=seed)
+            except ValueError as exc:
+                st.error(f"Could not run the simulation: {exc}")
+            else:
+                per_share = sketches["value_per_share"]
+
+                col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+                col_r1.metric("Mean Value per Share", f"${per_share.mean:,.2f}")
+                col_r2.metric("5th Percentile", f"${per_share.percentile(5):,.2f}")
+                col_r3.metric("95th Percentile", f"${per_share.percentile(95):,.2f}")
+                col_r4.metric("P(Value < Base Case)", f"{per_share.cdf(value_per_share) * 100:.1f}%")
+
+                breakdown = pd.DataFrame(
+                    {label: sketch_summary(sketches[key]) for label, key in SIMULATION_BREAKDOWN.items()}
+                ).T.rename(columns={"mean": "Mean", "std": "Std. Dev.", "p5": "P5", "p25": "P25",
+                                    "p50": "Median", "p75": "P75", "p95": "P95"})
+                st.dataframe(breakdown.style.format("${:,.2f}"), use_container_width=True)
+
+                counts, edges = per_share.histogram()
+                fig = go.Figure(go.Bar(
+                    x=0.5 * (edges[:-1] + edges[1:]), y=counts, width=np.diff(edges), marker_color="#58a6ff"
+                ))
+                fig.add_vline(x=value_per_share, line_dash="dash", annotation_text="Base case")
+                fig.update_layout(
+                    title="Simulated Value per Share",
+                    xaxis_title="Value per Share ($)",
+                    yaxis_title="Paths",
+                    bargap=0,
+                    template="simple_white",
+                    height=400
+                )
+                st.plotly_chart(fig, use_container_width=True)
+                st.caption("The chart shows the 0.1st to 99.9th percentile; the extreme tails are left out.")
+
+                if per_share.missing:
+                    st.caption(
+                        f"{per_share.missing:,} paths drew a WACC at or below the terminal growth rate "
+                        "and have no terminal value; they are left out."
+                    )
+
+            st.markdown("---")
+
         # ---------------------------------------------------------
         # PREMIUM CARD‑STYLE SUMMARY
         # ---------------------------------------------------------
@@ -183,7 +499,8 @@ def render_dcf_tool():
             <b>WACC:</b> {wacc:.2f}%<br>
             <b>Terminal growth rate:</b> {terminal_growth:.2f}%<br>
             <b>Tax rate:</b> {tax_rate:.2f}%<br>
-            <b>EBIT margin:</b> {ebit_margin:.2f}%<br>
+            <b>Revenue growth:</b> {revenue_growth:.2f}%{f" → {final_growth:.2f}%" if profile == "Linear Fade" else ""}<br>
+            <b>EBIT margin:</b> {ebit_margin:.2f}%{f" → {final_margin:.2f}%" if profile == "Linear Fade" else ""}<br>
             <b>Capex % of revenue:</b> {capex_percent:.2f}%<br>
             <b>D&A % of revenue:</b> {da_percent:.2f}%<br>
             <b>Δ Working capital % of revenue:</b> {wc_percent:.2f}%<br>
@@ -194,6 +511,46 @@ def render_dcf_tool():
 
         st.markdown("---")
 
+    # ---------------------------------------------------------
+    # SPIDER CHART & TOP DRIVERS
+    # ---------------------------------------------------------
+    model_inputs = {
+        "starting_revenue": starting_revenue,
+        "revenue_growth": revenue_growth / 100,
+        "ebit_margin": ebit_margin / 100,
+        "tax_rate": tax_rate / 100,
+        "da_percent": da_percent / 100,
+        "capex_percent": capex_percent / 100,
+        "wc_percent": wc_percent / 100,
+        "years": int(years),
+        "wacc": wacc / 100,
+        "terminal_growth": terminal_growth / 100,
+        "net_debt": net_debt,
+        "shares_outstanding": shares_outstanding,
+    }
+    if profile == "Linear Fade":
+        model_inputs["final_revenue_growth"] = final_growth / 100
+        model_inputs["final_ebit_margin"] = final_margin / 100
+
+    st.markdown("---")
+    st.subheader("🕸️ Spider Chart & Top Drivers")
+
+    render_sensitivity(
+        lambda **inputs: dcf_model(**inputs)["value_per_share"],
+        model_inputs, SENSITIVITY_DRIVERS, "Value per Share", key="dcf_spider"
+    )
+
+    # ---------------------------------------------------------
+    # GOAL SEEK
+    # ---------------------------------------------------------
+    st.markdown("---")
+    st.subheader("🎯 Goal Seek")
+    st.caption("Find the assumption that justifies a target value, e.g. the growth implied by today's share price.")
+
+    render_goal_seek("dcf", model_inputs, key="dcf_goal")
+
+    render_dcf_batch()
+
     # ---------------------------------------------------------
     # ADDITIONAL INFORMATION SECTION
     # ---------------------------------------------------------
@@ -210,6 +567,31 @@ This DCF model:
 - Sums all discounted cash flows to estimate **Enterprise Value**  
 - Subtracts net debt to get **Equity Value**  
 - Divides by shares outstanding to estimate **intrinsic value per share**  
+""")
+
+    with st.expander("How do I read the sensitivity grid?"):
+        st.markdown("""
+The grid values the company for every combination of **WACC** (rows) and **terminal growth rate** (columns)
+around your inputs, with your own case in the middle.
+
+- Moving **down** a column raises WACC, which lowers value  
+- Moving **right** along a row raises terminal growth, which raises value  
+- Cells where WACC ≤ growth are left **blank**, because the terminal value formula breaks down there  
+
+With an EBIT margin step, each tab repeats the grid with the margin lowered, unchanged or raised
+by that many percentage points in every forecast year.
+""")
+
+    with st.expander("How does the Monte Carlo valuation work?"):
+        st.markdown("""
+Instead of one set of assumptions, the simulation values the company thousands (or millions) of times.
+
+- Each path draws a shock to **revenue growth, EBIT margin, capex % and WACC**, added to your
+  inputs in every forecast year  
+- Drivers move together according to the **correlation matrix** (e.g. faster growth alongside higher margins)  
+- The result is a **distribution** of values per share instead of a single number  
+
+Percentiles are tracked with a streaming quantile sketch, so even 10 million paths use little memory.
 """)
 
     with st.expander("What is this model used for?"):
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+
+
+AMORTIZATION_METHODS = {
+    "Annuity": "annuity",
+    "Straight-Line": "straight_line",
+    "Interest-Only (Balloon)": "interest_only",
+}
+LOAN_COLUMNS = ["principal", "annual_rate", "term_months", "method"]
+SCHEDULE_COLUMNS = [
+    "loan", "month", "period", "opening_balance", "interest",
+    "scheduled_principal", "prepayment", "payment", "closing_balance",
+]
+FLOW_COLUMNS = ["interest", "scheduled_principal", "prepayment", "payment"]
+DEFAULT_CHUNK_LOANS = 5_000
+
+
+# ---------------------------------------------------------
+# INPUT HANDLING
+# ---------------------------------------------------------
+def _method_codes(method):
+    """Map method names (page labels or snake_case keys) to 0 = annuity, 1 = straight-line, 2 = interest-only."""
+    keys = list(AMORTIZATION_METHODS.values())
+    lookup = {**{k: i for i, k in enumerate(keys)}, **{label: keys.index(k) for label, k in AMORTIZATION_METHODS.items()}}
+    names = np.asarray(method, dtype=object)
+    codes = np.vectorize(
+        lambda m: lookup.get(m, lookup.get(str(m).strip().lower().replace("-", "_").replace(" ", "_"), -1)),
+        otypes=[int],
+    )(names)
+    if np.any(codes < 0):
+        unknown = sorted({str(m) for m in np.atleast_1d(names)[np.atleast_1d(codes) < 0]})
+        raise ValueError(f"Unknown amortization method(s): {', '.join(unknown)}")
+    return codes
+
+
+# ---------------------------------------------------------
+# SCHEDULE ENGINE
+# ---------------------------------------------------------
+def amortize(principal, annual_rate, term_months, method="annuity",
+             cpr=0.0, prepayment_amount=0.0, prepayment_month=0):
+    """
+    Monthly amortization schedules for many loans as one set of flat columns.
+
+    Each loan's rows sit in one contiguous block (loan-major order), so the
+    result is a ragged table rather than per-loan lists. The loop runs over
+    payment months, not loans: at month k only loans still running are
+    touched, and since loans are visited longest term first the live set is
+    always a prefix of that ordering.
+
+    - annuity:        level payment, recast after prepayments
+    - straight_line:  equal principal over the remaining term
+    - interest_only:  interest only, full balance repaid as a balloon at maturity
+
+    Rates are decimals. `cpr` is an annual conditional prepayment rate
+    applied monthly to the balance after scheduled principal; a lump-sum
+    `prepayment_amount` can be paid in `prepayment_month` (1-based, 0 = none).
+    Rows after a loan is fully prepaid are dropped. Returns a dict of
+    SCHEDULE_COLUMNS except `month`.
+    """
+    principal, annual_rate, term, cpr, lump, lump_month = (
+        np.atleast_1d(np.asarray(a, dtype=float)) for a in np.broadcast_arrays(
+            principal, annual_rate, term_months, cpr, prepayment_amount, prepayment_month
+        )
+    )
+    codes = np.broadcast_to(np.atleast_1d(_method_codes(method)), principal.shape)
+    term = term.astype(np.int64)
+    if np.any(term < 1):
+        raise ValueError("Loan terms must be at least one month")
+
+    n_rows = int(term.sum())
+    starts = np.cumsum(term) - term
+    rate = annual_rate / 12
+    smm = 1 - (1 - np.clip(cpr, 0.0, 1.0)) ** (1 / 12)
+
+    columns = {
+        "loan": np.repeat(np.arange(principal.size), term),
+        "period": np.arange(n_rows) - np.repeat(starts, term) + 1,
+        **{name: np.zeros(n_rows) for name in SCHEDULE_COLUMNS[3:]},
+    }
+
+    order = np.argsort(-term, kind="stable")
+    live_counts = np.searchsorted(-term[order], -np.arange(1, term.max() + 1), side="right")
+    balance = principal.copy()
+
+    for k, count in enumerate(live_counts, start=1):
+        live = order[:count]
+        rows = starts[live] + k - 1
+        opening = balance[live]
+        r = rate[live]
+        remaining = term[live] - k + 1
+        code = codes[live]
+
+        interest = opening * r
+        with np.errstate(divide="ignore", invalid="ignore"):
+            level = np.where(r > 0, opening * r / -np.expm1(-remaining * np.log1p(r)), opening / remaining)
+        scheduled = np.select(
+            [code == 0, code == 1],
+            [level - interest, opening / remaining],
+            np.where(remaining == 1, opening, 0.0),
+        )
+        scheduled = np.clip(scheduled, 0.0, opening)
+
+        after = opening - scheduled
+        prepaid = after * smm[live]
+        prepaid += np.where(lump_month[live] == k, np.minimum(lump[live], after - prepaid), 0.0)
+
+        columns["opening_balance"][rows] = opening
+        columns["interest"][rows] = interest
+        columns["scheduled_principal"][rows] = scheduled
+        columns["prepayment"][rows] = prepaid
+        columns["payment"][rows] = interest + scheduled + prepaid
+        columns["closing_balance"][rows] = after - prepaid
+        balance[live] = after - prepaid
+
+    keep = columns["opening_balance"] > 1e-9
+    if not keep.all():
+        columns = {name: values[keep] for name, values in columns.items()}
+    return columns
+
+
+# ---------------------------------------------------------
+# LOAN BOOKS (chunked)
+# ---------------------------------------------------------
+def _months_since_epoch(dates):
+    return pd.to_datetime(dates).to_numpy().astype("datetime64[M]").astype(np.int64)
+
+
+def _optional(book, column, default):
+    return book[column].to_numpy(dtype=float) if column in book else default
+
+
+def amortize_book(book, first_payment, chunk_loans=DEFAULT_CHUNK_LOANS):
+    """
+    Amortize a loan book chunk by chunk, yielding one DataFrame per chunk.
+
+    Expects LOAN_COLUMNS (annual_rate in percent) plus optional `loan_id`,
+    `first_payment_date` (defaults to `first_payment`), `cpr` (percent),
+    `prepayment_amount` and `prepayment_month`. Processing at most
+    chunk_loans loans at a time bounds memory for large books.
+    """
+    for start in range(0, len(book), chunk_loans):
+        chunk = book.iloc[start:start + chunk_loans]
+        schedule = amortize(
+            chunk["principal"].to_numpy(dtype=float),
+            chunk["annual_rate"].to_numpy(dtype=float) / 100,
+            chunk["term_months"].to_numpy(),
+            chunk["method"].to_numpy(),
+            _optional(chunk, "cpr", 0.0) / 100,
+            _optional(chunk, "prepayment_amount", 0.0),
+            _optional(chunk, "prepayment_month", 0),
+        )
+
+        loan = schedule.pop("loan")
+        first = np.broadcast_to(
+            _months_since_epoch(chunk["first_payment_date"] if "first_payment_date" in chunk else [first_payment]),
+            (len(chunk),),
+        )
+        month = (first[loan] + schedule["period"] - 1).astype("datetime64[M]")
+        ids = chunk["loan_id"].to_numpy() if "loan_id" in chunk else np.arange(start, start + len(chunk))
+
+        yield pd.DataFrame({"loan_id": ids[loan], "month": month, **schedule})
+
+
+def monthly_totals(schedule):
+    """Interest, principal, prepayment and payment summed by calendar month, plus the closing book balance."""
+    return schedule.groupby("month")[FLOW_COLUMNS + ["closing_balance"]].sum()
+
+
+def combine_monthly_totals(totals):
+    """Merge per-chunk monthly totals into one table for the whole book."""
+    return pd.concat(totals).groupby(level=0).sum().sort_index()
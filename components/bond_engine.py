@@ -0,0 +1,313 @@
+import numpy as np
+
+
+FREQ_MAP = {"Annual": 1, "Semi-Annual": 2, "Quarterly": 4}
+
+
+# ---------------------------------------------------------
+# INPUT HANDLING
+# ---------------------------------------------------------
+def _as_frequency(frequency):
+    freq = np.asarray(frequency)
+    if freq.dtype.kind in "OUS":
+        freq = np.vectorize(lambda x: FREQ_MAP.get(x, x), otypes=[object])(freq)
+    return freq.astype(float)
+
+
+def bond_arrays(face_value, coupon_rate, yield_rate, years, frequency):
+    """Broadcast bond terms to float arrays of a common shape."""
+    return np.broadcast_arrays(
+        np.asarray(face_value, dtype=float),
+        np.asarray(coupon_rate, dtype=float),
+        np.asarray(yield_rate, dtype=float),
+        np.asarray(years, dtype=float),
+        _as_frequency(frequency),
+    )
+
+
+def bond_terms(face_value, coupon_rate, years, frequency):
+    """Per-period coupon and whole number of periods, as in the page (int(years * f))."""
+    face_value = np.asarray(face_value, dtype=float)
+    frequency = _as_frequency(frequency)
+    coupon_payment = face_value * np.asarray(coupon_rate, dtype=float) / frequency
+    total_periods = np.floor(np.asarray(years, dtype=float) * frequency)
+    return coupon_payment, total_periods
+
+
+# ---------------------------------------------------------
+# CLOSED-FORM PRICING
+# ---------------------------------------------------------
+def annuity_factor(period_yield, total_periods):
+    """Present value of 1 paid at the end of each of N periods, plus the N-period discount factor."""
+    period_yield = np.asarray(period_yield, dtype=float)
+    total_periods = np.asarray(total_periods, dtype=float)
+    # expm1/log1p keep 1 - (1 + y)^-N accurate when y is tiny
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_discount = -total_periods * np.log1p(period_yield)
+    discount_n = np.exp(log_discount)
+    one_minus_discount = -np.expm1(log_discount)
+    zero = period_yield == 0
+    annuity = np.divide(
+        one_minus_discount,
+        period_yield,
+        out=np.array(total_periods, dtype=float, copy=True),
+        where=~zero,
+    )
+    return annuity, discount_n
+
+
+def price_bonds(face_value, coupon_rate, yield_rate, years, frequency):
+    """
+    Price many plain-vanilla bonds in one vectorized pass.
+
+    Rates are decimals (0.05 = 5%), frequency is coupons per year
+    (or one of the FREQ_MAP labels). Inputs broadcast against each other.
+    """
+    face_value, coupon_rate, yield_rate, years, frequency = bond_arrays(
+        face_value, coupon_rate, yield_rate, years, frequency
+    )
+    coupon_payment, total_periods = bond_terms(face_value, coupon_rate, years, frequency)
+    annuity, discount_n = annuity_factor(yield_rate / frequency, total_periods)
+    return coupon_payment * annuity + face_value * discount_n
+
+
+def price_bond(face_value, coupon_rate, yield_rate, years, frequency):
+    return float(price_bonds(face_value, coupon_rate, yield_rate, years, frequency))
+
+
+# ---------------------------------------------------------
+# DISCOUNTED CASH-FLOW MOMENTS
+# ---------------------------------------------------------
+SMALL_YIELD = 1e-3
+
+
+def _power_sums(n):
+    """Faulhaber sums of t^k for t = 1..N, k = 1..5."""
+    p1 = n * (n + 1) / 2
+    p2 = n * (n + 1) * (2 * n + 1) / 6
+    p3 = p1 ** 2
+    p4 = n * (n + 1) * (2 * n + 1) * (3 * n ** 2 + 3 * n - 1) / 30
+    p5 = n ** 2 * (n + 1) ** 2 * (2 * n ** 2 + 2 * n - 1) / 12
+    return p1, p2, p3, p4, p5
+
+
+def _discount_sums(period_yield, total_periods):
+    """
+    Sums over t = 1..N of v^t, t * v^t and t^2 * v^t with v = 1 / (1 + y),
+    plus v^N, all in closed form.
+
+    The weighted sums come from the recurrence
+    (1 - v) * S_k = sum((t^k - (t-1)^k) * v^t) - N^k * v^(N+1),
+    which cancels badly when y * N is tiny; there a third-order expansion
+    of v^t = exp(-t * log(1 + y)) is used instead.
+    """
+    y = np.asarray(period_yield, dtype=float)
+    n = np.asarray(total_periods, dtype=float)
+    zero = y == 0
+    small = np.abs(y) * np.maximum(n, 1) < SMALL_YIELD
+    y_safe = np.where(zero, 1.0, y)
+
+    log_v = -np.log1p(y_safe)
+    v = np.exp(log_v)
+    vn = np.where(zero, 1.0, np.exp(n * log_v))
+    one_minus_vn = -np.expm1(n * log_v)
+    one_minus_v = y_safe * v
+
+    s0 = np.where(zero, n, one_minus_vn / y_safe)
+    s1 = (s0 - n * vn * v) / one_minus_v
+    s2 = (2 * s1 - s0 - n ** 2 * vn * v) / one_minus_v
+
+    p1, p2, p3, p4, p5 = _power_sums(n)
+    l = np.log1p(np.where(small, y, 0.0))
+    s1 = np.where(small, p1 - l * p2 + l ** 2 / 2 * p3 - l ** 3 / 6 * p4, s1)
+    s2 = np.where(small, p2 - l * p3 + l ** 2 / 2 * p4 - l ** 3 / 6 * p5, s2)
+    return vn, s0, s1, s2
+
+
+def price_and_slope(face_value, coupon_rate, yield_rate, years, frequency):
+    """Price and dPrice/dYield (annual yield) for many bonds at once."""
+    face_value, coupon_rate, yield_rate, years, frequency = bond_arrays(
+        face_value, coupon_rate, yield_rate, years, frequency
+    )
+    coupon_payment, total_periods = bond_terms(face_value, coupon_rate, years, frequency)
+    period_yield = yield_rate / frequency
+    vn, s0, s1, _ = _discount_sums(period_yield, total_periods)
+    price = coupon_payment * s0 + face_value * vn
+    weighted_time = coupon_payment * s1 + face_value * total_periods * vn
+    slope = -weighted_time / (1 + period_yield) / frequency
+    return price, slope
+
+
+# ---------------------------------------------------------
+# PRICE + RISK ANALYTICS (single pass)
+# ---------------------------------------------------------
+def bond_analytics(face_value, coupon_rate, yield_rate, years, frequency):
+    """
+    Price, Macaulay/modified duration (years), convexity (years^2) and DV01
+    for many bonds, all from one set of discount sums.
+
+    DV01 is the price change for a 1bp fall in yield, per bond.
+    """
+    face_value, coupon_rate, yield_rate, years, frequency = bond_arrays(
+        face_value, coupon_rate, yield_rate, years, frequency
+    )
+    coupon_payment, total_periods = bond_terms(face_value, coupon_rate, years, frequency)
+    period_yield = yield_rate / frequency
+    vn, s0, s1, s2 = _discount_sums(period_yield, total_periods)
+
+    # Present value and its first two time-weighted moments (in periods)
+    price = coupon_payment * s0 + face_value * vn
+    weighted_time = coupon_payment * s1 + face_value * total_periods * vn
+    weighted_time_sq = coupon_payment * s2 + face_value * total_periods ** 2 * vn
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        macaulay = weighted_time / price / frequency
+        modified = macaulay / (1 + period_yield)
+        convexity = (weighted_time_sq + weighted_time) / price / ((1 + period_yield) * frequency) ** 2
+
+    return {
+        "price": price,
+        "macaulay_duration": macaulay,
+        "modified_duration": modified,
+        "convexity": convexity,
+        "dv01": modified * price * 1e-4,
+    }
+
+
+# ---------------------------------------------------------
+# YIELD-TO-MATURITY SOLVER (price -> yield)
+# ---------------------------------------------------------
+def solve_ytm(price, face_value, coupon_rate, years, frequency,
+              lower=-0.9, upper=1.0, tol=1e-12, max_iter=100):
+    """
+    Yield to maturity for many bonds at once.
+
+    Safeguarded Newton iteration: every bond keeps its own [lower, upper]
+    bracket and falls back to bisection when a Newton step leaves it.
+    Only bonds that have not yet converged are iterated. Bonds whose price
+    cannot be reached inside the bracket come back as NaN.
+    """
+    target, face_value, coupon_rate, years, frequency = np.broadcast_arrays(
+        np.asarray(price, dtype=float),
+        np.asarray(face_value, dtype=float),
+        np.asarray(coupon_rate, dtype=float),
+        np.asarray(years, dtype=float),
+        _as_frequency(frequency),
+    )
+    shape = target.shape
+    target, face_value, coupon_rate, years, frequency = (
+        a.ravel() for a in (target, face_value, coupon_rate, years, frequency)
+    )
+    size = target.size
+
+    lo = np.full(size, float(lower))
+    hi = np.full(size, float(upper))
+
+    # Widen the upper bracket for deeply discounted bonds
+    p_hi, _ = price_and_slope(face_value, coupon_rate, hi, years, frequency)
+    for _ in range(10):
+        widen = p_hi > target
+        if not widen.any():
+            break
+        hi[widen] *= 2
+        p_hi[widen], _ = price_and_slope(
+            face_value[widen], coupon_rate[widen], hi[widen], years[widen], frequency[widen]
+        )
+
+    p_lo, _ = price_and_slope(face_value, coupon_rate, lo, years, frequency)
+    _, total_periods = bond_terms(face_value, coupon_rate, years, frequency)
+    solvable = (p_lo >= target) & (p_hi <= target) & (total_periods > 0) & np.isfinite(target)
+
+    # Start from the textbook approximate-yield formula
+    coupon = face_value * coupon_rate
+    guess = (coupon + (face_value - target) / np.maximum(years, 1e-12)) / ((face_value + target) / 2)
+    y = np.clip(np.nan_to_num(guess), lo, hi)
+
+    result = np.full(size, np.nan)
+    active = np.flatnonzero(solvable)
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+
+        p, slope = price_and_slope(
+            face_value[active], coupon_rate[active], y[active], years[active], frequency[active]
+        )
+        diff = p - target[active]
+
+        # Price falls as yield rises: tighten each bracket around the root
+        lo[active] = np.where(diff > 0, y[active], lo[active])
+        hi[active] = np.where(diff < 0, y[active], hi[active])
+
+        step = np.divide(diff, slope, out=np.zeros_like(diff), where=slope != 0)
+        y_new = y[active] - step
+        done = (
+            (np.abs(step) <= tol * (1 + np.abs(y[active])))
+            | (np.abs(diff) <= tol * np.maximum(face_value[active], 1.0))
+        )
+        bisect = ~done & (~np.isfinite(y_new) | (y_new <= lo[active]) | (y_new >= hi[active]))
+        y_new = np.where(bisect, 0.5 * (lo[active] + hi[active]), y_new)
+
+        y[active] = y_new
+        result[active[done]] = y_new[done]
+        active = active[~done]
+
+    return result.reshape(shape)
+
+
+# ---------------------------------------------------------
+# BOND BOOKS (DataFrame in, DataFrame out)
+# ---------------------------------------------------------
+BOOK_COLUMNS = ["face_value", "coupon_rate", "years", "frequency"]
+
+
+def price_book(book, curve=None):
+    """
+    Price a bond book, or solve its yields, with risk analytics per bond.
+
+    Expects BOOK_COLUMNS plus either `yield_rate` (the book is priced) or
+    `market_price` (yields are solved). With a YieldCurve the book is priced
+    off the curve instead and `yield_rate` is the equivalent flat yield.
+    Rates are in percent, like the page inputs. An optional `quantity`
+    column defaults to 1.
+    """
+    out = book.copy()
+    terms = (
+        book["face_value"].to_numpy(),
+        book["coupon_rate"].to_numpy() / 100,
+    )
+    maturity = (book["years"].to_numpy(), book["frequency"].to_numpy())
+
+    if curve is not None:
+        yields = solve_ytm(curve.price_bonds(*terms, *maturity), *terms, *maturity)
+        out["yield_rate"] = yields * 100
+    elif "yield_rate" in book:
+        yields = book["yield_rate"].to_numpy() / 100
+    elif "market_price" in book:
+        yields = solve_ytm(book["market_price"].to_numpy(dtype=float), *terms, *maturity)
+        out["yield_rate"] = yields * 100
+    else:
+        raise ValueError("The book needs either a yield_rate or a market_price column")
+
+    for name, values in bond_analytics(terms[0], terms[1], yields, *maturity).items():
+        out[name] = values
+
+    quantity = book["quantity"].to_numpy(dtype=float) if "quantity" in book else 1.0
+    out["market_value"] = out["price"].to_numpy() * quantity
+    out["position_dv01"] = out["dv01"].to_numpy() * quantity
+    return out
+
+
+def book_summary(priced):
+    """Portfolio totals for a book returned by price_book."""
+    market_value = priced["market_value"].to_numpy()
+    total_value = np.nansum(market_value)
+    weights = market_value / total_value if total_value else np.zeros_like(market_value)
+    return {
+        "bonds": len(priced),
+        "market_value": total_value,
+        "dv01": np.nansum(priced["position_dv01"].to_numpy()),
+        "modified_duration": np.nansum(weights * priced["modified_duration"].to_numpy()),
+        "macaulay_duration": np.nansum(weights * priced["macaulay_duration"].to_numpy()),
+        "convexity": np.nansum(weights * priced["convexity"].to_numpy()),
+    }
@@ -1,5 +1,54 @@
+import datetime as dt
+import math
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 
+from components.bond_engine import (
+    BOOK_COLUMNS,
+    FREQ_MAP,
+    bond_analytics,
+    book_summary,
+    price_book,
+    solve_ytm,
+)
+from components.curve_fitting import NSS_PARAMS, PANEL_COLUMNS, fit_nss, nss_curve
+from components.data_io import read_table, require_columns
+from components.goal_seek import bond_model
+from components.goal_seek_tool import render_goal_seek
+from components.lattice import OPTION_COLUMNS, flat_curve, price_option_bonds, price_option_book, solve_oas
+from components.rate_paths import (
+    MODELS,
+    amortizing_pathwise_values,
+    bond_pathwise_values,
+    simulate_short_rates,
+    simulation_summary,
+)
+from components.schedule import DAY_COUNTS, price_dated_bonds, price_dated_book
+from components.sensitivity_tool import render_sensitivity
+from components.utils import binned_histogram
+from components.yield_curve import INTERPOLATION_METHODS, YieldCurve
+
+PREVIEW_ROWS = 1_000
+DEFAULT_TENORS = [0.5, 1.0, 2.0, 3.0, 5.0, 7.0, 10.0, 20.0, 30.0]
+DEFAULT_RATES = [3.6, 3.5, 3.4, 3.4, 3.5, 3.6, 3.8, 4.1, 4.2]
+INSTRUMENT_TYPES = ["Plain Vanilla", "Callable", "Putable"]
+SIMULATED_INSTRUMENTS = ["Bullet Bond", "Amortizing Loan (with prepayment)"]
+FAN_CHART_PATHS = 5_000
+SENSITIVITY_DRIVERS = {
+    "yield_rate": "Yield to Maturity",
+    "coupon_rate": "Coupon Rate",
+    "face_value": "Face Value",
+}
+
+
+def option_arguments(instrument, exercise_price, exercise_start):
+    if instrument == "Callable":
+        return {"call_price": exercise_price, "call_start_years": exercise_start}
+    return {"put_price": exercise_price, "put_start_years": exercise_start}
+
 
 def render_bond_tool():
 
@@ -76,6 +125,222 @@ def render_bond_tool():
 
     st.divider()
 
+    mode = st.radio("Mode", ["Single Bond", "Bond Book Upload", "Rate Simulation"], horizontal=True)
+    discounting = st.radio("Discounting", ["Flat Yield", "Yield Curve"], horizontal=True)
+
+    curve = None
+    if discounting == "Yield Curve":
+        curve = render_curve_inputs()
+        st.divider()
+
+    if discounting == "Flat Yield" or curve is not None:
+        if mode == "Bond Book Upload":
+            render_bond_book(curve)
+        elif mode == "Rate Simulation":
+            render_rate_simulation(curve)
+        else:
+            render_single_bond(curve)
+
+    # ---------------------------------------------------------
+    # INFO SECTION (BOTTOM)
+    # ---------------------------------------------------------
+    st.divider()
+    st.subheader("📘 Additional Information")
+
+    # --- Expander 1: Bond Pricing Formula ---
+    with st.expander("What is the Bond Pricing Formula?"):
+
+        st.markdown("""
+        A bond is worth the **present value of its future cash flows**:
+
+        - Coupon payments  
+        - Face value repayment at maturity  
+        """)
+
+        st.latex(r"""
+        P = \sum_{t=1}^{N}\frac{C}{(1+y)^t}
+        + \frac{F}{(1+y)^N}
+        """)
+
+        st.markdown("""
+        **Where:**
+
+        - **P** = Bond price today  
+        - **C** = Coupon payment per period  
+        - **F** = Face value repaid at maturity  
+        - **y** = Yield per period  
+        - **N** = Total number of periods  
+        """)
+
+    # --- Expander 2: Yield Relationship ---
+    with st.expander("Why does yield affect bond price?"):
+
+        st.markdown("""
+        Bond prices move **inversely** to yields:
+
+        - If yields rise → future cash flows are discounted more → **price falls**  
+        - If yields fall → future cash flows are discounted less → **price rises**  
+
+        This is the foundation of **interest rate risk**, duration, and fixed-income portfolio management.
+        """)
+
+    # --- Expander 3: Duration, Convexity & DV01 ---
+    with st.expander("What are duration, convexity and DV01?"):
+
+        st.markdown("""
+        - **Macaulay duration** = the present-value-weighted average time (in years) until the cash flows are received  
+        - **Modified duration** = the % price change for a 1% change in yield  
+        - **Convexity** = how much duration itself changes as yields move  
+        - **DV01** = the dollar price change for a 1 basis point (0.01%) move in yield  
+        """)
+
+        st.latex(r"""
+        D_{mod} = \frac{D_{mac}}{1+y}
+        \qquad
+        DV01 = D_{mod} \times P \times 0.0001
+        """)
+
+        st.markdown("""
+        For an uploaded book, DV01 is summed across positions and duration and convexity
+        are weighted by each position's market value.
+        """)
+
+    # --- Expander 4: Embedded Options ---
+    with st.expander("How are callable and putable bonds valued?"):
+
+        st.markdown("""
+        - A **callable** bond lets the issuer repay early at the call price, so it is worth **less** than the straight bond  
+        - A **putable** bond lets the holder sell back at the put price, so it is worth **more**  
+
+        The tool builds a **Black-Derman-Toy binomial lattice** of short rates, calibrated to the
+        yield curve (or the flat yield), and values the bond by working backwards through it,
+        exercising the option at every node where it pays to do so.
+
+        The **option-adjusted spread (OAS)** is the constant spread over the lattice rates that
+        makes the model price equal the market price.
+        """)
+
+    # --- Expander 5: Short-Rate Simulation ---
+    with st.expander("How does the rate simulation work?"):
+
+        st.markdown("""
+        The **Rate Simulation** mode draws thousands of possible paths for the short-term interest rate
+        and discounts the instrument's cash flows along each one:
+
+        - **Vasicek**: rates revert to a long-run level and can turn negative  
+        - **CIR**: like Vasicek, but volatility scales with the rate so it stays non-negative  
+        - **Hull-White**: mean-reverting around the yield curve, so it reprices the curve exactly  
+
+        The average across paths is the model price; the spread of path values shows the
+        **interest-rate risk** of holding the instrument. Amortizing loans are prepaid faster
+        when rates fall below the loan rate, so their cash flows depend on the path taken.
+
+        **Antithetic** paths (each draw paired with its mirror image) and **Sobol** quasi-random
+        draws both reduce simulation noise for the same number of paths.
+        """)
+
+
+def render_curve_inputs():
+
+    # ---------------------------------------------------------
+    # YIELD CURVE INPUT
+    # ---------------------------------------------------------
+    st.subheader("📈 Yield Curve")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        rate_type = st.selectbox("Curve Input", ["Zero Rates", "Par Yields", "NSS Fit to Bond Prices"])
+
+    with col2:
+        method = st.selectbox("Interpolation", list(INTERPOLATION_METHODS))
+
+    if rate_type == "NSS Fit to Bond Prices":
+        curve = render_nss_fit(INTERPOLATION_METHODS[method])
+    else:
+        curve = render_curve_table(rate_type, INTERPOLATION_METHODS[method])
+
+    if curve is None:
+        return None
+
+    grid = np.linspace(0.25, max(curve.tenors.max(), 1.0), 120)
+    st.line_chart(
+        pd.DataFrame(
+            {
+                "Zero Rate (%)": curve.zero_rate(grid) * 100,
+                "1Y Forward (%)": curve.forward_rate(grid, grid + 1) * 100,
+            },
+            index=pd.Index(grid, name="Years"),
+        )
+    )
+
+    return curve
+
+
+def render_curve_table(rate_type, method):
+
+    curve_table = st.data_editor(
+        pd.DataFrame({"Tenor (years)": DEFAULT_TENORS, "Rate (%)": DEFAULT_RATES}),
+        num_rows="dynamic",
+        use_container_width=True,
+        key="curve_table"
+    ).dropna()
+
+    st.caption("Rates are annually compounded. Par yields are bootstrapped from semi-annual par bonds.")
+
+    tenors = curve_table["Tenor (years)"].to_numpy(dtype=float)
+    rates = curve_table["Rate (%)"].to_numpy(dtype=float) / 100
+
+    try:
+        if rate_type == "Par Yields":
+            return YieldCurve.from_par(tenors, rates, 2, method)
+        return YieldCurve.from_zero(tenors, rates, method)
+    except (ValueError, IndexError) as exc:
+        st.error(f"Could not build the yield curve: {exc}")
+        return None
+
+
+def render_nss_fit(method):
+
+    st.markdown(f"""
+    Upload a **CSV or Parquet** panel of observed bond prices with the columns
+    `{', '.join(PANEL_COLUMNS)}` (rates in percent). A Nelson-Siegel-Svensson
+    curve is fitted to the prices. If the file has a `date` column, the latest
+    date is used.
+    """)
+
+    uploaded = st.file_uploader("Bond price panel", type=["csv", "parquet"], key="nss_panel")
+
+    if uploaded is None:
+        st.info("Upload a bond price panel to fit the curve.")
+        return None
+
+    try:
+        panel = read_table(uploaded)
+        require_columns(panel, PANEL_COLUMNS)
+        if "date" in panel:
+            panel = panel[panel["date"] == panel["date"].max()]
+        params, rmse = fit_nss(
+            panel["face_value"].to_numpy(dtype=float),
+            panel["coupon_rate"].to_numpy(dtype=float) / 100,
+            panel["years"].to_numpy(dtype=float),
+            panel["frequency"].to_numpy(),
+            panel["market_price"].to_numpy(dtype=float),
+        )
+    except (ValueError, KeyError, np.linalg.LinAlgError) as exc:
+        st.error(f"Could not fit the NSS curve: {exc}")
+        return None
+
+    st.dataframe(
+        pd.DataFrame([params], columns=NSS_PARAMS).assign(rmse=rmse),
+        use_container_width=True
+    )
+
+    return nss_curve(params, max_tenor=max(float(panel["years"].max()), 1.0), method=method)
+
+
+def render_single_bond(curve=None):
+
     # ---------------------------------------------------------
     # INPUT SECTION
     # ---------------------------------------------------------
@@ -101,12 +366,13 @@ def render_bond_tool():
 
     with col2:
         st.markdown("### Yield & Maturity")
-        yield_rate = st.number_input(
-            "Yield to Maturity (YTM, %)",
-            min_value=0.0,
-            value=4.0,
-            step=0.25
-        ) / 100
+        if curve is None:
+            yield_rate = st.number_input(
+                "Yield to Maturity (YTM, %)",
+                min_value=0.0,
+                value=4.0,
+                step=0.25
+            ) / 100
 
         years = st.number_input(
             "Years to Maturity",
@@ -119,24 +385,54 @@ def render_bond_tool():
         st.markdown("### Payment Frequency")
         frequency = st.selectbox(
             "Coupon Frequency",
-            ["Annual", "Semi-Annual", "Quarterly"]
+            list(FREQ_MAP)
         )
 
-        freq_map = {"Annual": 1, "Semi-Annual": 2, "Quarterly": 4}
-        f = freq_map[frequency]
+        f = FREQ_MAP[frequency]
+
+        instrument = st.selectbox("Instrument Type", INSTRUMENT_TYPES)
+
+    if instrument != "Plain Vanilla":
+        o1, o2, o3 = st.columns(3)
+
+        with o1:
+            exercise_price = st.number_input(
+                f"{instrument[:-4]} Price (% of face)",
+                min_value=0.0,
+                value=100.0,
+                step=0.5
+            ) / 100 * face_value
+
+        with o2:
+            exercise_start = st.number_input(
+                f"First {instrument[:-4]} Date (years)",
+                min_value=0.0,
+                value=3.0,
+                step=0.5
+            )
+
+        with o3:
+            volatility = st.number_input(
+                "Short-Rate Volatility (%, BDT)",
+                min_value=0.0,
+                value=20.0,
+                step=1.0
+            ) / 100
 
     # ---------------------------------------------------------
     # CALCULATIONS
     # ---------------------------------------------------------
+    if curve is not None:
+        curve_price = curve.price_bonds(face_value, coupon_rate, years, f)
+        yield_rate = float(solve_ytm(curve_price, face_value, coupon_rate, years, f))
+        st.caption(f"Priced off the yield curve. Equivalent flat YTM: {yield_rate*100:.4f}%")
+
     coupon_payment = (face_value * coupon_rate) / f
     total_periods = int(years * f)
     period_yield = yield_rate / f
 
-    price = 0
-    for t in range(1, total_periods + 1):
-        price += coupon_payment / ((1 + period_yield) ** t)
-
-    price += face_value / ((1 + period_yield) ** total_periods)
+    risk = bond_analytics(face_value, coupon_rate, yield_rate, years, f)
+    price = float(risk["price"])
 
     # ---------------------------------------------------------
     # OUTPUT RESULTS
@@ -159,50 +455,355 @@ def render_bond_tool():
     | Periodic Yield (y) | **{period_yield*100:.3f}%** |
     """)
 
+    st.markdown("### Interest Rate Risk")
+
+    r1, r2, r3, r4 = st.columns(4)
+    r1.metric("Macaulay Duration", f"{float(risk['macaulay_duration']):.3f} yrs")
+    r2.metric("Modified Duration", f"{float(risk['modified_duration']):.3f}")
+    r3.metric("Convexity", f"{float(risk['convexity']):.2f}")
+    r4.metric("DV01", f"${float(risk['dv01']):,.4f}")
+
     # ---------------------------------------------------------
-    # INFO SECTION (BOTTOM)
+    # SETTLEMENT DATE & ACCRUED INTEREST
+    # ---------------------------------------------------------
+    st.markdown("### Settlement Date & Accrued Interest")
+
+    d1, d2, d3 = st.columns(3)
+
+    with d1:
+        settlement = st.date_input("Settlement Date", value=dt.date.today())
+
+    with d2:
+        maturity = st.date_input(
+            "Maturity Date",
+            value=(pd.Timestamp(settlement) + pd.DateOffset(years=int(years))).date()
+        )
+
+    with d3:
+        day_count = st.selectbox("Day Count", DAY_COUNTS)
+
+    dated = price_dated_bonds(face_value, coupon_rate, yield_rate, maturity, f, settlement, day_count)
+
+    a1, a2, a3 = st.columns(3)
+    a1.metric("Clean Price", f"${float(dated['clean_price'][0]):,.2f}")
+    a2.metric("Accrued Interest", f"${float(dated['accrued_interest'][0]):,.2f}")
+    a3.metric("Dirty Price", f"${float(dated['dirty_price'][0]):,.2f}")
+
+    # ---------------------------------------------------------
+    # EMBEDDED OPTION (LATTICE)
+    # ---------------------------------------------------------
+    if instrument != "Plain Vanilla":
+        st.markdown(f"### {instrument} Bond (Binomial Lattice)")
+
+        lattice_curve = curve if curve is not None else flat_curve(yield_rate, f)
+        option_terms = option_arguments(instrument, exercise_price, exercise_start)
+
+        straight = float(price_option_bonds(lattice_curve, volatility, face_value, coupon_rate, years, f))
+        with_option = float(price_option_bonds(
+            lattice_curve, volatility, face_value, coupon_rate, years, f, **option_terms
+        ))
+
+        b1, b2, b3 = st.columns(3)
+        b1.metric("Straight Bond (Lattice)", f"${straight:,.2f}")
+        b2.metric(f"{instrument} Bond Price", f"${with_option:,.2f}")
+        b3.metric("Embedded Option Value", f"${abs(straight - with_option):,.2f}")
+
+    # ---------------------------------------------------------
+    # IMPLIED YIELD (PRICE -> YTM)
+    # ---------------------------------------------------------
+    st.markdown("### Implied Yield from Market Price")
+
+    market_price = st.number_input(
+        "Market Price",
+        min_value=0.0,
+        value=round(price, 2),
+        step=10.0
+    )
+
+    implied_ytm = float(solve_ytm(market_price, face_value, coupon_rate, years, f))
+
+    st.metric(
+        label="Yield to Maturity at Market Price",
+        value=f"{implied_ytm*100:.4f}%" if math.isfinite(implied_ytm) else "Not solvable"
+    )
+
+    if instrument != "Plain Vanilla":
+        oas = float(solve_oas(
+            market_price, lattice_curve, volatility, face_value, coupon_rate, years, f, **option_terms
+        )[0])
+        st.metric(
+            label="Option-Adjusted Spread at Market Price",
+            value=f"{oas*10_000:,.1f} bp" if math.isfinite(oas) else "Not solvable"
+        )
+
+    model_inputs = {
+        "face_value": face_value,
+        "coupon_rate": coupon_rate,
+        "yield_rate": yield_rate,
+        "years": years,
+        "frequency": f,
+    }
+
+    # ---------------------------------------------------------
+    # SPIDER CHART & TOP DRIVERS
+    # ---------------------------------------------------------
+    st.markdown("### 🕸️ Spider Chart & Top Drivers")
+    st.caption("Plain-vanilla price at a flat yield as each input moves on its own.")
+
+    render_sensitivity(
+        lambda **inputs: bond_model(**inputs)["price"],
+        model_inputs, SENSITIVITY_DRIVERS, "Bond Price", key="bond_spider"
+    )
+
+    # ---------------------------------------------------------
+    # GOAL SEEK (any input -> target price)
+    # ---------------------------------------------------------
+    st.markdown("### 🎯 Goal Seek")
+    st.caption("Plain-vanilla pricing at a flat yield, e.g. the coupon that prices the bond at par.")
+
+    render_goal_seek("bond", model_inputs, key="bond_goal")
+
+
+def render_bond_book(curve=None):
+
+    # ---------------------------------------------------------
+    # BOOK UPLOAD
+    # ---------------------------------------------------------
+    st.subheader("📂 Bond Book Upload")
+
+    st.markdown(f"""
+    Upload a **CSV or Parquet** file with one bond per row and the columns:
+
+    `{', '.join(BOOK_COLUMNS)}`
+
+    plus either `yield_rate` (the book is priced) or `market_price` (each bond's
+    YTM is solved). In yield-curve mode neither is needed. Rates are in **percent**
+    (as in the single-bond inputs) and `frequency` is 1, 2, 4 or one of *Annual*,
+    *Semi-Annual*, *Quarterly*.
+
+    Optional columns:
+
+    - `quantity` scales each bond's market value
+    - `maturity_date` adds clean/dirty prices and accrued interest
+      (with optional `settlement_date`, `issue_date` and `day_count`: {', '.join(DAY_COUNTS)})
+    - `{', '.join(OPTION_COLUMNS)}` value callable/putable bonds on a
+      binomial lattice in yield-curve mode (plus their OAS if `market_price` is given)
+    """)
+
+    uploaded = st.file_uploader("Bond book", type=["csv", "parquet"])
+
+    if uploaded is None:
+        return
+
+    b1, b2 = st.columns(2)
+
+    with b1:
+        settlement = st.date_input("Settlement Date (if the book has no settlement_date column)", value=dt.date.today())
+
+    with b2:
+        volatility = st.number_input(
+            "Short-Rate Volatility (%, BDT) for callable/putable bonds",
+            min_value=0.0,
+            value=20.0,
+            step=1.0
+        ) / 100
+
+    try:
+        book = read_table(uploaded)
+        require_columns(book, BOOK_COLUMNS)
+        priced = price_book(book, curve)
+        if "maturity_date" in book:
+            priced = price_dated_book(priced, settlement)
+        if any(c in book for c in OPTION_COLUMNS):
+            if curve is not None:
+                priced = price_option_book(priced, curve, volatility)
+            else:
+                st.info("Switch to Yield Curve discounting to value the callable/putable bonds on the lattice.")
+    except (ValueError, KeyError) as exc:
+        st.error(f"Could not price the uploaded book: {exc}")
+        return
+
+    # ---------------------------------------------------------
+    # BOOK RESULTS
     # ---------------------------------------------------------
     st.divider()
-    st.subheader("📘 Additional Information")
+    st.subheader("📊 Book Valuation Result")
 
-    # --- Expander 1: Bond Pricing Formula ---
-    with st.expander("What is the Bond Pricing Formula?"):
+    summary = book_summary(priced)
 
-        st.markdown("""
-        A bond is worth the **present value of its future cash flows**:
+    col1, col2 = st.columns(2)
+    col1.metric("Bonds Priced", f"{summary['bonds']:,}")
+    col2.metric("Total Market Value", f"${summary['market_value']:,.2f}")
 
-        - Coupon payments  
-        - Face value repayment at maturity  
-        """)
+    col3, col4, col5 = st.columns(3)
+    col3.metric("Portfolio DV01", f"${summary['dv01']:,.2f}")
+    col4.metric("Modified Duration (MV-weighted)", f"{summary['modified_duration']:.3f}")
+    col5.metric("Convexity (MV-weighted)", f"{summary['convexity']:.2f}")
 
-        st.latex(r"""
-        P = \sum_{t=1}^{N}\frac{C}{(1+y)^t}
-        + \frac{F}{(1+y)^N}
-        """)
+    st.dataframe(priced.head(PREVIEW_ROWS), use_container_width=True)
+    if len(priced) > PREVIEW_ROWS:
+        st.caption(f"Showing the first {PREVIEW_ROWS:,} rows. Download the file for the full book.")
 
-        st.markdown("""
-        **Where:**
+    st.download_button(
+        "Download priced book (CSV)",
+        priced.to_csv(index=False).encode("utf-8"),
+        file_name="priced_bond_book.csv",
+        mime="text/csv",
+    )
 
-        - **P** = Bond price today  
-        - **C** = Coupon payment per period  
-        - **F** = Face value repaid at maturity  
-        - **y** = Yield per period  
-        - **N** = Total number of periods  
-        """)
 
-    # --- Expander 2: Yield Relationship ---
-    with st.expander("Why does yield affect bond price?"):
+def render_rate_simulation(curve=None):
 
-        st.markdown("""
-        Bond prices move **inversely** to yields:
+    # ---------------------------------------------------------
+    # MODEL INPUTS
+    # ---------------------------------------------------------
+    st.subheader("🎲 Short-Rate Simulation")
 
-        - If yields rise → future cash flows are discounted more → **price falls**  
-        - If yields fall → future cash flows are discounted less → **price rises**  
+    models = MODELS if curve is not None else [m for m in MODELS if m != "Hull-White"]
+    if curve is None:
+        st.caption("Switch to Yield Curve discounting to use the Hull-White model fitted to the curve.")
 
-        This is the foundation of **interest rate risk**, duration, and fixed-income portfolio management.
-        """)
+    col1, col2, col3 = st.columns(3)
 
+    with col1:
+        st.markdown("### Model")
+        model = st.selectbox("Short-Rate Model", models)
+        speed = st.number_input("Mean Reversion Speed (a)", min_value=0.0, value=0.3, step=0.05)
+        volatility = st.number_input(
+            "Rate Volatility (% per year)",
+            min_value=0.0,
+            value=1.0 if model != "CIR" else 5.0,
+            step=0.1
+        ) / 100
+
+    with col2:
+        st.markdown("### Starting Point")
+        r0 = st.number_input(
+            "Current Short Rate (%)", value=3.5, step=0.25, disabled=model == "Hull-White"
+        ) / 100
+        level = st.number_input(
+            "Long-Run Rate Level (%)", value=4.0, step=0.25, disabled=model == "Hull-White"
+        ) / 100
+
+    with col3:
+        st.markdown("### Simulation")
+        n_paths = int(st.number_input("Paths", min_value=1_000, max_value=2_000_000, value=50_000, step=10_000))
+        steps_per_year = int(st.number_input("Steps per Year", min_value=1, max_value=365, value=12, step=1))
+        antithetic = st.checkbox("Antithetic variates", value=True)
+        sobol = st.checkbox("Sobol quasi-random draws")
+        seed = int(st.number_input("Random Seed", min_value=0, value=42, step=1))
+
+    # ---------------------------------------------------------
+    # INSTRUMENT
+    # ---------------------------------------------------------
+    st.markdown("### Instrument")
+    instrument = st.selectbox("Instrument", SIMULATED_INSTRUMENTS)
+
+    i1, i2, i3 = st.columns(3)
+
+    with i1:
+        principal = st.number_input("Face Value / Principal", min_value=0.0, value=1000.0, step=100.0)
+        rate = st.number_input(
+            "Coupon Rate (% per year)" if instrument == "Bullet Bond" else "Loan Rate (% per year)",
+            min_value=0.0,
+            value=5.0,
+            step=0.25
+        ) / 100
+
+    with i2:
+        years = st.number_input("Years to Maturity", min_value=1, value=10, step=1)
+        if instrument == "Bullet Bond":
+            f = FREQ_MAP[st.selectbox("Payment Frequency", list(FREQ_MAP.keys()), index=1)]
+        else:
+            f = 12
+            st.caption("Loans pay monthly.")
+
+    with i3:
+        if instrument != "Bullet Bond":
+            base_cpr = st.number_input("Base Prepayment Rate (CPR, %)", min_value=0.0, value=5.0, step=1.0) / 100
+            refinance_sensitivity = st.number_input(
+                "Extra CPR per 1% of Rate Below Loan Rate (%)", min_value=0.0, value=5.0, step=1.0
+            )
+
+    if f > steps_per_year or steps_per_year % f:
+        st.warning("Steps per year must be a multiple of the payment frequency.")
+        return
+
+    try:
+        chunks = simulate_short_rates(
+            model, r0, speed, level, volatility, years, steps_per_year, n_paths,
+            antithetic=antithetic, sobol=sobol, seed=seed, curve=curve,
+        )
+
+        sample = {}
+
+        def keep_sample(chunks):
+            for rates, discount in chunks:
+                sample.setdefault("rates", rates[:FAN_CHART_PATHS])
+                yield rates, discount
 
+        if instrument == "Bullet Bond":
+            values = bond_pathwise_values(keep_sample(chunks), steps_per_year, principal, rate, years, f)
+        else:
+            values = amortizing_pathwise_values(
+                keep_sample(chunks), steps_per_year, principal, rate, years, f,
+                base_cpr, refinance_sensitivity
+            )
+    except ValueError as exc:
+        st.error(f"Could not run the simulation: {exc}")
+        return
+
+    summary = simulation_summary(values)
+
+    # ---------------------------------------------------------
+    # RESULTS
+    # ---------------------------------------------------------
+    st.divider()
+    st.subheader("📊 Simulation Result")
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Model Price", f"${summary['mean']:,.2f}")
+    m2.metric("Standard Error", f"${summary['std_error']:,.4f}")
+    if curve is not None and instrument == "Bullet Bond":
+        m3.metric("Curve Price", f"${float(curve.price_bonds(principal, rate, years, f)):,.2f}")
+
+    p1, p2, p3 = st.columns(3)
+    p1.metric("1st Percentile Value", f"${summary['p1']:,.2f}")
+    p2.metric("Median Value", f"${summary['p50']:,.2f}")
+    p3.metric("99th Percentile Value", f"${summary['p99']:,.2f}")
+
+    # Binned here so the browser gets 80 bars, not one point per path
+    counts, edges = binned_histogram(values, bins=80)
+    fig = go.Figure(go.Bar(
+        x=0.5 * (edges[:-1] + edges[1:]),
+        y=counts,
+        width=np.diff(edges),
+        marker_color="steelblue"
+    ))
+    fig.update_layout(
+        title="Distribution of Path Values (Interest-Rate Risk)",
+        xaxis_title="Discounted Value ($)",
+        yaxis_title="Paths",
+        template="simple_white",
+        bargap=0,
+        height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    times = np.arange(sample["rates"].shape[1]) / steps_per_year
+    bands = np.percentile(sample["rates"], [5, 25, 50, 75, 95], axis=0) * 100
+
+    fig = go.Figure()
+    for band, name in zip(bands, ["5th", "25th", "Median", "75th", "95th"]):
+        fig.add_trace(go.Scatter(x=times, y=band, mode="lines", name=name))
+    fig.update_layout(
+        title=f"Short-Rate Percentiles (first {len(sample['rates']):,} paths)",
+        xaxis_title="Years",
+        yaxis_title="Short Rate (%)",
+        template="simple_white",
+        height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
 
 
 # Run directly
@@ -0,0 +1,388 @@
+import time
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+from scipy.sparse import csr_matrix, vstack
+
+
+RATIONING_METHODS = {
+    "Automatic": "auto",
+    "Dynamic Programming": "dp",
+    "Integer Programming (Branch and Bound)": "milp",
+    "LP Relaxation + Rounding": "lp",
+    "Greedy (Profitability Index)": "greedy",
+}
+CAPEX_PREFIX = "capex_"
+RATIONING_COLUMNS = ["exclusive_group", "requires"]
+DP_CAPACITY = 10_000
+DP_MAX_CELLS = 50_000_000
+MILP_MAX_PROJECTS = 5_000
+MILP_TIME_LIMIT = 30.0
+
+
+# ---------------------------------------------------------
+# INPUT HANDLING
+# ---------------------------------------------------------
+def _group_codes(groups, n):
+    """Integer code per project for its exclusivity group, -1 when it has none."""
+    if groups is None:
+        return np.full(n, -1)
+    labels = pd.Series(np.asarray(groups, dtype=object)).replace("", np.nan)
+    codes, _ = pd.factorize(labels)
+    return codes
+
+
+def _requirement_index(requires, n):
+    """Index of the project each project depends on, -1 for none."""
+    if requires is None:
+        return np.full(n, -1)
+    requires = np.asarray(requires, dtype=float)
+    index = np.where(np.isnan(requires), -1, requires).astype(int)
+    if np.any((index < -1) | (index >= n)) or np.any(index == np.arange(n)):
+        raise ValueError("Dependencies must refer to another project in the portfolio")
+    return index
+
+
+def _whole_units(costs, budget):
+    """True when costs and budget are whole numbers small enough for an unrounded DP table."""
+    return bool(np.all(costs == np.round(costs))) and float(budget).is_integer() and budget <= DP_CAPACITY
+
+
+def _dp_units(costs, budget, resolution=None):
+    """
+    DP capacity and integer project weights in units of `resolution`, and
+    whether that conversion was exact: no affordable project's cost was
+    rounded up and the budget was not rounded down.
+    """
+    if resolution is None:
+        resolution = 1.0 if _whole_units(costs, budget) or budget == 0 else budget / DP_CAPACITY
+    scaled_budget = budget / resolution
+    capacity = int(np.floor(scaled_budget + 1e-9))
+    # Costs above the budget can never be funded; cap them so the weights stay small integers
+    scaled = np.minimum(costs / resolution, capacity + 1)
+    weights = np.ceil(scaled - 1e-9).astype(np.int64)
+    affordable = weights <= capacity
+    exact = bool(np.all(np.abs(scaled - weights)[affordable] <= 1e-9) and scaled_budget - capacity <= 1e-9)
+    return capacity, weights, exact
+
+
+def _closure(i, requires):
+    """Project i together with everything it depends on, directly or indirectly."""
+    chain = [i]
+    while requires[chain[-1]] >= 0:
+        nxt = requires[chain[-1]]
+        if nxt in chain:
+            raise ValueError("Project dependencies form a cycle")
+        chain.append(nxt)
+    return chain
+
+
+# ---------------------------------------------------------
+# EXACT: DYNAMIC PROGRAMMING (one budget, exclusivity groups)
+# ---------------------------------------------------------
+def knapsack_dp(values, costs, budget, groups=None, resolution=None):
+    """
+    Exact 0/1 knapsack by dynamic programming over budget units.
+
+    Projects in the same exclusivity group form one multiple-choice stage
+    (at most one is taken); the rest are their own stage. Each project is
+    one array operation over all capacities, so the work is
+    projects x capacity. Costs are measured in units of `resolution`
+    (default: 1 when costs and budget are whole numbers no larger than
+    DP_CAPACITY, otherwise budget / DP_CAPACITY), rounded up, so the
+    selection never exceeds the budget and is optimal for the rounded costs,
+    but not necessarily for the actual ones.
+    Returns a boolean selection.
+    """
+    values = np.asarray(values, dtype=float)
+    costs = np.asarray(costs, dtype=float)
+    n = values.size
+    capacity, weights, _ = _dp_units(costs, budget, resolution)
+
+    # Only projects that fit and add value can be part of an optimal choice
+    candidates = np.flatnonzero((values > 0) & (weights <= capacity))
+    codes = _group_codes(groups, n)[candidates]
+    stages = [candidates[codes == code] for code in np.unique(codes[codes >= 0])]
+    stages += [np.array([i]) for i in candidates[codes < 0]]
+
+    best = np.zeros(capacity + 1)
+    choices = []
+    for stage in stages:
+        previous = best
+        best = previous.copy()
+        choice = np.zeros(capacity + 1, dtype=np.min_scalar_type(len(stage)))
+        for k, i in enumerate(stage, start=1):
+            w = weights[i]
+            take = previous[:capacity + 1 - w] + values[i]
+            better = take > best[w:]
+            best[w:][better] = take[better]
+            choice[w:][better] = k
+        choices.append(choice)
+
+    selected = np.zeros(n, dtype=bool)
+    c = capacity
+    for stage, choice in zip(reversed(stages), reversed(choices)):
+        k = choice[c]
+        if k:
+            i = stage[k - 1]
+            selected[i] = True
+            c -= weights[i]
+    return selected
+
+
+# ---------------------------------------------------------
+# INTEGER / LINEAR PROGRAMMING (multi-period budgets, all constraints)
+# ---------------------------------------------------------
+def _constraints(costs, budgets, groups, requires):
+    """Budget rows (one per period), one row per exclusivity group and one per dependency."""
+    n = costs.shape[0]
+    rows = [csr_matrix(costs.T)]
+    upper = [budgets]
+
+    codes = _group_codes(groups, n)
+    grouped = np.flatnonzero(codes >= 0)
+    if grouped.size:
+        rows.append(csr_matrix((np.ones(grouped.size), (codes[grouped], grouped)), shape=(codes.max() + 1, n)))
+        upper.append(np.ones(codes.max() + 1))
+
+    dependent = np.flatnonzero(requires >= 0)
+    if dependent.size:
+        r = np.arange(dependent.size)
+        rows.append(csr_matrix(
+            (np.r_[np.ones(dependent.size), -np.ones(dependent.size)],
+             (np.r_[r, r], np.r_[dependent, requires[dependent]])),
+            shape=(dependent.size, n),
+        ))
+        upper.append(np.zeros(dependent.size))
+
+    return vstack(rows).tocsr(), np.concatenate(upper)
+
+
+def _greedy_fill(order, values, costs, budgets, groups, requires):
+    """
+    Add projects in `order` whenever they (with the projects they depend on)
+    fit every period's budget, keep each exclusivity group to one project
+    and add value.
+    """
+    codes = _group_codes(groups, len(values))
+    selected = np.zeros(len(values), dtype=bool)
+    used_groups = set()
+    remaining = np.array(budgets, dtype=float)
+
+    for i in order:
+        if selected[i]:
+            continue
+        chain = [j for j in _closure(i, requires) if not selected[j]]
+        chain_groups = [codes[j] for j in chain if codes[j] >= 0]
+        if len(set(chain_groups)) < len(chain_groups) or used_groups.intersection(chain_groups):
+            continue
+        spend = costs[chain].sum(axis=0)
+        if values[chain].sum() <= 0 or np.any(spend > remaining + 1e-9):
+            continue
+        selected[chain] = True
+        used_groups.update(chain_groups)
+        remaining -= spend
+    return selected
+
+
+def _profitability_order(values, costs):
+    """Projects by NPV per unit of total capital used, best first (free positive-NPV projects lead)."""
+    total = costs.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(total > 0, values / total, np.where(values > 0, np.inf, -np.inf))
+    return np.argsort(-ratio, kind="stable")
+
+
+# ---------------------------------------------------------
+# SELECTION
+# ---------------------------------------------------------
+def select_projects(values, costs, budgets, groups=None, requires=None, method="auto"):
+    """
+    Choose the set of projects with the highest total NPV within the budgets.
+
+    `costs` is (projects x budget periods), or one cost per project for a
+    single budget; `budgets` has one entry per period. Projects sharing an
+    exclusivity group label are mutually exclusive, and `requires` gives
+    the index of the project each one depends on (NaN/-1 for none).
+
+    - dp:     dynamic programming (one budget, no dependencies); exact when
+              costs and budget are whole units, otherwise optimal only for
+              the costs rounded up to budget / DP_CAPACITY
+    - milp:   integer programming (HiGHS branch and bound, zero optimality
+              gap), any constraints; optimal unless it hits MILP_TIME_LIMIT
+    - lp:     LP relaxation, rounded by filling projects in order of their
+              fractional value; the LP optimum is an upper bound on the NPV
+    - greedy: profitability-index ranking, filled while budgets allow
+    - auto:   dp when it applies without rounding costs and the DP table
+              stays below DP_MAX_CELLS, milp up to MILP_MAX_PROJECTS
+              projects, otherwise lp
+
+    Returns a dict with the boolean `selected`, `npv`, `spend` per period,
+    the `method` used, the LP `upper_bound` when one was computed, whether
+    the selection is proven `optimal`, whether the DP `rounded` the costs,
+    and the solver's `message`.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.size
+    costs = np.asarray(costs, dtype=float).reshape(n, -1)
+    budgets = np.atleast_1d(np.asarray(budgets, dtype=float))
+    if costs.shape[1] != budgets.size:
+        raise ValueError(f"Costs cover {costs.shape[1]} period(s) but {budgets.size} budget(s) were given")
+    if np.any(costs < 0) or np.any(budgets < 0):
+        raise ValueError("Costs and budgets cannot be negative")
+    requires = _requirement_index(requires, n)
+
+    if method == "auto":
+        simple = budgets.size == 1 and not np.any(requires >= 0) and _whole_units(costs, budgets[0])
+        if simple and n * (DP_CAPACITY + 1) <= DP_MAX_CELLS:
+            method = "dp"
+        elif n <= MILP_MAX_PROJECTS:
+            method = "milp"
+        else:
+            method = "lp"
+
+    upper_bound = np.nan
+    optimal = rounded = False
+    message = ""
+    if method == "dp":
+        if budgets.size != 1 or np.any(requires >= 0):
+            raise ValueError("Dynamic programming handles one budget and no dependencies; use integer programming")
+        selected = knapsack_dp(values, costs[:, 0], budgets[0], groups)
+        rounded = not _dp_units(costs[:, 0], budgets[0])[2]
+        optimal = not rounded
+    elif method in ("milp", "lp"):
+        A, upper = _constraints(costs, budgets, groups, requires)
+        if method == "milp":
+            result = milp(
+                -values,
+                constraints=LinearConstraint(A, -np.inf, upper),
+                integrality=np.ones(n),
+                bounds=Bounds(0, 1),
+                options={"time_limit": MILP_TIME_LIMIT, "mip_rel_gap": 0},
+            )
+            if result.x is None:
+                raise ValueError(f"The integer program could not be solved: {result.message}")
+            selected = result.x > 0.5
+            # Status 1 means the time limit stopped the search with a feasible, unproven selection
+            optimal = bool(result.success)
+            message = result.message
+        else:
+            result = linprog(-values, A_ub=A, b_ub=upper, bounds=(0, 1), method="highs")
+            if result.status != 0:
+                raise ValueError(f"The LP relaxation could not be solved: {result.message}")
+            upper_bound = -result.fun
+            order = np.lexsort((-values, -result.x))
+            selected = _greedy_fill(order, values, costs, budgets, groups, requires)
+    elif method == "greedy":
+        selected = _greedy_fill(_profitability_order(values, costs), values, costs, budgets, groups, requires)
+    else:
+        raise ValueError(f"Unknown selection method: {method}")
+
+    return {
+        "selected": selected,
+        "npv": values[selected].sum(),
+        "spend": costs[selected].sum(axis=0),
+        "method": method,
+        "upper_bound": upper_bound,
+        "optimal": optimal,
+        "rounded": rounded,
+        "message": message,
+    }
+
+
+def capex_columns(columns):
+    """Per-period capital columns of a project table (capex_0, capex_1, ...), in period order."""
+    found = [c for c in columns if c.startswith(CAPEX_PREFIX) and c[len(CAPEX_PREFIX):].isdigit()]
+    return sorted(found, key=lambda c: int(c[len(CAPEX_PREFIX):]))
+
+
+def ration_capital(projects, budgets, method="auto"):
+    """
+    Select projects from an evaluated portfolio (indexed by project_id, with
+    an `npv` column) under capital budgets.
+
+    Capital used per period comes from capex_0, capex_1, ... columns when
+    present, otherwise from initial_investment against a single budget.
+    Optional `exclusive_group` and `requires` (a project_id) columns add
+    the exclusivity and dependency constraints.
+    Returns (selected projects, result dict from select_projects).
+    """
+    columns = capex_columns(projects.columns) or ["initial_investment"]
+    costs = np.nan_to_num(projects[columns].to_numpy(dtype=float))
+
+    requires = None
+    if "requires" in projects:
+        position = pd.Series(np.arange(len(projects)), index=projects.index)
+        needed = projects["requires"].dropna()
+        unknown = set(needed) - set(position.index)
+        if unknown:
+            raise ValueError(f"Unknown required project(s): {', '.join(map(str, sorted(unknown, key=str)))}")
+        requires = projects["requires"].map(position).to_numpy(dtype=float)
+
+    result = select_projects(
+        np.nan_to_num(projects["npv"].to_numpy(dtype=float)),
+        costs,
+        budgets,
+        projects["exclusive_group"] if "exclusive_group" in projects else None,
+        requires,
+        method,
+    )
+    return projects[result["selected"]], result
+
+
+# ---------------------------------------------------------
+# BENCHMARK
+# ---------------------------------------------------------
+def random_portfolio(n_projects, n_periods=1, exclusive_share=0.2, dependent_share=0.1, seed=None):
+    """Random project values, costs, groups and dependencies for benchmarking."""
+    rng = np.random.default_rng(seed)
+    costs = rng.uniform(10, 1_000, (n_projects, n_periods))
+    values = costs.sum(axis=1) * rng.normal(0.15, 0.25, n_projects)
+    groups = np.where(rng.random(n_projects) < exclusive_share, rng.integers(0, max(n_projects // 10, 1), n_projects), np.nan)
+    requires = np.where(
+        rng.random(n_projects) < dependent_share,
+        rng.integers(0, n_projects, n_projects),
+        -1,
+    )
+    # Depend only on earlier projects, so dependencies never form cycles
+    requires = np.where(requires < np.arange(n_projects), requires, -1)
+    budgets = costs.sum(axis=0) * 0.3
+    return values, costs, budgets, groups, requires.astype(float)
+
+
+def benchmark(sizes=(100, 1_000, 5_000, 20_000), methods=("dp", "milp", "lp", "greedy"), n_periods=1,
+              constrained=False, seed=0):
+    """
+    Runtime and total NPV of each method against portfolio size.
+
+    With `constrained` the portfolios also have exclusivity groups and
+    dependencies (dp is then skipped). Methods that exceed their size
+    limits are skipped too. Returns a DataFrame with one row per run.
+    """
+    rows = []
+    for n in sizes:
+        values, costs, budgets, groups, requires = random_portfolio(
+            n, n_periods, 0.2 if constrained else 0.0, 0.1 if constrained else 0.0, seed
+        )
+        for method in methods:
+            if method == "dp" and (n_periods > 1 or constrained or n * (DP_CAPACITY + 1) > DP_MAX_CELLS):
+                continue
+            if method == "milp" and n > MILP_MAX_PROJECTS:
+                continue
+            start = time.perf_counter()
+            result = select_projects(values, costs, budgets, groups, requires, method)
+            rows.append({
+                "projects": n,
+                "method": method,
+                "seconds": time.perf_counter() - start,
+                "npv": result["npv"],
+                "selected": int(result["selected"].sum()),
+            })
+    return pd.DataFrame(rows)
+
+
+# Run directly
+if __name__ == "__main__":
+    print(benchmark().to_string(index=False))
+    print(benchmark(n_periods=3, constrained=True, methods=("milp", "lp", "greedy")).to_string(index=False))
@@ -0,0 +1,208 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from components.bond_engine import bond_arrays, bond_terms, solve_ytm
+from components.yield_curve import YieldCurve
+
+
+NSS_PARAMS = ["beta0", "beta1", "beta2", "beta3", "tau1", "tau2"]
+PANEL_COLUMNS = ["face_value", "coupon_rate", "years", "frequency", "market_price"]
+
+
+# ---------------------------------------------------------
+# NELSON-SIEGEL-SVENSSON CURVE
+# ---------------------------------------------------------
+def _hump(x):
+    """(1 - e^-x) / x, equal to 1 at x = 0."""
+    small = np.abs(x) < 1e-8
+    x_safe = np.where(small, 1.0, x)
+    return np.where(small, 1 - x / 2, -np.expm1(-x_safe) / x_safe)
+
+
+def nss_loadings(t, tau1, tau2):
+    """Factor loadings of the four NSS betas at times t, stacked on the last axis."""
+    t = np.asarray(t, dtype=float)
+    x1 = t / tau1
+    x2 = t / tau2
+    h1 = _hump(x1)
+    h2 = _hump(x2)
+    return np.stack([np.ones_like(t), h1, h1 - np.exp(-x1), h2 - np.exp(-x2)], axis=-1)
+
+
+def nss_zero_rates(t, params):
+    """Continuously compounded NSS zero rates at times t."""
+    beta = np.asarray(params[:4], dtype=float)
+    return nss_loadings(t, params[4], params[5]) @ beta
+
+
+def nss_curve(params, max_tenor=30.0, step=0.25, method="linear"):
+    """YieldCurve sampled from NSS parameters, for use by the bond tool and DCF."""
+    tenors = np.arange(step, max_tenor + step / 2, step)
+    return YieldCurve.from_zero(tenors, np.expm1(nss_zero_rates(tenors, params)), method)
+
+
+# ---------------------------------------------------------
+# CASH-FLOW MATRIX
+# ---------------------------------------------------------
+def cash_flow_matrix(face_value, coupon_rate, years, frequency):
+    """
+    Padded (bonds x periods) matrices of cash-flow times and amounts.
+
+    Periods past a bond's maturity carry a zero cash flow, so the whole
+    panel prices as one matrix expression.
+    """
+    face_value, coupon_rate, _, years, frequency = bond_arrays(
+        face_value, coupon_rate, 0.0, years, frequency
+    )
+    coupon_payment, total_periods = bond_terms(face_value, coupon_rate, years, frequency)
+    face_value, coupon_payment, total_periods, frequency = (
+        np.atleast_1d(a) for a in (face_value, coupon_payment, total_periods, frequency)
+    )
+
+    k = np.arange(1, int(total_periods.max()) + 1)
+    alive = k[None, :] <= total_periods[:, None]
+    times = np.where(alive, k[None, :] / frequency[:, None], 0.0)
+    cash_flows = np.where(alive, coupon_payment[:, None], 0.0)
+    cash_flows[np.arange(len(total_periods)), total_periods.astype(int) - 1] += face_value
+    return times, cash_flows
+
+
+# ---------------------------------------------------------
+# LEAST-SQUARES FIT
+# ---------------------------------------------------------
+def _model_prices(times, cash_flows, params):
+    discount = np.exp(-times * nss_zero_rates(times, params))
+    return (cash_flows * discount).sum(axis=1), discount
+
+
+def _initial_guess(face_value, coupon_rate, years, frequency, market_price):
+    ytm = np.log1p(solve_ytm(market_price, face_value, coupon_rate, years, frequency))
+    ok = np.isfinite(ytm)
+    if not ok.any():
+        return np.array([0.03, 0.0, 0.0, 0.0, 1.5, 8.0])
+    short = ytm[ok][np.argmin(years[ok])]
+    long = ytm[ok][np.argmax(years[ok])]
+    return np.array([long, short - long, 0.0, 0.0, 1.5, 8.0])
+
+
+def fit_nss(face_value, coupon_rate, years, frequency, market_price,
+            initial=None, weights=None, max_iter=200, tol=1e-12):
+    """
+    Fit NSS parameters to observed bond prices by Levenberg-Marquardt.
+
+    Every iteration prices the whole panel as one (bonds x periods) matrix
+    expression; the beta columns of the Jacobian are analytic and the two
+    decay parameters (fitted on a log scale to stay positive) use forward
+    differences. Rates are decimals. Returns (params, rmse) with the RMSE
+    in price units.
+    """
+    face_value, coupon_rate, _, years, frequency = (
+        np.atleast_1d(a) for a in bond_arrays(face_value, coupon_rate, 0.0, years, frequency)
+    )
+    market_price = np.asarray(market_price, dtype=float).ravel()
+    times, cash_flows = cash_flow_matrix(face_value, coupon_rate, years, frequency)
+    w = np.ones_like(market_price) if weights is None else np.asarray(weights, dtype=float)
+
+    if initial is None:
+        initial = _initial_guess(face_value, coupon_rate, years, frequency, market_price)
+    theta = np.array(initial, dtype=float)
+    theta[4:] = np.log(theta[4:])
+
+    def unpack(th):
+        return np.concatenate([th[:4], np.exp(th[4:])])
+
+    def residuals(th):
+        model, discount = _model_prices(times, cash_flows, unpack(th))
+        return w * (model - market_price), discount
+
+    r, discount = residuals(theta)
+    cost = r @ r
+    lam = 1e-3
+    h = 1e-6
+
+    for _ in range(max_iter):
+        params = unpack(theta)
+        jac = np.empty((len(r), 6))
+        loadings = nss_loadings(times, params[4], params[5])
+        jac[:, :4] = -w[:, None] * np.einsum("nk,nkj->nj", cash_flows * discount * times, loadings)
+        for j in (4, 5):
+            bumped = theta.copy()
+            bumped[j] += h
+            jac[:, j] = (residuals(bumped)[0] - r) / h
+
+        a = jac.T @ jac
+        g = jac.T @ r
+        improved = False
+        while lam < 1e12:
+            step = np.linalg.solve(a + lam * np.diag(np.diag(a) + 1e-12), -g)
+            trial = theta + step
+            r_trial, discount_trial = residuals(trial)
+            cost_trial = r_trial @ r_trial
+            if np.isfinite(cost_trial) and cost_trial < cost:
+                improved = True
+                break
+            lam *= 4
+
+        if not improved:
+            break
+
+        converged = cost - cost_trial <= tol * max(cost, 1e-300) or np.abs(step).max() < 1e-12
+        theta, r, discount, cost = trial, r_trial, discount_trial, cost_trial
+        lam = max(lam / 3, 1e-12)
+        if converged:
+            break
+
+    return unpack(theta), float(np.sqrt(cost / len(r)))
+
+
+# ---------------------------------------------------------
+# PANEL REFITS (one fit per date, in a process pool)
+# ---------------------------------------------------------
+def _fit_chunk(chunk):
+    """Fit consecutive dates, warm-starting each from the previous day's parameters."""
+    results = []
+    previous = None
+    for date, arrays in chunk:
+        params, rmse = fit_nss(*arrays, initial=previous)
+        results.append((date, *params, rmse, len(arrays[0])))
+        previous = params
+    return results
+
+
+def fit_nss_panel(panel, date_column="date", processes=None, chunks_per_process=4):
+    """
+    Refit the NSS curve for every date in a bond price panel.
+
+    `panel` holds PANEL_COLUMNS (rates in percent, like the page inputs)
+    plus `date_column`. Dates are split into contiguous chunks and the
+    chunks are fitted across a process pool; `processes=1` runs in-process.
+    Returns one row of parameters per date.
+    """
+    groups = []
+    for date, day in panel.groupby(date_column, sort=True):
+        groups.append((
+            date,
+            (
+                day["face_value"].to_numpy(dtype=float),
+                day["coupon_rate"].to_numpy(dtype=float) / 100,
+                day["years"].to_numpy(dtype=float),
+                day["frequency"].to_numpy(),
+                day["market_price"].to_numpy(dtype=float),
+            ),
+        ))
+
+    processes = processes or os.cpu_count() or 1
+    n_chunks = max(1, min(len(groups), processes * chunks_per_process))
+    chunks = [[groups[i] for i in idx] for idx in np.array_split(np.arange(len(groups)), n_chunks)]
+
+    if processes == 1:
+        fitted = [_fit_chunk(c) for c in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            fitted = list(pool.map(_fit_chunk, chunks))
+
+    rows = [row for chunk in fitted for row in chunk]
+    return pd.DataFrame(rows, columns=[date_column, *NSS_PARAMS, "rmse", "bonds"]).set_index(date_column)
@@ -0,0 +1,80 @@
+import io
+
+import pandas as pd
+
+
+# ---------------------------------------------------------
+# TABLE INPUT (CSV / PARQUET)
+# ---------------------------------------------------------
+def _file_name(source):
+    return str(getattr(source, "name", source)).lower()
+
+
+def read_table(source):
+    """Read a CSV or Parquet file (path or uploaded file) into a DataFrame."""
+    if _file_name(source).endswith((".parquet", ".pq")):
+        return pd.read_parquet(source)
+    return pd.read_csv(source)
+
+
+def iter_table(source, chunk_rows=50_000):
+    """
+    Read a CSV or Parquet file in chunks of at most chunk_rows rows.
+
+    CSV goes through pandas' chunked reader and Parquet through pyarrow's
+    record batches, so only one chunk is held in memory at a time.
+    """
+    if _file_name(source).endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(source, chunksize=chunk_rows)
+
+
+def require_columns(df, columns):
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+
+# ---------------------------------------------------------
+# TABLE OUTPUT (CSV / PARQUET)
+# ---------------------------------------------------------
+def write_table_chunks(chunks, destination, file_format=None):
+    """
+    Write a stream of DataFrames to one CSV or Parquet file as they arrive.
+
+    The format follows the destination's extension unless `file_format`
+    ("csv" or "parquet") is given, e.g. for an open temporary file. Only
+    one chunk is held in memory at a time. Returns the number of rows.
+    """
+    file_format = file_format or ("parquet" if _file_name(destination).endswith((".parquet", ".pq")) else "csv")
+    rows = 0
+
+    if file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(destination, table.schema)
+                writer.write_table(table)
+                rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+
+    if isinstance(destination, str):
+        with open(destination, "w", newline="") as handle:
+            return write_table_chunks(chunks, handle, "csv")
+    for chunk in chunks:
+        text = chunk.to_csv(index=False, header=rows == 0)
+        destination.write(text if isinstance(destination, io.TextIOBase) else text.encode("utf-8"))
+        rows += len(chunk)
+    return rows
@@ -0,0 +1,139 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from components.data_io import iter_table, write_table_chunks
+from components.dcf_engine import assumption_path, value_companies
+
+
+COMPANY_COLUMNS = [
+    "company_id", "starting_revenue", "revenue_growth", "ebit_margin", "tax_rate",
+    "da_percent", "capex_percent", "wc_percent", "years", "wacc", "terminal_growth",
+    "net_debt", "shares_outstanding",
+]
+PERCENT_COLUMNS = [
+    "revenue_growth", "ebit_margin", "tax_rate", "da_percent", "capex_percent", "wc_percent", "wacc", "terminal_growth",
+]
+FADE_COLUMNS = {"final_revenue_growth": "revenue_growth", "final_ebit_margin": "ebit_margin"}
+RESULT_COLUMNS = [
+    "pv_fcfs", "terminal_value", "pv_terminal", "enterprise_value", "equity_value", "value_per_share",
+]
+DEFAULT_CHUNK_ROWS = 20_000
+
+
+# ---------------------------------------------------------
+# ONE CHUNK (runs in a worker process)
+# ---------------------------------------------------------
+def value_chunk(chunk):
+    """
+    Value every company in one assumptions table.
+
+    Rates are in percent, as on the page. Optional final_revenue_growth and
+    final_ebit_margin columns fade growth and ramp the margin linearly to
+    the final forecast year (blank = constant). Companies are grouped by
+    forecast horizon and each group is one value_companies call on a
+    (companies x years) layout. Returns one row per company with
+    RESULT_COLUMNS.
+    """
+    missing = [c for c in COMPANY_COLUMNS if c not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    results = []
+    for years, group in chunk.groupby(chunk["years"].astype(int), sort=False):
+        if years < 1:
+            raise ValueError("Forecast horizons must be at least one year")
+        rate = {c: group[c].to_numpy(dtype=float) / 100 for c in PERCENT_COLUMNS}
+
+        paths = {}
+        for final_column, column in FADE_COLUMNS.items():
+            end = group[final_column].to_numpy(dtype=float) / 100 if final_column in group else np.full(len(group), np.nan)
+            paths[column] = assumption_path(rate[column], np.where(np.isnan(end), rate[column], end), years)
+
+        valued = value_companies(
+            group["starting_revenue"].to_numpy(dtype=float),
+            paths["revenue_growth"],
+            paths["ebit_margin"],
+            rate["tax_rate"][:, None],
+            rate["da_percent"][:, None],
+            rate["capex_percent"][:, None],
+            rate["wc_percent"][:, None],
+            years,
+            rate["wacc"][:, None],
+            rate["terminal_growth"],
+            group["net_debt"].to_numpy(dtype=float),
+            group["shares_outstanding"].to_numpy(dtype=float),
+        )
+        results.append(pd.DataFrame(
+            {"company_id": group["company_id"].to_numpy(), **{c: valued[c] for c in RESULT_COLUMNS}},
+            index=group.index,
+        ))
+
+    return pd.concat(results).sort_index() if results else pd.DataFrame(columns=["company_id"] + RESULT_COLUMNS)
+
+
+# ---------------------------------------------------------
+# BATCH RUNNER (chunks across a process pool)
+# ---------------------------------------------------------
+def value_chunks(chunks, processes=None):
+    """
+    Value a stream of assumption chunks, yielding results in input order.
+
+    With more than one process, chunks are valued in a process pool; at
+    most two chunks per worker are in flight, so memory stays bounded
+    however large the input is.
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1:
+        for chunk in chunks:
+            yield value_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(value_chunk, chunk))
+            if len(pending) >= 2 * processes:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def run_batch(source, destination, chunk_rows=DEFAULT_CHUNK_ROWS, processes=None, file_format=None):
+    """
+    Value a universe of companies from a CSV/Parquet file of assumptions
+    and write one result row per company to `destination` (CSV or Parquet).
+
+    Returns the number of companies, the elapsed seconds and the
+    throughput in companies per second.
+    """
+    start = time.perf_counter()
+    companies = write_table_chunks(
+        value_chunks(iter_table(source, chunk_rows), processes), destination, file_format
+    )
+    seconds = time.perf_counter() - start
+    return {
+        "companies": companies,
+        "seconds": seconds,
+        "companies_per_second": companies / seconds if seconds > 0 else np.nan,
+    }
+
+
+# Run directly: python -m components.dcf_batch assumptions.csv results.parquet
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch DCF valuation of a company universe.")
+    parser.add_argument("source", help="CSV or Parquet file of company assumptions")
+    parser.add_argument("destination", help="CSV or Parquet file for the results")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all CPUs)")
+    args = parser.parse_args()
+
+    stats = run_batch(args.source, args.destination, args.chunk_rows, args.processes)
+    print(
+        f"Valued {stats['companies']:,} companies in {stats['seconds']:.2f}s "
+        f"({stats['companies_per_second']:,.0f} companies/s) -> {args.destination}"
+    )
@@ -0,0 +1,291 @@
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+DCF_CACHE_SIZE = 1024
+PROJECTION_LINES = ["revenue", "ebit", "tax", "da", "capex", "wc_change", "fcff"]
+ASSUMPTION_PROFILES = ["Constant", "Linear Fade"]
+
+
+# ---------------------------------------------------------
+# PER-YEAR ASSUMPTIONS
+# ---------------------------------------------------------
+def assumption_path(start, end=None, years=5, profile="Linear Fade"):
+    """
+    Per-year assumption vector (last axis = years).
+
+    Constant repeats `start`; Linear Fade moves in equal steps from `start`
+    in year 1 to `end` in the final year (growth fading to a long-run rate,
+    a margin ramping to its target). `start` and `end` may be arrays of
+    companies, giving a (companies x years) result.
+    """
+    start = np.asarray(start, dtype=float)[..., None]
+    years = int(years)
+    if profile == "Constant" or end is None:
+        return np.broadcast_to(start, start.shape[:-1] + (years,)).copy()
+    if profile == "Linear Fade":
+        end = np.asarray(end, dtype=float)[..., None]
+        steps = np.arange(years) / max(years - 1, 1)
+        return start + (end - start) * steps
+    raise ValueError(f"Unknown assumption profile: {profile}")
+
+
+def _per_year(value):
+    """
+    An assumption with the year axis last: scalars become (1,); arrays are
+    per year (years,), per company (companies, 1) or full (companies, years).
+    """
+    value = np.asarray(value, dtype=float)
+    return value[None] if value.ndim == 0 else value
+
+
+# ---------------------------------------------------------
+# OPERATING PROJECTION (companies x years)
+# ---------------------------------------------------------
+def project_fcff(starting_revenue, revenue_growth, ebit_margin, tax_rate,
+                 da_percent, capex_percent, wc_percent, years):
+    """
+    Revenue, EBIT, taxes, D&A, capex, working-capital change and FCFF for
+    every company and year, without a Python loop.
+
+    Every assumption is a decimal and may be a scalar, one value per year
+    (years,), one value per company as a column (companies, 1) or a full
+    (companies x years) array; `starting_revenue` is a scalar or
+    (companies,). Revenue compounds with a cumulative product
+    of (1 + growth) along the year axis. As in the page,
+    FCFF = EBIT * (1 - tax) + D&A - capex - change in working capital,
+    with D&A, capex and the working-capital change as shares of revenue.
+    Returns a dict of PROJECTION_LINES arrays of shape (..., years).
+    """
+    years = int(years)
+    if years < 1:
+        raise ValueError("The forecast needs at least one year")
+    starting_revenue = np.asarray(starting_revenue, dtype=float)[..., None]
+    growth, margin, tax, da_p, capex_p, wc_p = (
+        _per_year(a) for a in (revenue_growth, ebit_margin, tax_rate, da_percent, capex_percent, wc_percent)
+    )
+
+    revenue = starting_revenue * np.cumprod(np.broadcast_to(1 + growth, np.broadcast_shapes(
+        starting_revenue.shape[:-1] + (years,), growth.shape
+    )), axis=-1)
+    ebit = revenue * margin
+    taxes = ebit * tax
+    da = revenue * da_p
+    capex = revenue * capex_p
+    wc_change = revenue * wc_p
+    fcff = ebit - taxes + da - capex - wc_change
+
+    return {
+        "revenue": revenue,
+        "ebit": ebit,
+        "tax": taxes,
+        "da": da,
+        "capex": capex,
+        "wc_change": wc_change,
+        "fcff": fcff,
+    }
+
+
+# ---------------------------------------------------------
+# DISCOUNTING AND TERMINAL VALUE
+# ---------------------------------------------------------
+def discount_fcff(fcff, wacc, terminal_growth):
+    """
+    Present value of the forecast FCFFs and of a Gordon-growth terminal value.
+
+    `wacc` is a scalar, per year (years,), per company (companies, 1) or
+    (companies x years); `terminal_growth` is a scalar or (companies,). The
+    discount factors are a cumulative product of 1 / (1 + r) along the
+    year axis. The terminal value grows the final FCFF at `terminal_growth`
+    and capitalizes it at the final-year rate; where r <= g it is NaN, as
+    on the page, and so is the enterprise value.
+    """
+    fcff = np.asarray(fcff, dtype=float)
+    rates = _per_year(wacc)
+    g = np.asarray(terminal_growth, dtype=float)
+
+    factors = np.cumprod(np.broadcast_to(1 / (1 + rates), np.broadcast_shapes(fcff.shape, rates.shape)), axis=-1)
+    pv_fcfs = np.einsum("...t,...t->...", fcff, factors)
+
+    r_final = rates[..., -1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal_value = np.where(r_final > g, fcff[..., -1] * (1 + g) / (r_final - g), np.nan)
+    pv_terminal = terminal_value * factors[..., -1]
+
+    return {
+        "discount_factors": factors,
+        "pv_fcfs": pv_fcfs,
+        "terminal_value": terminal_value,
+        "pv_terminal": pv_terminal,
+        "enterprise_value": pv_fcfs + pv_terminal,
+    }
+
+
+def equity_bridge(enterprise_value, net_debt, shares_outstanding):
+    """Equity value and value per share (NaN without a positive share count)."""
+    equity_value = np.asarray(enterprise_value, dtype=float) - np.asarray(net_debt, dtype=float)
+    shares = np.asarray(shares_outstanding, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value_per_share = np.where(shares > 0, equity_value / shares, np.nan)
+    return {"equity_value": equity_value, "value_per_share": value_per_share}
+
+
+def value_companies(starting_revenue, revenue_growth, ebit_margin, tax_rate, da_percent, capex_percent,
+                    wc_percent, years, wacc, terminal_growth, net_debt, shares_outstanding):
+    """
+    Full DCF for one company or a whole (companies x years) universe in one call.
+
+    Chains project_fcff, discount_fcff and equity_bridge; all rates are
+    decimals. Returns the projection lines and every valuation output.
+    """
+    projection = project_fcff(
+        starting_revenue, revenue_growth, ebit_margin, tax_rate, da_percent, capex_percent, wc_percent, years
+    )
+    valuation = discount_fcff(projection["fcff"], wacc, terminal_growth)
+    bridge = equity_bridge(valuation["enterprise_value"], net_debt, shares_outstanding)
+    return {**projection, **valuation, **bridge}
+
+
+# ---------------------------------------------------------
+# CACHED STAGES (operating -> discounting -> equity bridge)
+# ---------------------------------------------------------
+# Stages computed by the current thread's cached_valuation call. Each
+# Streamlit session runs in its own thread, so this is not affected by
+# other sessions hitting or filling the shared caches.
+_computed = threading.local()
+
+
+def _ran(stage, result):
+    getattr(_computed, "stages", []).append(stage)
+    return _frozen(result)
+
+
+def _frozen(result):
+    for values in result.values():
+        if isinstance(values, np.ndarray):
+            values.setflags(write=False)
+    return result
+
+
+@lru_cache(maxsize=DCF_CACHE_SIZE)
+def _cached_projection(operating):
+    return _ran("projection", project_fcff(*operating))
+
+
+@lru_cache(maxsize=DCF_CACHE_SIZE)
+def _cached_discounting(operating, wacc, terminal_growth):
+    return _ran("discounting", discount_fcff(_cached_projection(operating)["fcff"], wacc, terminal_growth))
+
+
+@lru_cache(maxsize=DCF_CACHE_SIZE)
+def _cached_bridge(operating, wacc, terminal_growth, net_debt, shares_outstanding):
+    enterprise_value = _cached_discounting(operating, wacc, terminal_growth)["enterprise_value"]
+    return _ran("equity bridge", equity_bridge(enterprise_value, net_debt, shares_outstanding))
+
+
+def _key(value):
+    """Hashable cache key for a scalar or per-year assumption."""
+    value = np.asarray(value, dtype=float)
+    return float(value) if value.ndim == 0 else tuple(value.ravel().tolist())
+
+
+def cached_valuation(starting_revenue, revenue_growth, ebit_margin, tax_rate, da_percent, capex_percent,
+                     wc_percent, years, wacc, terminal_growth, net_debt, shares_outstanding):
+    """
+    value_companies for one company, memoized stage by stage.
+
+    The projected FCFFs are keyed on the operating assumptions only, the
+    present values on those plus WACC and terminal growth, and the equity
+    bridge on everything. Changing net debt or the share count therefore
+    recomputes only the bridge, and changing WACC leaves the projection
+    alone. Each stage sits in a process-wide LRU cache of DCF_CACHE_SIZE
+    entries, so repeated what-ifs (from any session) are served from
+    memory. Results are read-only arrays. Returns (result, stages), where
+    stages lists the stages this call had to compute (recorded by the
+    stage functions themselves, per thread, not read from the shared
+    cache counters).
+    """
+    operating = (
+        _key(starting_revenue), _key(revenue_growth), _key(ebit_margin), _key(tax_rate),
+        _key(da_percent), _key(capex_percent), _key(wc_percent), int(years),
+    )
+    rates = (_key(wacc), _key(terminal_growth))
+    bridge = (_key(net_debt), _key(shares_outstanding))
+
+    _computed.stages = []
+    try:
+        result = {
+            **_cached_projection(operating),
+            **_cached_discounting(operating, *rates),
+            **_cached_bridge(operating, *rates, *bridge),
+        }
+        stages = [name for name in ("projection", "discounting", "equity bridge") if name in _computed.stages]
+    finally:
+        del _computed.stages
+    return result, stages
+
+
+def dcf_cache_info():
+    """Hits, misses and size of each cached stage."""
+    return {
+        "projection": _cached_projection.cache_info(),
+        "discounting": _cached_discounting.cache_info(),
+        "equity bridge": _cached_bridge.cache_info(),
+    }
+
+
+# ---------------------------------------------------------
+# SENSITIVITY GRID (WACC x terminal growth [x margin])
+# ---------------------------------------------------------
+def sensitivity_grid(fcff, wacc_values, growth_values, net_debt, shares_outstanding,
+                     margin_shifts=None, revenue=None, tax_rate=None):
+    """
+    Enterprise value, equity value and value per share over a WACC x
+    terminal-growth grid, optionally with a third axis of EBIT-margin shifts.
+
+    The FCFF stream does not depend on the discount rate, so it is
+    discounted once per WACC with a (WACC x years) factor table and reused
+    for every growth rate. A margin shift of d adds revenue * (1 - tax) * d
+    to each year's FCFF, so the third axis only needs the present value of
+    that after-tax revenue stream (pass `revenue` and `tax_rate`). Cells
+    with r <= g are NaN. Returns arrays of shape (WACC, growth) or
+    (margin, WACC, growth).
+    """
+    fcff = np.asarray(fcff, dtype=float)
+    r = np.asarray(wacc_values, dtype=float)
+    g = np.asarray(growth_values, dtype=float)
+
+    factors = np.cumprod(np.broadcast_to(1 / (1 + r[:, None]), (r.size, fcff.size)), axis=1)
+    pv_fcfs = factors @ fcff
+    last_fcff = fcff[-1]
+
+    if margin_shifts is not None:
+        shifts = np.asarray(margin_shifts, dtype=float)[:, None, None]
+        after_tax_revenue = np.asarray(revenue, dtype=float) * (1 - tax_rate)
+        pv_fcfs = pv_fcfs[:, None] + shifts * (factors @ after_tax_revenue)[:, None]
+        last_fcff = last_fcff + shifts * after_tax_revenue[-1]
+    else:
+        pv_fcfs = pv_fcfs[:, None]
+
+    spread = r[:, None] - g[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terminal_value = np.where(spread > 0, last_fcff * (1 + g) / spread, np.nan)
+    enterprise_value = pv_fcfs + terminal_value * factors[:, -1, None]
+
+    return {
+        "enterprise_value": enterprise_value,
+        **equity_bridge(enterprise_value, net_debt, shares_outstanding),
+    }
+
+
+def projection_table(result, company=None):
+    """One company's projection as a DataFrame with one row per forecast year."""
+    pick = (lambda a: np.asarray(a)) if company is None else (lambda a: np.asarray(a)[company])
+    lines = {name: pick(result[name]) for name in PROJECTION_LINES}
+    lines["pv_fcff"] = lines["fcff"] * pick(result["discount_factors"])
+    table = pd.DataFrame(lines)
+    table.index = pd.RangeIndex(1, len(table) + 1, name="year")
+    return table
@@ -0,0 +1,115 @@
+import numpy as np
+from scipy.special import ndtr
+
+from components.dcf_engine import value_companies
+from components.quantile_sketch import QuantileSketch
+
+
+DRIVERS = {
+    "revenue_growth": "Revenue Growth",
+    "ebit_margin": "EBIT Margin",
+    "capex_percent": "Capex % of Revenue",
+    "wacc": "WACC",
+}
+DISTRIBUTIONS = ["Normal", "Uniform", "Triangular"]
+SIMULATED_OUTPUTS = ["enterprise_value", "equity_value", "value_per_share", "pv_fcfs", "pv_terminal", "terminal_value"]
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+# ---------------------------------------------------------
+# CORRELATED DRIVER SHOCKS (Gaussian copula)
+# ---------------------------------------------------------
+def correlation_cholesky(correlation):
+    """Lower Cholesky factor of a driver correlation matrix, with a readable error if it is not valid."""
+    correlation = np.asarray(correlation, dtype=float)
+    if correlation.ndim != 2 or correlation.shape[0] != correlation.shape[1]:
+        raise ValueError("The correlation matrix must be square")
+    if not np.allclose(correlation, correlation.T) or not np.allclose(np.diag(correlation), 1.0):
+        raise ValueError("The correlation matrix must be symmetric with ones on the diagonal")
+    if np.any(np.abs(correlation) > 1):
+        raise ValueError("Correlations must lie between -1 and 1")
+    try:
+        return np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        raise ValueError("The correlation matrix is not positive definite") from None
+
+
+def marginal_shocks(z, distribution, spread):
+    """
+    Map standard normals to zero-centred shocks of one driver.
+
+    Normal: standard deviation `spread`. Uniform: +/- spread.
+    Triangular: +/- spread, peaked at zero (inverse CDF of the uniform
+    obtained from z, so the correlation structure carries over).
+    """
+    if distribution == "Normal":
+        return spread * z
+    u = ndtr(z)
+    if distribution == "Uniform":
+        return spread * (2 * u - 1)
+    if distribution == "Triangular":
+        return spread * np.where(u < 0.5, np.sqrt(2 * u) - 1, 1 - np.sqrt(2 * (1 - u)))
+    raise ValueError(f"Unknown distribution: {distribution}")
+
+
+def driver_shocks(rng, size, drivers, cholesky):
+    """(paths,) shocks per driver; correlated normals z = e @ L.T, then mapped to each marginal."""
+    z = rng.standard_normal((size, len(drivers))) @ cholesky.T
+    return {
+        name: marginal_shocks(z[:, k], distribution, spread)
+        for k, (name, (distribution, spread)) in enumerate(drivers.items())
+    }
+
+
+# ---------------------------------------------------------
+# SIMULATION (chunked, streamed into quantile sketches)
+# ---------------------------------------------------------
+def simulate_dcf(base, drivers, correlation, n_paths=100_000, chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    Monte Carlo DCF with correlated driver shocks, aggregated in streaming sketches.
+
+    `base` holds the value_companies inputs as decimals, with
+    revenue_growth and ebit_margin as per-year vectors. `drivers` maps
+    each simulated driver (a DRIVERS key) to (distribution, spread); each
+    path draws one shock per driver, correlated through `correlation`
+    (same order as `drivers`), and adds it to the driver in every year.
+    Paths run as (paths x years) arrays chunk by chunk; each chunk is
+    folded into one QuantileSketch per SIMULATED_OUTPUTS entry and then
+    dropped, so memory does not grow with n_paths. Paths where WACC <=
+    terminal growth have no terminal value and are counted as missing.
+    Returns {output: QuantileSketch}.
+    """
+    unknown = set(drivers) - set(DRIVERS)
+    if unknown:
+        raise ValueError(f"Unknown driver(s): {', '.join(sorted(unknown))}")
+    cholesky = correlation_cholesky(correlation)
+    if cholesky.shape[0] != len(drivers):
+        raise ValueError("The correlation matrix needs one row per simulated driver")
+
+    rng = np.random.default_rng(seed)
+    sketches = {name: QuantileSketch() for name in SIMULATED_OUTPUTS}
+
+    done = 0
+    while done < n_paths:
+        size = min(chunk_size, n_paths - done)
+        shocks = driver_shocks(rng, size, drivers, cholesky)
+
+        inputs = dict(base)
+        for name, shock in shocks.items():
+            inputs[name] = np.asarray(base[name], dtype=float) + shock[:, None]
+        inputs["starting_revenue"] = np.full(size, float(base["starting_revenue"]))
+
+        result = value_companies(**inputs)
+        for name, sketch in sketches.items():
+            sketch.update(result[name])
+        done += size
+
+    return sketches
+
+
+def sketch_summary(sketch, percentiles=(5, 25, 50, 75, 95)):
+    """Mean, standard deviation and percentiles of one simulated output."""
+    summary = {"mean": sketch.mean, "std": sketch.std}
+    for p, q in zip(percentiles, sketch.percentile(percentiles)):
+        summary[f"p{p}"] = q
+    return summary
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+
+# Spot rates are quoted in SEK per unit of each currency; interest rates are
+# annually compounded decimals. Used as page defaults only.
+DEFAULT_SPOTS = {"SEK": 1.0, "EUR": 11.50, "USD": 10.60, "GBP": 13.40, "NOK": 1.00, "DKK": 1.54}
+DEFAULT_RATES = {"SEK": 0.025, "EUR": 0.025, "USD": 0.045, "GBP": 0.045, "NOK": 0.040, "DKK": 0.022}
+CURRENCIES = list(DEFAULT_SPOTS)
+
+
+# ---------------------------------------------------------
+# FX CURVE (spot + covered-interest-parity forwards)
+# ---------------------------------------------------------
+class FxCurve:
+    """
+    FX spot rates and forward curves for a set of currencies.
+
+    `spots` gives the value of one unit of each currency in a common quote
+    currency (any one will do, e.g. SEK per unit); `rates` gives each
+    currency's interest rate, either an annually compounded decimal or a
+    YieldCurve. Forwards follow covered interest parity:
+
+        F(ccy -> base, T) = S(ccy -> base) * DF_ccy(T) / DF_base(T)
+
+    Forwards are cached per (pair, tenor) on a sorted grid for each pair
+    and looked up with searchsorted, so a book with many cash flows on the
+    same dates computes each forward once.
+    """
+
+    def __init__(self, spots, rates):
+        missing = set(spots) - set(rates)
+        if missing:
+            raise ValueError(f"No interest rate for: {', '.join(sorted(missing))}")
+        if any(s <= 0 for s in spots.values()):
+            raise ValueError("Spot rates must be positive")
+        self.spots = {ccy: float(s) for ccy, s in spots.items()}
+        self.rates = dict(rates)
+        self._grids = {}
+
+    @property
+    def currencies(self):
+        return list(self.spots)
+
+    def _check(self, *currencies):
+        unknown = sorted(set(currencies) - set(self.spots))
+        if unknown:
+            raise ValueError(f"Unknown currency: {', '.join(map(str, unknown))}")
+
+    def discount(self, currency, t):
+        """Discount factors in `currency` at times t (years)."""
+        rate = self.rates[currency]
+        t = np.asarray(t, dtype=float)
+        if hasattr(rate, "discount"):
+            return rate.discount(t)
+        return (1 + float(rate)) ** -t
+
+    def spot(self, currency, base):
+        """Units of `base` per unit of `currency` today."""
+        self._check(currency, base)
+        return self.spots[currency] / self.spots[base]
+
+    def forward(self, currency, base, tenors):
+        """Forward rates (units of `base` per unit of `currency`) at the tenors (years)."""
+        self._check(currency, base)
+        tenors = np.asarray(tenors, dtype=float)
+        if currency == base:
+            return np.ones(tenors.shape)
+
+        flat = tenors.ravel()
+        grid_t, grid_f = self._grids.get((currency, base), (np.empty(0), np.empty(0)))
+
+        idx = np.searchsorted(grid_t, flat)
+        hit = idx < len(grid_t)
+        hit[hit] = grid_t[idx[hit]] == flat[hit]
+
+        if not hit.all():
+            new_t = np.unique(flat[~hit])
+            new_f = self.spot(currency, base) * self.discount(currency, new_t) / self.discount(base, new_t)
+            grid_t = np.concatenate([grid_t, new_t])
+            order = np.argsort(grid_t, kind="stable")
+            grid_t = grid_t[order]
+            grid_f = np.concatenate([grid_f, new_f])[order]
+            self._grids[(currency, base)] = (grid_t, grid_f)
+            idx = np.searchsorted(grid_t, flat)
+
+        return grid_f[idx].reshape(tenors.shape)
+
+    def convert(self, amounts, currencies, tenors, base):
+        """
+        Convert amounts in mixed currencies to `base` at each one's forward rate.
+
+        `currencies` and `tenors` broadcast against `amounts` (e.g. one
+        currency per project row and one tenor per period column). Forwards
+        are built once as a (currencies x distinct tenors) table and every
+        amount picks its rate from it in a single gather, so the work does
+        not depend on how many rows share a currency or a date.
+        """
+        amounts = np.asarray(amounts, dtype=float)
+        currencies = np.asarray(currencies, dtype=object)
+        tenors = np.asarray(tenors, dtype=float)
+        codes, labels = pd.factorize(currencies.ravel())
+        if np.any(codes < 0):
+            raise ValueError("Every cash flow needs a currency")
+        self._check(*labels)
+
+        unique_t, tenor_index = np.unique(tenors.ravel(), return_inverse=True)
+        table = np.stack([self.forward(ccy, base, unique_t) for ccy in labels])
+        rates = table[codes.reshape(currencies.shape), tenor_index.reshape(tenors.shape)]
+        return amounts * rates
+
+    def forward_table(self, base, tenors):
+        """Forward rates of every currency into `base` at the tenors, one row per tenor."""
+        tenors = np.asarray(tenors, dtype=float)
+        return pd.DataFrame(
+            {ccy: self.forward(ccy, base, tenors) for ccy in self.spots if ccy != base},
+            index=pd.Index(tenors, name="tenor"),
+        )
+
+
+# ---------------------------------------------------------
+# TABLES (many rows, mixed currencies)
+# ---------------------------------------------------------
+def convert_columns(table, fx, base, tenors, currency_column="currency"):
+    """
+    Copy of a table with money columns converted to `base`.
+
+    `tenors` maps each column to its tenor in years (e.g. cf_3 -> 3);
+    every row is in the currency named in `currency_column`. All columns
+    and rows go through one FxCurve.convert call.
+    """
+    if currency_column not in table:
+        raise ValueError(f"Missing required column(s): {currency_column}")
+    columns = [c for c in tenors if c in table.columns]
+    converted = table.copy()
+    converted[columns] = fx.convert(
+        table[columns].to_numpy(dtype=float),
+        table[currency_column].to_numpy(dtype=object)[:, None],
+        np.array([tenors[c] for c in columns], dtype=float),
+        base,
+    )
+    converted[currency_column] = base
+    return converted
@@ -0,0 +1,297 @@
+import time
+
+import numpy as np
+
+from components.bond_engine import price_bonds
+from components.dcf_engine import assumption_path, value_companies
+from components.npv_engine import npv, period_rate
+from components.wacc_engine import wacc
+
+
+# ---------------------------------------------------------
+# CALCULATORS AS PURE FUNCTIONS (one case per array element)
+# ---------------------------------------------------------
+def bond_model(face_value, coupon_rate, yield_rate, years, frequency):
+    """Plain-vanilla bond price, as on the Bond Pricing page."""
+    return {"price": price_bonds(face_value, coupon_rate, yield_rate, years, frequency)}
+
+
+def dcf_model(starting_revenue, revenue_growth, ebit_margin, tax_rate, da_percent, capex_percent,
+              wc_percent, years, wacc, terminal_growth, net_debt, shares_outstanding,
+              final_revenue_growth=None, final_ebit_margin=None):
+    """
+    DCF page valuation for many cases at once.
+
+    Every input except `years` is a scalar or one value per case. Growth
+    and margin fade linearly to the final values when those are given
+    (the page's Linear Fade profile), otherwise they are constant.
+    """
+    years = int(years)
+    if final_revenue_growth is None:
+        final_revenue_growth = revenue_growth
+    if final_ebit_margin is None:
+        final_ebit_margin = ebit_margin
+
+    (starting_revenue, revenue_growth, ebit_margin, tax_rate, da_percent, capex_percent, wc_percent,
+     wacc, terminal_growth, net_debt, shares_outstanding, final_revenue_growth, final_ebit_margin) = (
+        np.atleast_1d(a) for a in np.broadcast_arrays(*(np.asarray(a, dtype=float) for a in (
+            starting_revenue, revenue_growth, ebit_margin, tax_rate, da_percent, capex_percent, wc_percent,
+            wacc, terminal_growth, net_debt, shares_outstanding, final_revenue_growth, final_ebit_margin,
+        )))
+    )
+    return value_companies(
+        starting_revenue,
+        assumption_path(revenue_growth, final_revenue_growth, years),
+        assumption_path(ebit_margin, final_ebit_margin, years),
+        tax_rate[:, None],
+        da_percent[:, None],
+        capex_percent[:, None],
+        wc_percent[:, None],
+        years,
+        wacc[:, None],
+        terminal_growth,
+        net_debt,
+        shares_outstanding,
+    )
+
+
+def wacc_model(debt_weight, cost_of_equity, cost_of_debt, tax_rate):
+    """WACC page calculation, with the capital structure given as the debt weight D/V."""
+    debt_weight = np.asarray(debt_weight, dtype=float)
+    return wacc(1 - debt_weight, debt_weight, cost_of_equity, cost_of_debt, tax_rate)
+
+
+def npv_model(initial_investment, cash_flows, annual_discount_rate, periods_per_year, cash_flow_scale=1.0):
+    """
+    NPV page calculation for many cases at once.
+
+    `cash_flows` is the page's per-period vector and is shared by every
+    case; `cash_flow_scale` multiplies all of it, so solving for the
+    scale gives the break-even level of the cash flows.
+    """
+    scale = np.asarray(cash_flow_scale, dtype=float)[..., None]
+    rates = period_rate(annual_discount_rate, periods_per_year)
+    return {"npv": npv(initial_investment, scale * np.asarray(cash_flows, dtype=float), rates)}
+
+
+# ---------------------------------------------------------
+# MODEL REGISTRY
+# ---------------------------------------------------------
+# For every solvable input: its label, the default search bracket, the
+# hard limits the bracket may never be widened past, and whether it is a
+# rate shown in percent. `fixed` inputs are shared by all cases and are
+# passed through unchanged.
+GOAL_SEEK_MODELS = {
+    "bond": {
+        "function": bond_model,
+        "outputs": {"price": ("Bond Price", False)},
+        "fixed": [],
+        "solvable": {
+            "coupon_rate": ("Coupon Rate", (0.0, 0.20), (0.0, np.inf), True),
+            "yield_rate": ("Yield to Maturity", (0.0, 0.20), (-0.99, np.inf), True),
+            "face_value": ("Face Value", (0.0, 10_000.0), (0.0, np.inf), False),
+        },
+    },
+    "dcf": {
+        "function": dcf_model,
+        "outputs": {
+            "value_per_share": ("Value per Share", False),
+            "enterprise_value": ("Enterprise Value", False),
+            "equity_value": ("Equity Value", False),
+        },
+        "fixed": ["years"],
+        "solvable": {
+            "revenue_growth": ("Revenue Growth", (-0.20, 0.30), (-0.99, np.inf), True),
+            "ebit_margin": ("EBIT Margin", (0.0, 0.50), (-np.inf, np.inf), True),
+            "wacc": ("WACC", (0.02, 0.30), (-0.99, np.inf), True),
+            "terminal_growth": ("Terminal Growth Rate", (-0.05, 0.10), (-0.99, np.inf), True),
+            "capex_percent": ("Capex % of Revenue", (0.0, 0.30), (-np.inf, np.inf), True),
+            "starting_revenue": ("Starting Revenue", (0.0, 10_000_000.0), (0.0, np.inf), False),
+        },
+    },
+    "wacc": {
+        "function": wacc_model,
+        "outputs": {"wacc": ("WACC", True)},
+        "fixed": [],
+        "solvable": {
+            "debt_weight": ("Debt Weight (D/V)", (0.0, 1.0), (0.0, 1.0), True),
+            "cost_of_equity": ("Cost of Equity", (0.0, 0.30), (-np.inf, np.inf), True),
+            "cost_of_debt": ("Cost of Debt", (0.0, 0.20), (-np.inf, np.inf), True),
+            "tax_rate": ("Tax Rate", (0.0, 0.50), (-np.inf, 1.0), True),
+        },
+    },
+    "npv": {
+        "function": npv_model,
+        "outputs": {"npv": ("NPV", False)},
+        "fixed": ["cash_flows", "periods_per_year"],
+        "solvable": {
+            "annual_discount_rate": ("Discount Rate (IRR)", (0.0, 0.50), (-0.99, np.inf), True),
+            "initial_investment": ("Initial Investment", (0.0, 100_000.0), (-np.inf, np.inf), False),
+            "cash_flow_scale": ("Cash Flow Scale (× all cash flows)", (0.0, 2.0), (-np.inf, np.inf), False),
+        },
+    },
+}
+
+
+# ---------------------------------------------------------
+# BRACKETED ROOT FINDER (many targets at once)
+# ---------------------------------------------------------
+SCAN_POINTS = 17
+MAX_WIDENINGS = 8
+
+
+def _scan_brackets(evaluate, cases, lower, upper, start):
+    """
+    Bracket a root of evaluate(x, cases) = 0 for every case.
+
+    The function is sampled on SCAN_POINTS points across [lower, upper]
+    for all cases in one call; sign changes between neighbouring finite
+    points are brackets, and the one nearest `start` is kept. Returns
+    (lo, hi, f_lo, f_hi, found).
+    """
+    steps = np.linspace(0.0, 1.0, SCAN_POINTS)
+    grid = lower[:, None] + (upper - lower)[:, None] * steps
+    repeated = np.repeat(cases, SCAN_POINTS)
+    with np.errstate(all="ignore"):
+        values = np.asarray(evaluate(grid.ravel(), repeated), dtype=float).reshape(grid.shape)
+
+    left, right = values[:, :-1], values[:, 1:]
+    brackets = (np.sign(left) * np.sign(right) <= 0) & np.isfinite(left) & np.isfinite(right)
+
+    mid = 0.5 * (grid[:, :-1] + grid[:, 1:])
+    pick = np.argmin(np.where(brackets, np.abs(mid - start[:, None]), np.inf), axis=1)
+    rows = np.arange(len(cases))
+    return (
+        grid[rows, pick], grid[rows, pick + 1],
+        left[rows, pick], right[rows, pick],
+        brackets[rows, pick],
+    )
+
+
+def solve(evaluate, size, lower, upper, limits=(-np.inf, np.inf), start=None, tol=1e-12, max_iter=100):
+    """
+    Roots of evaluate(x, cases) = 0 for `size` independent cases.
+
+    `evaluate(x, cases)` returns the residual at x for the cases indexed
+    by `cases` (an integer array, possibly with repeats). Each case is
+    bracketed by scanning [lower, upper]; cases without a sign change get
+    the range doubled in width (within `limits`) up to MAX_WIDENINGS times.
+    Brackets are then refined together by Illinois regula falsi, which
+    keeps the root bracketed and converges superlinearly; only cases
+    that have not converged are evaluated. Cases with no root in reach
+    come back as NaN.
+    """
+    lower = np.broadcast_to(np.asarray(lower, dtype=float), (size,)).copy()
+    upper = np.broadcast_to(np.asarray(upper, dtype=float), (size,)).copy()
+    start = 0.5 * (lower + upper) if start is None else np.broadcast_to(np.asarray(start, dtype=float), (size,))
+    floor, ceiling = limits
+
+    lo, hi, f_lo, f_hi = (np.full(size, np.nan) for _ in range(4))
+    pending = np.arange(size)
+    for _ in range(MAX_WIDENINGS + 1):
+        if pending.size == 0:
+            break
+        a, b, fa, fb, found = _scan_brackets(evaluate, pending, lower[pending], upper[pending], start[pending])
+        hit = pending[found]
+        lo[hit], hi[hit], f_lo[hit], f_hi[hit] = a[found], b[found], fa[found], fb[found]
+
+        pending = pending[~found]
+        width = upper[pending] - lower[pending]
+        lower[pending] = np.maximum(lower[pending] - width / 2, floor)
+        upper[pending] = np.minimum(upper[pending] + width / 2, ceiling)
+
+    result = np.full(size, np.nan)
+    exact = np.isfinite(lo) & ((f_lo == 0) | (f_hi == 0))
+    result[exact] = np.where(f_lo[exact] == 0, lo[exact], hi[exact])
+    active = np.flatnonzero(np.isfinite(lo) & ~exact)
+    side = np.zeros(size, dtype=int)
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        a, b, fa, fb = lo[active], hi[active], f_lo[active], f_hi[active]
+        x = b - fb * (b - a) / (fb - fa)
+        x = np.where(np.isfinite(x) & (x > a) & (x < b), x, 0.5 * (a + b))
+        with np.errstate(all="ignore"):
+            fx = np.asarray(evaluate(x, active), dtype=float)
+
+        # Keep the sign change inside [lo, hi]; Illinois halves the value
+        # kept at an endpoint that survives twice in a row.
+        left = np.sign(fx) == np.sign(fa)
+        lo[active] = np.where(left, x, a)
+        f_lo[active] = np.where(left, fx, np.where(side[active] == -1, fa / 2, fa))
+        hi[active] = np.where(left, b, x)
+        f_hi[active] = np.where(left, np.where(side[active] == 1, fb / 2, fb), fx)
+        side[active] = np.where(left, 1, -1)
+
+        done = (fx == 0) | ~np.isfinite(fx) | (hi[active] - lo[active] <= tol * (1 + np.abs(x)))
+        result[active[done]] = np.where(np.isfinite(fx[done]), x[done], np.nan)
+        active = active[~done]
+
+    return result
+
+
+# ---------------------------------------------------------
+# GOAL SEEK
+# ---------------------------------------------------------
+def goal_seek(model, inputs, solve_for, target, output=None, bracket=None, tol=1e-12, max_iter=100):
+    """
+    Value of one input that makes a calculator output hit each target.
+
+    `model` is a GOAL_SEEK_MODELS key and `inputs` holds every input of its
+    function (decimals for rates); the current value of `solve_for` only
+    seeds the search, which prefers the root nearest to it. `target` may
+    be a scalar or an array (e.g. a share-price history), and any other
+    input may also vary per target; everything is solved in one
+    vectorized pass. `output` defaults to the model's first output and
+    `bracket` to the registry's search range. Returns an array shaped like
+    the broadcast targets, NaN where no solution is found.
+    """
+    spec = GOAL_SEEK_MODELS[model]
+    if solve_for not in spec["solvable"]:
+        raise ValueError(f"Cannot solve the {model} model for: {solve_for}")
+    output = output or next(iter(spec["outputs"]))
+    if output not in spec["outputs"]:
+        raise ValueError(f"Unknown output for the {model} model: {output}")
+    _, default_bracket, limits, _ = spec["solvable"][solve_for]
+    lower, upper = bracket or default_bracket
+
+    fixed = {name: inputs[name] for name in spec["fixed"]}
+    varying = {name: value for name, value in inputs.items() if name not in spec["fixed"] and name != solve_for}
+    names = list(varying)
+    target, *values = np.broadcast_arrays(
+        np.asarray(target, dtype=float), *(np.asarray(varying[name], dtype=float) for name in names)
+    )
+    shape = target.shape
+    target = target.ravel()
+    per_case = {name: value.ravel() for name, value in zip(names, values)}
+    start = np.clip(np.asarray(inputs.get(solve_for, 0.5 * (lower + upper)), dtype=float), lower, upper)
+    start = np.broadcast_to(start, shape).ravel()
+
+    def evaluate(x, cases):
+        arguments = {name: value[cases] for name, value in per_case.items()}
+        result = spec["function"](**fixed, **arguments, **{solve_for: x})
+        return np.asarray(result[output], dtype=float).reshape(x.shape) - target[cases]
+
+    return solve(
+        evaluate, target.size, lower, upper, limits, start, tol=tol, max_iter=max_iter
+    ).reshape(shape)
+
+
+# Run directly: python -m components.goal_seek  (implied growth for a price history)
+if __name__ == "__main__":
+    base = {
+        "starting_revenue": 1_000_000.0, "revenue_growth": 0.05, "ebit_margin": 0.15, "tax_rate": 0.20,
+        "da_percent": 0.04, "capex_percent": 0.05, "wc_percent": 0.02, "years": 5, "wacc": 0.09,
+        "terminal_growth": 0.025, "net_debt": 200_000.0, "shares_outstanding": 10_000.0,
+    }
+    rng = np.random.default_rng(0)
+    prices = 150 * np.exp(np.cumsum(rng.normal(0, 0.01, 250_000)))
+
+    start = time.perf_counter()
+    growth = goal_seek("dcf", base, "revenue_growth", prices)
+    seconds = time.perf_counter() - start
+
+    check = dcf_model(**{**base, "revenue_growth": growth})["value_per_share"]
+    print(f"Implied growth for {prices.size:,} prices in {seconds:.2f}s "
+          f"(max price error {np.nanmax(np.abs(check - prices)):.2e}, unsolved {np.isnan(growth).sum()})")
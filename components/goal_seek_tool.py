@@ -0,0 +1,119 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from components.data_io import read_table, require_columns
+from components.goal_seek import GOAL_SEEK_MODELS, goal_seek
+
+
+TARGET_COLUMN = "target"
+
+
+def _format(value, percent):
+    return f"{value * 100:.4f}%" if percent else f"{value:,.2f}"
+
+
+def render_goal_seek(model, inputs, key):
+    """
+    Goal-seek panel for one calculator: pick an input and a target output,
+    then solve for one target or a whole uploaded series of targets.
+    `inputs` are the page's current inputs (decimals for rates).
+    """
+    spec = GOAL_SEEK_MODELS[model]
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        solve_for = st.selectbox(
+            "Solve for",
+            list(spec["solvable"]),
+            format_func=lambda name: spec["solvable"][name][0],
+            key=f"{key}_solve_for"
+        )
+
+    with col2:
+        output = st.selectbox(
+            "Target output",
+            list(spec["outputs"]),
+            format_func=lambda name: spec["outputs"][name][0],
+            key=f"{key}_output"
+        )
+
+    with col3:
+        mode = st.radio("Targets", ["Single Target", "Target Series (Upload)"], key=f"{key}_mode")
+
+    label, _, _, percent = spec["solvable"][solve_for]
+    output_label, output_percent = spec["outputs"][output]
+    output_scale = 100 if output_percent else 1
+    current = float(np.ravel(spec["function"](**inputs)[output])[0])
+
+    if mode == "Single Target":
+        target = st.number_input(
+            f"Target {output_label}{' (%)' if output_percent else ''}",
+            value=current * output_scale if np.isfinite(current) else 0.0,
+            key=f"{key}_target"
+        ) / output_scale
+
+        try:
+            solution = float(goal_seek(model, inputs, solve_for, target, output))
+        except ValueError as exc:
+            st.error(f"Could not run the goal seek: {exc}")
+            return
+
+        if np.isnan(solution):
+            st.warning(f"No {label.lower()} in the search range gives this {output_label.lower()}.")
+            return
+
+        st.metric(
+            f"Required {label}",
+            _format(solution, percent),
+            delta=f"{(solution - float(inputs[solve_for])) * (100 if percent else 1):+,.4f}{' pp' if percent else ''} vs. current"
+        )
+        return
+
+    st.markdown(f"""
+Upload a **CSV or Parquet** file with one target {output_label.lower()} per row in a
+`{TARGET_COLUMN}` column{' (in %)' if output_percent else ''}, e.g. a price history.
+Other columns, such as a `date`, are kept. All targets are solved together.
+""")
+
+    uploaded = st.file_uploader("Target file", type=["csv", "parquet"], key=f"{key}_file")
+    if uploaded is None:
+        return
+
+    try:
+        table = read_table(uploaded)
+        require_columns(table, [TARGET_COLUMN])
+        solutions = goal_seek(
+            model, inputs, solve_for, table[TARGET_COLUMN].to_numpy(dtype=float) / output_scale, output
+        )
+    except (ValueError, KeyError) as exc:
+        st.error(f"Could not run the goal seek: {exc}")
+        return
+
+    column = f"{label}{' (%)' if percent else ''}"
+    table[column] = solutions * (100 if percent else 1)
+
+    c1, c2 = st.columns(2)
+    c1.metric("🎯 Targets", f"{len(table):,}")
+    c2.metric("✅ Solved", f"{np.isfinite(solutions).sum():,}")
+
+    x = table["date"] if "date" in table else table.index
+    fig = go.Figure(go.Scatter(x=x, y=table[column], mode="lines", name=column))
+    fig.update_layout(
+        title=f"Implied {label} per Target {output_label}",
+        yaxis_title=column,
+        template="simple_white",
+        height=400
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(table, use_container_width=True)
+
+    st.download_button(
+        "Download goal-seek results (CSV)",
+        table.to_csv(index=False).encode("utf-8"),
+        file_name=f"goal_seek_{model}_{solve_for}.csv",
+        mime="text/csv",
+        key=f"{key}_download"
+    )
@@ -0,0 +1,243 @@
+import numpy as np
+
+from components.bond_engine import _as_frequency
+from components.yield_curve import YieldCurve
+
+
+# ---------------------------------------------------------
+# BLACK-DERMAN-TOY SHORT-RATE LATTICE
+# ---------------------------------------------------------
+class RateLattice:
+    """
+    Recombining binomial short-rate lattice (Black-Derman-Toy, flat vol).
+
+    Node (i, j) at time i * dt carries the simple per-period rate
+    r = U_i * exp(2 * sigma * sqrt(dt) * j - sigma * sqrt(dt) * i), with
+    up/down probability 1/2. Each level's median rate U_i is solved so the
+    lattice reprices the curve's discount factor for (i + 1) * dt, using
+    Arrow-Debreu prices rolled forward level by level.
+    """
+
+    def __init__(self, curve, volatility, dt, steps):
+        self.dt = float(dt)
+        self.steps = int(steps)
+        self.volatility = float(volatility)
+
+        spread = self.volatility * np.sqrt(self.dt)
+        targets = curve.discount(np.arange(1, self.steps + 1) * self.dt)
+
+        self.rates = []
+        arrow_debreu = np.array([1.0])
+
+        for i in range(self.steps):
+            shape = np.exp(spread * (2 * np.arange(i + 1) - i))
+            median = self._solve_median(arrow_debreu, shape, targets[i])
+            rates = median * shape
+            self.rates.append(rates)
+
+            discounted = arrow_debreu / (1 + rates * self.dt)
+            arrow_debreu = np.zeros(i + 2)
+            arrow_debreu[:-1] += 0.5 * discounted
+            arrow_debreu[1:] += 0.5 * discounted
+
+    def _solve_median(self, arrow_debreu, shape, target):
+        """
+        Newton solve for U in sum(Q / (1 + U * shape * dt)) = target.
+
+        The left side is convex and decreasing in U, so starting from U = 0
+        (left of any positive root) Newton converges monotonically.
+        """
+        median = 0.0
+        for _ in range(50):
+            denom = 1 + median * shape * self.dt
+            value = np.sum(arrow_debreu / denom) - target
+            slope = -np.sum(arrow_debreu * shape * self.dt / denom ** 2)
+            step = value / slope
+            median -= step
+            if abs(step) < 1e-14:
+                break
+        return median
+
+    def price_bonds(self, face_value, coupon_rate, periods, frequency,
+                    call_price=None, call_start=None, put_price=None, put_start=None, spread=0.0):
+        """
+        Backward induction for many bonds at once on this lattice.
+
+        Values are held as a (bonds x nodes) matrix so every step is one
+        array operation across nodes and bonds. Periods count lattice steps.
+        Call/put prices are clean exercise prices (NaN = no option) that
+        apply from call_start/put_start (in periods) up to maturity. The
+        issuer calls when continuation value exceeds the call price; the
+        holder puts when it falls below the put price. `spread` is added to
+        every lattice rate (used to solve the option-adjusted spread).
+        """
+        face_value, coupon_rate, periods, frequency, call_price, call_start, put_price, put_start, spread = (
+            np.atleast_1d(a).astype(float) for a in np.broadcast_arrays(
+                face_value, coupon_rate, periods, _as_frequency(frequency),
+                np.nan if call_price is None else call_price,
+                0 if call_start is None else call_start,
+                np.nan if put_price is None else put_price,
+                0 if put_start is None else put_start,
+                spread,
+            )
+        )
+        periods = periods.astype(int)
+        if periods.max() > self.steps:
+            raise ValueError("Bond maturity runs past the end of the lattice")
+
+        coupon = face_value * coupon_rate / frequency
+        has_call = ~np.isnan(call_price)
+        has_put = ~np.isnan(put_price)
+
+        n_max = int(periods.max())
+        value = np.zeros((len(face_value), n_max + 1))
+
+        for i in range(n_max, -1, -1):
+            if i < n_max:
+                rates = self.rates[i][None, :] + spread[:, None]
+                value = 0.5 * (value[:, :-1] + value[:, 1:]) / (1 + rates * self.dt)
+
+            matured = i == periods
+            alive = i < periods
+            value[matured] = face_value[matured, None]
+            value[~matured & ~alive] = 0.0
+
+            if i > 0:
+                callable_now = (alive & has_call & (i >= call_start))[:, None]
+                putable_now = (alive & has_put & (i >= put_start))[:, None]
+                value = np.where(callable_now, np.minimum(value, call_price[:, None]), value)
+                value = np.where(putable_now, np.maximum(value, put_price[:, None]), value)
+                value = value + np.where((alive | matured)[:, None], coupon[:, None], 0.0)
+
+        return value[:, 0]
+
+
+# ---------------------------------------------------------
+# CALLABLE / PUTABLE BOND PRICING
+# ---------------------------------------------------------
+def flat_curve(yield_rate, frequency):
+    """Curve matching flat-yield pricing at yield_rate compounded `frequency` times a year."""
+    annual = (1 + yield_rate / frequency) ** frequency - 1
+    return YieldCurve.from_zero([1.0], [annual])
+
+
+def price_option_bonds(curve, volatility, face_value, coupon_rate, years, frequency,
+                       call_price=None, call_start_years=None, put_price=None, put_start_years=None,
+                       spread=0.0):
+    """
+    Option-adjusted prices for callable/putable bonds off one curve.
+
+    Bonds are grouped by coupon frequency and each group shares a single
+    lattice with one step per coupon period. Rates and volatility are
+    decimals; exercise prices are in price units (NaN = no option).
+    """
+    arrays = np.broadcast_arrays(
+        np.asarray(face_value, dtype=float),
+        np.asarray(coupon_rate, dtype=float),
+        np.asarray(years, dtype=float),
+        _as_frequency(frequency),
+        np.asarray(np.nan if call_price is None else call_price, dtype=float),
+        np.asarray(0.0 if call_start_years is None else call_start_years, dtype=float),
+        np.asarray(np.nan if put_price is None else put_price, dtype=float),
+        np.asarray(0.0 if put_start_years is None else put_start_years, dtype=float),
+        np.asarray(spread, dtype=float),
+    )
+    shape = arrays[0].shape
+    face, coupon, years, freq, call, call_start, put, put_start, spread = (np.atleast_1d(a).ravel() for a in arrays)
+    periods = np.floor(years * freq)
+
+    price = np.empty(face.shape)
+    for f in np.unique(freq):
+        group = freq == f
+        lattice = RateLattice(curve, volatility, 1 / f, max(int(periods[group].max()), 1))
+        price[group] = lattice.price_bonds(
+            face[group], coupon[group], periods[group], f,
+            call[group], np.ceil(call_start[group] * f), put[group], np.ceil(put_start[group] * f),
+            spread[group],
+        )
+    return price.reshape(shape)
+
+
+def solve_oas(market_price, curve, volatility, face_value, coupon_rate, years, frequency,
+              call_price=None, call_start_years=None, put_price=None, put_start_years=None,
+              lower=-0.05, upper=0.5, tol=1e-10, max_iter=100):
+    """
+    Option-adjusted spread for many bonds at once.
+
+    Illinois (modified regula falsi) iteration on the spread: every
+    iteration reprices all unconverged bonds with one lattice pass.
+    Bonds whose price is not bracketed come back as NaN.
+    """
+    market_price = np.atleast_1d(np.asarray(market_price, dtype=float))
+    args = [
+        np.broadcast_to(a, market_price.shape) if a is not None else None
+        for a in (face_value, coupon_rate, years, frequency, call_price, call_start_years, put_price, put_start_years)
+    ]
+
+    def error(spread, rows):
+        picked = [a[rows] if a is not None else None for a in args]
+        return price_option_bonds(curve, volatility, *picked, spread=spread) - market_price[rows]
+
+    everything = np.arange(market_price.size)
+    lo = np.full(market_price.size, float(lower))
+    hi = np.full(market_price.size, float(upper))
+    f_lo = error(lo, everything)
+    f_hi = error(hi, everything)
+
+    result = np.full(market_price.size, np.nan)
+    active = np.flatnonzero((f_lo >= 0) & (f_hi <= 0))
+    side = np.zeros(market_price.size)
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        a, b, fa, fb = lo[active], hi[active], f_lo[active], f_hi[active]
+        s = np.where(fa != fb, b - fb * (b - a) / (fb - fa), 0.5 * (a + b))
+        fs = error(s, active)
+
+        done = (np.abs(fs) < tol * np.maximum(market_price[active], 1.0)) | (np.abs(b - a) < tol)
+        result[active[done]] = s[done]
+
+        # Price falls as the spread rises
+        upper_side = fs < 0
+        hi[active] = np.where(upper_side, s, b)
+        f_hi[active] = np.where(upper_side, fs, fb)
+        lo[active] = np.where(upper_side, a, s)
+        f_lo[active] = np.where(upper_side, fa, fs)
+
+        # Illinois step: halve the stale end when the same side is kept twice
+        stale_lo = upper_side & (side[active] == 1)
+        stale_hi = ~upper_side & (side[active] == -1)
+        f_lo[active] = np.where(stale_lo, f_lo[active] / 2, f_lo[active])
+        f_hi[active] = np.where(stale_hi, f_hi[active] / 2, f_hi[active])
+        side[active] = np.where(upper_side, 1, -1)
+
+        active = active[~done]
+
+    return result
+
+
+OPTION_COLUMNS = ["call_price", "call_start_years", "put_price", "put_start_years"]
+
+
+def price_option_book(book, curve, volatility):
+    """
+    Add lattice prices to a book with embedded options.
+
+    Uses any of OPTION_COLUMNS present (exercise prices in price units,
+    start dates in years); rates are in percent. Books with a market_price
+    column also get their option-adjusted spread, in percent.
+    """
+    out = book.copy()
+    terms = (
+        book["face_value"].to_numpy(dtype=float),
+        book["coupon_rate"].to_numpy(dtype=float) / 100,
+        book["years"].to_numpy(dtype=float),
+        book["frequency"].to_numpy(),
+    )
+    options = [book[c].to_numpy(dtype=float) if c in book else None for c in OPTION_COLUMNS]
+
+    out["option_adjusted_price"] = price_option_bonds(curve, volatility, *terms, *options)
+    if "market_price" in book:
+        out["oas"] = solve_oas(book["market_price"].to_numpy(dtype=float), curve, volatility, *terms, *options) * 100
+    return out
@@ -0,0 +1,330 @@
+import contextlib
+import datetime as dt
+import tempfile
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from components.amortization import (
+    AMORTIZATION_METHODS,
+    LOAN_COLUMNS,
+    amortize_book,
+    combine_monthly_totals,
+    monthly_totals,
+)
+from components.data_io import read_table, require_columns
+
+
+def render_loan_tool():
+
+    # ---------------------------------------------------------
+    # PAGE CONFIG
+    # ---------------------------------------------------------
+    st.set_page_config(
+        page_title="Loan Amortization Schedule",
+        page_icon="🏠",
+        layout="wide"
+    )
+
+    # ---------------------------------------------------------
+    # CLEAN PROFESSIONAL STYLING
+    # ---------------------------------------------------------
+    st.markdown("""
+    <style>
+
+    /* Background */
+    .stApp {
+        background-color: #0d1117;
+        color: white;
+        font-family: "Inter", sans-serif;
+    }
+
+    /* Titles */
+    h1, h2, h3 {
+        font-weight: 700;
+        color: #58a6ff;
+    }
+
+    /* Input rounding */
+    div[data-baseweb="input"] {
+        border-radius: 10px !important;
+    }
+
+    /* Metric card */
+    div[data-testid="stMetric"] {
+        background-color: #11142E;
+        padding: 1.3rem;
+        border-radius: 16px;
+        border: 1px solid #30363d;
+        text-align: center;
+    }
+
+    summary {
+        font-size: 1.05rem;
+        font-weight: 600;
+        color: #58a6ff;
+        cursor: pointer;
+    }
+
+    </style>
+    """, unsafe_allow_html=True)
+
+    # ---------------------------------------------------------
+    # HEADER
+    # ---------------------------------------------------------
+    st.title("🏠 Loan Amortization Schedule")
+
+    st.markdown("""
+    This tool splits every loan payment into **interest** and **principal** over the life of the loan:
+
+    - Annuity (level payment), straight-line or interest-only loans
+    - Optional prepayments, either as a yearly rate or a one-off amount
+
+    Upload a whole loan book to see interest and principal **by month across the book**.
+
+    **More information below ↓**
+    """)
+
+    st.divider()
+
+    mode = st.radio("Mode", ["Single Loan", "Loan Book Upload"], horizontal=True)
+
+    if mode == "Loan Book Upload":
+        render_loan_book()
+    else:
+        render_single_loan()
+
+    # ---------------------------------------------------------
+    # INFO SECTION (BOTTOM)
+    # ---------------------------------------------------------
+    st.divider()
+    st.subheader("📘 Additional Information")
+
+    with st.expander("What are the amortization methods?"):
+
+        st.markdown("""
+        - **Annuity**: the same payment every month; early payments are mostly interest,
+          later payments mostly principal
+        - **Straight-Line**: the same principal every month, so payments fall over time
+        - **Interest-Only (Balloon)**: only interest is paid, and the whole principal is repaid at maturity
+        """)
+
+        st.latex(r"""
+        PMT = B \times \frac{r}{1 - (1+r)^{-n}}
+        """)
+
+        st.markdown("""
+        **Where:**
+
+        - **B** = Outstanding balance
+        - **r** = Monthly interest rate
+        - **n** = Remaining months
+        """)
+
+    with st.expander("How are prepayments handled?"):
+
+        st.markdown("""
+        - The **CPR** (conditional prepayment rate) is the share of the balance repaid early each year;
+          it is applied monthly to the balance left after the scheduled payment
+        - A **one-off prepayment** is paid in the chosen month
+
+        After a prepayment the annuity payment is recalculated over the remaining term,
+        so the loan still ends on its original maturity date.
+        """)
+
+
+def schedule_chart(totals, title):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=totals.index, y=totals["interest"], name="Interest", marker_color="salmon"))
+    fig.add_trace(go.Bar(
+        x=totals.index, y=totals["scheduled_principal"], name="Scheduled Principal", marker_color="steelblue"
+    ))
+    fig.add_trace(go.Bar(x=totals.index, y=totals["prepayment"], name="Prepayment", marker_color="lightgreen"))
+    fig.update_layout(
+        barmode="stack",
+        title=title,
+        xaxis_title="Month",
+        yaxis_title="Amount ($)",
+        template="simple_white",
+        height=450
+    )
+    return fig
+
+
+def render_single_loan():
+
+    # ---------------------------------------------------------
+    # INPUT SECTION
+    # ---------------------------------------------------------
+    st.subheader("📌 Loan Assumptions")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("### Loan Terms")
+        principal = st.number_input("Loan Amount", min_value=0.0, value=250_000.0, step=10_000.0)
+        annual_rate = st.number_input("Interest Rate (% per year)", min_value=0.0, value=5.0, step=0.25)
+
+    with col2:
+        st.markdown("### Repayment")
+        method = st.selectbox("Amortization Method", list(AMORTIZATION_METHODS.keys()))
+        term_months = st.number_input("Term (months)", min_value=1, value=240, step=12)
+        first_payment = st.date_input("First Payment Month", value=dt.date.today().replace(day=1))
+
+    with col3:
+        st.markdown("### Prepayments")
+        cpr = st.number_input("Prepayment Rate (CPR, % per year)", min_value=0.0, max_value=100.0, value=0.0, step=1.0)
+        prepayment_amount = st.number_input("One-Off Prepayment", min_value=0.0, value=0.0, step=1_000.0)
+        prepayment_month = st.number_input("Paid in Month", min_value=1, max_value=int(term_months), value=1, step=1)
+
+    loan = pd.DataFrame({
+        "principal": [principal],
+        "annual_rate": [annual_rate],
+        "term_months": [term_months],
+        "method": [AMORTIZATION_METHODS[method]],
+        "cpr": [cpr],
+        "prepayment_amount": [prepayment_amount],
+        "prepayment_month": [prepayment_month if prepayment_amount > 0 else 0],
+    })
+
+    if principal <= 0:
+        st.info("Enter a loan amount to build the schedule.")
+        return
+
+    schedule = next(amortize_book(loan, first_payment)).drop(columns="loan_id")
+
+    # ---------------------------------------------------------
+    # RESULTS
+    # ---------------------------------------------------------
+    st.divider()
+    st.subheader("📊 Amortization Result")
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("First Payment", f"${schedule['payment'].iloc[0]:,.2f}")
+    m2.metric("Total Interest", f"${schedule['interest'].sum():,.2f}")
+    m3.metric("Months Until Repaid", f"{len(schedule):,}")
+
+    st.plotly_chart(
+        schedule_chart(schedule.set_index("month"), "Interest and Principal by Month"),
+        use_container_width=True
+    )
+
+    st.dataframe(schedule, use_container_width=True, hide_index=True)
+
+    st.download_button(
+        "Download schedule (CSV)",
+        schedule.to_csv(index=False).encode("utf-8"),
+        file_name="amortization_schedule.csv",
+        mime="text/csv",
+    )
+
+
+def render_loan_book():
+
+    # ---------------------------------------------------------
+    # BOOK UPLOAD
+    # ---------------------------------------------------------
+    st.subheader("📂 Loan Book Upload")
+
+    st.markdown(f"""
+    Upload a **CSV or Parquet** file with one loan per row and the columns:
+
+    `{', '.join(LOAN_COLUMNS)}`
+
+    `annual_rate` is in **percent** and `method` is one of
+    `{'`, `'.join(AMORTIZATION_METHODS.values())}`.
+
+    Optional columns:
+
+    - `loan_id` identifies each loan in the export
+    - `first_payment_date` (otherwise the date below is used for every loan)
+    - `cpr` (percent per year), `prepayment_amount` and `prepayment_month`
+    """)
+
+    uploaded = st.file_uploader("Loan book", type=["csv", "parquet"])
+
+    if uploaded is None:
+        return
+
+    b1, b2 = st.columns(2)
+
+    with b1:
+        first_payment = st.date_input(
+            "First Payment Month (if the book has no first_payment_date column)",
+            value=dt.date.today().replace(day=1)
+        )
+
+    with b2:
+        export_schedule = st.checkbox("Prepare the full loan-level schedule for download")
+
+    # Schedules are built a chunk of loans at a time: each chunk is reduced to
+    # monthly totals and (optionally) appended to a CSV on disk, so amortizing
+    # never holds the full loan-level table in memory. The download itself is
+    # read back in one go, since st.download_button needs the whole file.
+    totals = []
+    loans = 0
+    rows = 0
+    schedule_csv = None
+
+    with tempfile.TemporaryFile() if export_schedule else contextlib.nullcontext() as export:
+        try:
+            book = read_table(uploaded)
+            require_columns(book, LOAN_COLUMNS)
+            for chunk in amortize_book(book, first_payment):
+                totals.append(monthly_totals(chunk))
+                rows += len(chunk)
+                if export is not None:
+                    export.write(chunk.to_csv(index=False, header=export.tell() == 0).encode("utf-8"))
+            loans = len(book)
+        except (ValueError, KeyError) as exc:
+            st.error(f"Could not amortize the uploaded book: {exc}")
+            return
+
+        if export is not None:
+            export.seek(0)
+            schedule_csv = export.read()
+
+    if not totals:
+        st.info("The uploaded book has no loans.")
+        return
+
+    by_month = combine_monthly_totals(totals)
+
+    # ---------------------------------------------------------
+    # BOOK RESULTS
+    # ---------------------------------------------------------
+    st.divider()
+    st.subheader("📊 Book Amortization Result")
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Loans", f"{loans:,}")
+    m2.metric("Total Interest", f"${by_month['interest'].sum():,.2f}")
+    m3.metric("Schedule Rows", f"{rows:,}")
+
+    st.plotly_chart(
+        schedule_chart(by_month, "Interest and Principal by Month (Whole Book)"),
+        use_container_width=True
+    )
+
+    st.dataframe(by_month, use_container_width=True)
+
+    st.download_button(
+        "Download monthly totals (CSV)",
+        by_month.to_csv().encode("utf-8"),
+        file_name="loan_book_monthly_totals.csv",
+        mime="text/csv",
+    )
+
+    if schedule_csv is not None:
+        st.download_button(
+            "Download loan-level schedule (CSV)",
+            schedule_csv,
+            file_name="loan_book_schedule.csv",
+            mime="text/csv",
+        )
+
+
+# Run directly
+if __name__ == "__main__":
+    render_loan_tool()
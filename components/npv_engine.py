@@ -0,0 +1,665 @@
+import numpy as np
+import pandas as pd
+
+
+# ---------------------------------------------------------
+# DISCOUNT FACTORS
+# ---------------------------------------------------------
+def discount_factors(rates, periods):
+    """
+    End-of-period discount factors (1 + r)^-t for t = 1..periods.
+
+    `rates` may be a scalar or any array of per-period rates (decimals); the
+    period axis is appended last, so the result has shape rates.shape + (periods,).
+    """
+    rates = np.asarray(rates, dtype=float)
+    t = np.arange(1, int(periods) + 1)
+    return (1 + rates[..., None]) ** -t
+
+
+def period_rate(annual_rate, periods_per_year):
+    """Per-period rate equivalent to an annually compounded rate."""
+    return (1 + np.asarray(annual_rate, dtype=float)) ** (1 / periods_per_year) - 1
+
+
+def annual_rate(rate, periods_per_year):
+    """Annually compounded rate equivalent to a per-period rate."""
+    return (1 + np.asarray(rate, dtype=float)) ** periods_per_year - 1
+
+
+# ---------------------------------------------------------
+# CASH-FLOW PATTERNS
+# ---------------------------------------------------------
+FILL_PATTERNS = ["Constant", "Growth", "Step"]
+
+
+def fill_pattern(pattern, periods, start, growth=0.0, step=0.0, step_every=1):
+    """
+    Cash-flow vector of `periods` values following a pattern:
+    Constant (start every period), Growth (start * (1 + growth)^k) or
+    Step (start + step for every `step_every` periods elapsed).
+    """
+    k = np.arange(int(periods))
+    if pattern == "Constant":
+        return np.full(k.size, float(start))
+    if pattern == "Growth":
+        return start * (1 + growth) ** k
+    if pattern == "Step":
+        return start + step * (k // max(int(step_every), 1))
+    raise ValueError(f"Unknown fill pattern: {pattern}")
+
+
+# ---------------------------------------------------------
+# NPV KERNEL
+# ---------------------------------------------------------
+def present_value(cash_flows, factors):
+    """Present value of cash flows (..., periods) against discount factors (..., periods)."""
+    return np.einsum("...t,...t->...", np.asarray(cash_flows, dtype=float), factors)
+
+
+def npv(initial_investment, cash_flows, rates):
+    """
+    NPV = sum(CF_t / (1 + r)^t) - initial investment, vectorized.
+
+    Cash flows have the periods on the last axis (one row per project);
+    rates broadcast against the leading axes, so one call evaluates many
+    projects, many discount rates, or a grid of both.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    factors = discount_factors(rates, cash_flows.shape[-1])
+    return present_value(cash_flows, factors) - np.asarray(initial_investment, dtype=float)
+
+
+def npv_sensitivities(initial_investment, cash_flows, rate, factors=None, shock=0.10):
+    """
+    NPV with each input moved down/up by `shock` (as a fraction of its value).
+
+    NPV is linear in the investment and in a uniform scaling of the cash
+    flows, so both come straight from the base present value; only the
+    rate shocks need new discount factors, and both are evaluated in one
+    broadcast call. Pass the base `factors` to reuse them.
+    Returns {variable: (low, high)}.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    if factors is None:
+        factors = discount_factors(rate, cash_flows.shape[-1])
+    pv = present_value(cash_flows, factors)
+    low, high = 1 - shock, 1 + shock
+
+    rate_npv = npv(initial_investment, cash_flows, np.array([rate * low, rate * high]))
+    return {
+        "Initial Investment": (pv - initial_investment * low, pv - initial_investment * high),
+        "Cash Flows": (pv * low - initial_investment, pv * high - initial_investment),
+        "Discount Rate": (rate_npv[0], rate_npv[1]),
+    }
+
+
+# ---------------------------------------------------------
+# INCREMENTAL NPV (single-project editing)
+# ---------------------------------------------------------
+class _Fenwick:
+    """Binary indexed tree over a float vector: point updates and prefix sums in O(log n)."""
+
+    def __init__(self, values):
+        values = np.asarray(values, dtype=float)
+        self.size = len(values)
+        index = np.arange(1, self.size + 1)
+        cumulative = np.concatenate([[0.0], np.cumsum(values)])
+        self.tree = np.concatenate([[0.0], cumulative[index] - cumulative[index - (index & -index)]])
+
+    def add(self, i, delta):
+        i += 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, k):
+        """Sum of the first k values."""
+        total = 0.0
+        while k > 0:
+            total += self.tree[k]
+            k -= k & -k
+        return total
+
+    def search(self, target):
+        """
+        Smallest k with prefix(k + 1) >= target, assuming no negative values
+        (so the prefix sums are non-decreasing); size if never reached.
+        """
+        k, remaining = 0, target
+        step = 1 << self.size.bit_length()
+        while step:
+            if k + step <= self.size and self.tree[k + step] < remaining:
+                k += step
+                remaining -= self.tree[k]
+            step >>= 1
+        return k
+
+
+class IncrementalNpv:
+    """
+    NPV, payback and IRR for one project, updated in place as it is edited.
+
+    Keeps the discount-factor vector, the present value and the cash flows
+    in a Fenwick tree of prefix sums. Editing k cash flows (same rate and
+    horizon) moves the NPV by the changed cells times their discount
+    factors and updates the tree in O(k log n); payback is then a search
+    down the tree whenever no cash flow is negative (so the cumulative
+    sums are sorted). IRR restarts from the previous root, and is not
+    re-solved when only the discount rate changes, since it does not
+    depend on it.
+    """
+
+    def __init__(self, initial_investment, cash_flows, rate):
+        self.irr = np.nan
+        self._rebuild(initial_investment, cash_flows, rate)
+
+    def _rebuild(self, initial_investment, cash_flows, rate):
+        self.cash_flows = np.array(cash_flows, dtype=float)
+        self.cumulative = _Fenwick(self.cash_flows)
+        self.negatives = int((self.cash_flows < 0).sum())
+        self._discount(rate)
+        self._solve_irr(initial_investment)
+
+    def _discount(self, rate):
+        self.rate = float(rate)
+        self.factors = discount_factors(self.rate, len(self.cash_flows))
+        self.pv = float(self.cash_flows @ self.factors)
+
+    def _solve_irr(self, initial_investment):
+        self.initial_investment = float(initial_investment)
+        solved = irr_batch(
+            [np.concatenate([[-self.initial_investment], self.cash_flows])],
+            guess=None if np.isnan(self.irr) else [self.irr],
+        )
+        self.irr = float(solved["irr"][0])
+        self.irr_status = solved["status"][0]
+
+    def update(self, initial_investment, cash_flows, rate, changed=None):
+        """
+        Bring the results up to date with new inputs, recomputing only what changed.
+
+        `changed` lists the periods that may have been edited (e.g. the rows
+        touched in a grid); only those are compared and updated. Without
+        it every period is compared.
+        """
+        cash_flows = np.asarray(cash_flows, dtype=float)
+        if len(cash_flows) != len(self.cash_flows):
+            self._rebuild(initial_investment, cash_flows, rate)
+            return self
+
+        candidates = np.arange(len(cash_flows)) if changed is None else np.unique(np.asarray(changed, dtype=int))
+        changed = candidates[cash_flows[candidates] != self.cash_flows[candidates]]
+        if changed.size:
+            old = self.cash_flows[changed]
+            new = cash_flows[changed]
+            self.negatives += int((new < 0).sum() - (old < 0).sum())
+            self.cash_flows[changed] = new
+            if changed.size * 8 > len(cash_flows):
+                self.cumulative = _Fenwick(self.cash_flows)
+            else:
+                for i, delta in zip(changed.tolist(), (new - old).tolist()):
+                    self.cumulative.add(i, delta)
+
+        if float(rate) != self.rate:
+            self._discount(rate)
+        elif changed.size:
+            self.pv += float((new - old) @ self.factors[changed])
+
+        if changed.size or float(initial_investment) != self.initial_investment:
+            self._solve_irr(initial_investment)
+        return self
+
+    @property
+    def npv(self):
+        return self.pv - self.initial_investment
+
+    @property
+    def discounted(self):
+        return self.cash_flows * self.factors
+
+    def payback(self):
+        """Periods until the investment is recovered (interpolated), or NaN if never."""
+        if self.negatives:
+            return float(payback_periods(self.initial_investment, self.cash_flows)[0])
+
+        k = self.cumulative.search(self.initial_investment)
+        if k == len(self.cash_flows):
+            return np.nan
+        before = self.cumulative.prefix(k)
+        return k + (self.initial_investment - before) / self.cash_flows[k]
+
+
+# ---------------------------------------------------------
+# BATCHED IRR (bracket on a grid, then safeguarded Newton)
+# ---------------------------------------------------------
+IRR_STATUS = {0: "no_root", 1: "ok", 2: "multiple_roots"}
+IRR_GRID_POINTS = 256
+MAX_IRR = 1_000.0
+
+
+def _irr_grid(max_time):
+    """Grid in u = ln(1 + r) from near -100% up to MAX_IRR, kept where (1 + r)^-t stays finite."""
+    lowest = max(np.log(0.01), -600.0 / max(max_time, 1))
+    return np.linspace(lowest, np.log1p(MAX_IRR), IRR_GRID_POINTS)
+
+
+def _sign_changes(values):
+    """Sign changes along each row, skipping zeros (Descartes' bound on the number of IRRs)."""
+    signs = np.sign(values)
+    last_nonzero = np.maximum.accumulate(np.where(signs != 0, np.arange(values.shape[1]), 0), axis=1)
+    filled = np.take_along_axis(signs, last_nonzero, axis=1)
+    return (filled[:, 1:] * filled[:, :-1] < 0).sum(axis=1)
+
+
+def _grid_brackets(grid, on_grid):
+    """
+    Brackets from NPV sampled on a grid (series x grid points).
+
+    A cell between neighbouring points is a bracket when NPV changes sign
+    across it or is zero at its left end. Series whose NPV is zero on the
+    whole grid (all-zero cash flows) get no brackets. Returns a
+    (series x cells) boolean array.
+    """
+    left, right = on_grid[:, :-1], on_grid[:, 1:]
+    brackets = ((left < 0) & (right > 0)) | ((left > 0) & (right < 0)) | (left == 0)
+    return brackets & np.any(on_grid != 0, axis=1)[:, None]
+
+
+def _refine_rates(lo, hi, f_lo, u, active, evaluate, tol, max_iter):
+    """
+    Shared root finder for IRR and XIRR, in u = ln(1 + r).
+
+    Each series in `active` with a bracket [lo, hi] is refined by Newton
+    steps from `u`, bisecting whenever a step leaves the bracket, with all
+    series iterated together. `evaluate(u, active)` returns NPV and
+    dNPV/du at u for the series indexed by `active`. Returns the root in
+    u per series (NaN for series not in `active`).
+    """
+    lo, hi, f_lo, u = (np.array(a, dtype=float) for a in (lo, hi, f_lo, u))
+    u = np.where(f_lo == 0, lo, u)
+
+    result = np.full(len(lo), np.nan)
+    active = np.asarray(active, dtype=int)
+    exact = active[f_lo[active] == 0]
+    result[exact] = lo[exact]
+    active = active[f_lo[active] != 0]
+
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        ua = u[active]
+        f, slope = evaluate(ua, active)
+
+        # Shrink the bracket around the root before stepping
+        same_side = np.sign(f) == np.sign(f_lo[active])
+        lo[active] = np.where(same_side, ua, lo[active])
+        f_lo[active] = np.where(same_side, f, f_lo[active])
+        hi[active] = np.where(same_side, hi[active], ua)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = ua - f / slope
+        inside = np.isfinite(newton) & (newton > lo[active]) & (newton < hi[active])
+        u_next = np.where(inside, newton, 0.5 * (lo[active] + hi[active]))
+
+        scale = tol * np.maximum(1.0, np.abs(ua))
+        u_next = np.where(f == 0, ua, u_next)
+        done = (np.abs(u_next - ua) <= scale) | (hi[active] - lo[active] <= scale)
+        u[active] = u_next
+        result[active[done]] = u_next[done]
+        active = active[~done]
+
+    return result
+
+
+def _nearest_zero_roots(grid, on_grid, evaluate, tol, max_iter):
+    """
+    The root with the smallest |r| for every series, from its grid brackets.
+
+    Brackets are visited in order of the smallest |r| they could contain;
+    each pass refines one bracket per series and stops for a series once
+    no unvisited bracket can beat its best root. Series with one bracket
+    need a single pass. Returns (u, number of brackets).
+    """
+    brackets = _grid_brackets(grid, on_grid)
+    n_series = len(on_grid)
+    rows = np.arange(n_series)
+    r_lo, r_hi = np.expm1(grid[:-1]), np.expm1(grid[1:])
+    bound = np.where((r_lo <= 0) & (r_hi >= 0), 0.0, np.minimum(np.abs(r_lo), np.abs(r_hi)))
+
+    best = np.full(n_series, np.nan)
+    best_abs = np.full(n_series, np.inf)
+    remaining = brackets.copy()
+    while True:
+        candidate = np.where(remaining, bound[None, :], np.inf)
+        pick = np.argmin(candidate, axis=1)
+        todo = np.flatnonzero(candidate[rows, pick] < best_abs)
+        if todo.size == 0:
+            break
+        lo, hi = grid[pick], grid[pick + 1]
+        u = _refine_rates(lo, hi, on_grid[rows, pick], 0.5 * (lo + hi), todo, evaluate, tol, max_iter)
+
+        better = todo[np.abs(np.expm1(u[todo])) < best_abs[todo]]
+        best[better] = u[better]
+        best_abs[better] = np.abs(np.expm1(u[better]))
+        remaining[todo, pick[todo]] = False
+
+    return best, brackets.sum(axis=1)
+
+
+def _rate_result(u, roots):
+    roots = np.minimum(roots, 2)
+    return {
+        "irr": np.expm1(u),
+        "roots": roots,
+        "status": np.array([IRR_STATUS[k] for k in roots]),
+    }
+
+
+def irr_batch(cash_flows, guess=None, tol=1e-14, max_iter=100):
+    """
+    IRR for many projects at once.
+
+    `cash_flows` is (projects x periods) with the first column at t = 0
+    (as in numpy_financial.irr); shorter projects can be padded with zeros.
+    Working in u = ln(1 + r), NPV(u) = sum(CF_t * e^(-u t)) is evaluated on
+    a grid for every project with one matrix product, sign changes between
+    grid points give the brackets, and a bracketed Newton iteration refines
+    all projects together. When several roots are bracketed, the one with
+    the smallest |r| is returned, the same choice numpy_financial.irr
+    makes among the roots it finds; two roots closer together than the
+    grid spacing are not separated. All-zero cash flows have no IRR.
+
+    `guess` (per project, e.g. the previous IRR after an edit) warm-starts
+    projects whose cash flows change sign once: their bracket is grown
+    around the guess and Newton starts from it, skipping the grid.
+
+    Returns a dict with `irr` (NaN when no root is found), `roots` (number
+    of brackets found, capped at 2) and `status` (IRR_STATUS labels).
+    """
+    values = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    t = np.arange(values.shape[1])
+
+    def evaluate(u, active):
+        weighted = values[active] * np.exp(-np.outer(u, t))
+        return weighted.sum(axis=1), -(weighted * t).sum(axis=1)
+
+    grid = _irr_grid(t[-1])
+    n_projects = len(values)
+    result = np.full(n_projects, np.nan)
+    roots = np.zeros(n_projects, dtype=int)
+    pending = np.ones(n_projects, dtype=bool)
+
+    if guess is not None:
+        # One sign change means exactly one root (Descartes), so a bracket
+        # grown outwards from the previous root is enough: no grid scan.
+        lo, hi, f_lo, u = (np.full(n_projects, np.nan) for _ in range(4))
+        start = np.broadcast_to(np.log1p(np.asarray(guess, dtype=float)), (n_projects,))
+        warm = np.flatnonzero((_sign_changes(values) == 1) & np.isfinite(start))
+        width = np.full(warm.size, 1e-3)
+        a, b = start[warm] - width, start[warm] + width
+        for _ in range(40):
+            if warm.size == 0:
+                break
+            a, b = np.maximum(a, grid[0]), np.minimum(b, grid[-1])
+            fa, fb = evaluate(a, warm)[0], evaluate(b, warm)[0]
+            found = np.sign(fa) != np.sign(fb)
+            hit = warm[found]
+            lo[hit], hi[hit], f_lo[hit], u[hit] = a[found], b[found], fa[found], start[hit]
+            roots[hit] = 1
+            pending[hit] = False
+            warm, a, b, width = warm[~found], a[~found], b[~found], width[~found] * 4
+            a, b = a - width, b + width
+        solved = np.flatnonzero(~pending)
+        result[solved] = _refine_rates(lo, hi, f_lo, u, solved, evaluate, tol, max_iter)[solved]
+
+    cold = np.flatnonzero(pending)
+    if cold.size:
+        with np.errstate(over="ignore", invalid="ignore"):
+            on_grid = values[cold] @ np.exp(-np.outer(t, grid))
+        result[cold], roots[cold] = _nearest_zero_roots(
+            grid, on_grid, lambda u, active: evaluate(u, cold[active]), tol, max_iter
+        )
+
+    return _rate_result(result, roots)
+
+
+def irr(cash_flows):
+    """IRR of a single cash-flow series (first value at t = 0); NaN when there is no root."""
+    return float(irr_batch([cash_flows])["irr"][0])
+
+
+# ---------------------------------------------------------
+# XNPV / XIRR (date-stamped cash flows, many investments)
+# ---------------------------------------------------------
+DAYS_PER_YEAR = 365.0
+TRANSACTION_COLUMNS = ["investment_id", "date", "amount"]
+
+
+def _grouped_times(dates, group, n_groups):
+    """Year fractions from each investment's first date (ACT/365, as in Excel's XNPV)."""
+    days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+    first = np.full(n_groups, np.iinfo(np.int64).max)
+    np.minimum.at(first, group, days)
+    return (days - first[group]) / DAYS_PER_YEAR
+
+
+def xnpv_grouped(rates, amounts, dates, group, n_groups=None):
+    """
+    XNPV = sum(amount / (1 + r)^((date - first date) / 365)) per investment.
+
+    Transactions are flat arrays with an integer `group` per row (0..n-1),
+    so any number of investments is discounted in one pass and summed
+    with bincount. `rates` is one rate per investment (or a scalar).
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    group = np.asarray(group)
+    n_groups = int(group.max()) + 1 if n_groups is None else n_groups
+    t = _grouped_times(dates, group, n_groups)
+    rates = np.broadcast_to(np.asarray(rates, dtype=float), (n_groups,))
+    return np.bincount(group, amounts * (1 + rates[group]) ** -t, minlength=n_groups)
+
+
+def xirr_grouped(amounts, dates, group, n_groups=None, tol=1e-14, max_iter=100):
+    """
+    XIRR per investment for flat, date-stamped transactions.
+
+    Year fractions are computed once; bracketing and Newton steps then
+    evaluate every investment together with bincount over the rows of the
+    investments still iterating. Returns the same dict as irr_batch.
+    """
+    amounts = np.asarray(amounts, dtype=float)
+    group = np.asarray(group)
+    n_groups = int(group.max()) + 1 if n_groups is None else n_groups
+    t = _grouped_times(dates, group, n_groups)
+
+    grid = _irr_grid(t.max() if t.size else 1)
+    on_grid = np.empty((n_groups, len(grid)))
+    for j, u in enumerate(grid):
+        on_grid[:, j] = np.bincount(group, amounts * np.exp(-u * t), minlength=n_groups)
+    u_row = np.zeros(n_groups)
+
+    def evaluate(u, active):
+        u_row[active] = u
+        rows = np.flatnonzero(np.isin(group, active))
+        weighted = amounts[rows] * np.exp(-u_row[group[rows]] * t[rows])
+        f = np.bincount(group[rows], weighted, minlength=n_groups)[active]
+        slope = -np.bincount(group[rows], weighted * t[rows], minlength=n_groups)[active]
+        return f, slope
+
+    return _rate_result(*_nearest_zero_roots(grid, on_grid, evaluate, tol, max_iter))
+
+
+def xnpv(rate, amounts, dates):
+    """XNPV of a single dated cash-flow series."""
+    return float(xnpv_grouped(rate, amounts, dates, np.zeros(len(amounts), dtype=int), 1)[0])
+
+
+def xirr(amounts, dates):
+    """XIRR of a single dated cash-flow series; NaN when there is no root."""
+    return float(xirr_grouped(amounts, dates, np.zeros(len(amounts), dtype=int), 1)["irr"][0])
+
+
+def evaluate_transactions(transactions, rate):
+    """
+    XNPV at `rate` (decimal) and XIRR for every investment in a
+    transaction table with TRANSACTION_COLUMNS. Returns one row per
+    investment, indexed by investment_id.
+    """
+    ids, group = np.unique(transactions["investment_id"].to_numpy(), return_inverse=True)
+    group = group.ravel()
+    amounts = transactions["amount"].to_numpy(dtype=float)
+    dates = pd.to_datetime(transactions["date"]).to_numpy().astype("datetime64[D]")
+    days = dates.astype(np.int64)
+
+    solved = xirr_grouped(amounts, dates, group, len(ids))
+    first = np.full(len(ids), np.iinfo(np.int64).max)
+    last = np.full(len(ids), np.iinfo(np.int64).min)
+    np.minimum.at(first, group, days)
+    np.maximum.at(last, group, days)
+
+    return pd.DataFrame({
+        "first_date": first.astype("datetime64[D]"),
+        "last_date": last.astype("datetime64[D]"),
+        "transactions": np.bincount(group, minlength=len(ids)),
+        "invested": np.bincount(group, np.minimum(amounts, 0.0), minlength=len(ids)) * -1,
+        "returned": np.bincount(group, np.maximum(amounts, 0.0), minlength=len(ids)),
+        "xnpv": xnpv_grouped(rate, amounts, dates, group, len(ids)),
+        "xirr": solved["irr"],
+        "status": solved["status"],
+    }, index=pd.Index(ids, name="investment_id"))
+
+
+# ---------------------------------------------------------
+# PROJECT METRICS (projects x periods)
+# ---------------------------------------------------------
+PROJECT_COLUMNS = ["project_id", "initial_investment"]
+CASH_FLOW_PREFIX = "cf_"
+
+
+def payback_periods(initial_investment, cash_flows):
+    """
+    Periods until cumulative cash flows recover the investment, per project.
+
+    Interpolates within the period in which payback happens (as the NPV
+    page does); NaN when the investment is never recovered.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    investment = np.broadcast_to(np.asarray(initial_investment, dtype=float), (len(cash_flows),))
+    cumulative = np.cumsum(cash_flows, axis=1)
+
+    reached = cumulative >= investment[:, None]
+    found = reached.any(axis=1)
+    k = np.argmax(reached, axis=1)
+    rows = np.arange(len(cash_flows))
+
+    before = np.where(k > 0, cumulative[rows, k - 1], 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = (investment - before) / cash_flows[rows, k]
+    return np.where(found, k + fraction, np.nan)
+
+
+def mirr(initial_investment, cash_flows, finance_rate, reinvest_rate):
+    """
+    Modified IRR per project: positive flows compounded to the end at the
+    reinvestment rate, negative flows (and the investment) discounted to
+    today at the finance rate.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n = cash_flows.shape[1]
+    t = np.arange(1, n + 1)
+    finance_rate = np.asarray(finance_rate, dtype=float)
+    reinvest_rate = np.asarray(reinvest_rate, dtype=float)
+
+    growth = (1 + reinvest_rate[..., None]) ** (n - t)
+    discount = (1 + finance_rate[..., None]) ** -t
+    future_gains = (np.maximum(cash_flows, 0.0) * growth).sum(axis=1)
+    present_costs = np.asarray(initial_investment, dtype=float) - (np.minimum(cash_flows, 0.0) * discount).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            (future_gains > 0) & (present_costs > 0), (future_gains / present_costs) ** (1 / n) - 1, np.nan
+        )
+
+
+def project_metrics(initial_investment, cash_flows, rates, reinvest_rates=None):
+    """
+    NPV, IRR, payback, discounted payback, MIRR and profitability index for
+    a (projects x periods) cash-flow matrix, one array kernel per metric.
+
+    `rates` are per-project discount rates (decimals, or one shared rate);
+    MIRR reinvests at `reinvest_rates` (default: the discount rate).
+    Returns a dict of per-project arrays.
+    """
+    cash_flows = np.atleast_2d(np.asarray(cash_flows, dtype=float))
+    n_projects, n_periods = cash_flows.shape
+    investment = np.broadcast_to(np.asarray(initial_investment, dtype=float), (n_projects,))
+    rates = np.broadcast_to(np.asarray(rates, dtype=float), (n_projects,))
+    reinvest_rates = rates if reinvest_rates is None else np.broadcast_to(
+        np.asarray(reinvest_rates, dtype=float), (n_projects,)
+    )
+
+    factors = discount_factors(rates, n_periods)
+    discounted = cash_flows * factors
+    pv = discounted.sum(axis=1)
+    solved = irr_batch(np.column_stack([-investment, cash_flows]))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        profitability = np.where(investment > 0, pv / investment, np.nan)
+
+    return {
+        "npv": pv - investment,
+        "irr": solved["irr"],
+        "irr_status": solved["status"],
+        "payback": payback_periods(investment, cash_flows),
+        "discounted_payback": payback_periods(investment, discounted),
+        "mirr": mirr(investment, cash_flows, rates, reinvest_rates),
+        "profitability_index": profitability,
+    }
+
+
+def cash_flow_columns(columns):
+    """Cash-flow columns of a wide project table (cf_1, cf_2, ...), in period order."""
+    found = [c for c in columns if c.startswith(CASH_FLOW_PREFIX) and c[len(CASH_FLOW_PREFIX):].isdigit()]
+    return sorted(found, key=lambda c: int(c[len(CASH_FLOW_PREFIX):]))
+
+
+def evaluate_projects(chunks, discount_rate, reinvest_rate=None, keep_columns=(), keep_prefixes=()):
+    """
+    Evaluate a stream of wide project tables chunk by chunk.
+
+    Each chunk has PROJECT_COLUMNS, cash-flow columns cf_1..cf_N (missing
+    or blank periods count as zero) and optionally a `discount_rate`
+    column in percent that overrides `discount_rate` (decimal). Only the
+    per-project metrics are kept, plus any `keep_columns` and columns
+    starting with one of `keep_prefixes`, so memory does not grow with the
+    number of periods or the file size beyond one chunk. Returns one row
+    per project, indexed by project_id.
+    """
+    results = []
+    for chunk in chunks:
+        missing = [c for c in PROJECT_COLUMNS if c not in chunk.columns]
+        if missing:
+            raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+        columns = cash_flow_columns(chunk.columns)
+        if not columns:
+            raise ValueError(f"No cash-flow columns found (expected {CASH_FLOW_PREFIX}1, {CASH_FLOW_PREFIX}2, ...)")
+
+        rates = chunk["discount_rate"].to_numpy(dtype=float) / 100 if "discount_rate" in chunk else discount_rate
+        metrics = project_metrics(
+            chunk["initial_investment"].to_numpy(dtype=float),
+            np.nan_to_num(chunk[columns].to_numpy(dtype=float)),
+            rates,
+            reinvest_rate,
+        )
+        kept = {
+            c: chunk[c].to_numpy() for c in chunk.columns
+            if c in keep_columns or c.startswith(tuple(keep_prefixes))
+        }
+        results.append(pd.DataFrame(
+            {**metrics, **kept}, index=pd.Index(chunk["project_id"].to_numpy(), name="project_id")
+        ))
+
+    if not results:
+        return pd.DataFrame(columns=["npv", "irr", "irr_status", "payback", "discounted_payback", "mirr", "profitability_index"])
+    return pd.concat(results)
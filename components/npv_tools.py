@@ -1,9 +1,28 @@
 import streamlit as st
 import numpy as np
-import numpy_financial as nf
 import pandas as pd
 import plotly.graph_objects as go
-from components.utils import scroll_top
+from components.capital_rationing import CAPEX_PREFIX, RATIONING_COLUMNS, RATIONING_METHODS, capex_columns, ration_capital
+from components.data_io import iter_table, read_table, require_columns
+from components.fx import CURRENCIES, DEFAULT_RATES, DEFAULT_SPOTS, FxCurve, convert_columns
+from components.goal_seek_tool import render_goal_seek
+from components.npv_engine import (
+    CASH_FLOW_PREFIX,
+    FILL_PATTERNS,
+    IncrementalNpv,
+    PROJECT_COLUMNS,
+    TRANSACTION_COLUMNS,
+    annual_rate,
+    cash_flow_columns,
+    evaluate_projects,
+    evaluate_transactions,
+    fill_pattern,
+    npv_sensitivities,
+    period_rate,
+)
+from components.npv_simulation import DISTRIBUTIONS, npv_risk_summary, simulate_npv
+from components.sensitivity import npv_driver_impacts, npv_spider, relative_shocks, top_drivers
+from components.utils import binned_histogram, scroll_top
 
 
 
@@ -61,25 +80,47 @@ def render_npv_tool(go_to=None):
 
     st.markdown("---")
 
+    mode = st.radio(
+        "Mode",
+        ["Annual Cash Flows", "Dated Transactions (XNPV / XIRR)", "Project Portfolio (Batch)"],
+        horizontal=True,
+        key="npv_mode"
+    )
+
+    if mode == "Dated Transactions (XNPV / XIRR)":
+        render_dated_transactions()
+        return
+
+    if mode == "Project Portfolio (Batch)":
+        render_project_batch()
+        return
+
     # -----------------------------
     # Inputs
     # -----------------------------
     st.header("📥 Input Parameters")
 
-    colA, colB, colC = st.columns(3)
+    fx, currency = render_fx_settings("npv")
+
+    colA, colB, colC, colD = st.columns(4)
 
     with colA:
         initial_investment = st.number_input(
-            "Initial Investment (SEK)",
+            "Initial Investment" + (f" ({currency})" if fx is None else ""),
             min_value=0.0,
             value=10000.0,
             step=1000.0,
             key="investment"
         )
+        investment_currency = currency
+        if fx is not None:
+            investment_currency = st.selectbox(
+                "Investment Currency", fx.currencies, index=fx.currencies.index(currency), key="investment_currency"
+            )
 
     with colB:
-    	discount_rate = st.number_input(
-        "Discount Rate (%)",
+    	annual_discount_rate = st.number_input(
+        "Discount Rate (% per year)",
         min_value=0.0,
         value=10.000,
         step=0.01,
@@ -87,30 +128,50 @@ def render_npv_tool(go_to=None):
         key="rate"
     ) / 100
 
-
     with colC:
-        years = st.number_input(
-            "Number of Years",
+        frequency = st.selectbox(
+            "Cash Flow Frequency",
+            list(PERIODS_PER_YEAR.keys()),
+            key="frequency"
+        )
+        periods_per_year = PERIODS_PER_YEAR[frequency]
+        period_name = PERIOD_NAMES[frequency]
+
+    with colD:
+        # An imported file sets the horizon before the widget is drawn
+        if "imported_periods" in st.session_state:
+            st.session_state["years"] = st.session_state.pop("imported_periods")
+
+        periods = st.number_input(
+            f"Number of {period_name}s",
             min_value=1,
-            max_value=30,
+            max_value=MAX_PERIODS,
             value=5,
             key="years"
         )
 
+    discount_rate = float(period_rate(annual_discount_rate, periods_per_year))
+
     # -----------------------------
     # Cash Flows
     # -----------------------------
-    st.subheader("📈 Annual Cash Flows")
-
-    cash_flows = []
-    for i in range(int(years)):
-        cf = st.number_input(
-            f"Year {i+1} Cash Flow (SEK)",
-            value=3000.0,
-            step=500.0,
-            key=f"cf_{i}"
-        )
-        cash_flows.append(cf)
+    st.subheader(f"📈 {frequency} Cash Flows")
+
+    cash_flows, cash_flow_currencies = render_cash_flow_grid(
+        int(periods), period_name, currency, multi_currency=fx is not None
+    )
+
+    # Every cash flow is converted at the forward rate for its own date, so
+    # the NPV below is in the reporting currency.
+    if fx is not None:
+        try:
+            tenors = np.arange(1, int(periods) + 1) / periods_per_year
+            cash_flows = fx.convert(cash_flows, cash_flow_currencies, tenors, currency)
+            initial_investment = float(fx.convert(initial_investment, investment_currency, 0.0, currency))
+        except ValueError as exc:
+            st.error(f"Could not convert the cash flows: {exc}")
+            return
+        st.caption(f"Cash flows converted to {currency} at the FX forward rate for each {period_name.lower()}.")
 
     st.markdown("---")
 
@@ -118,31 +179,33 @@ def render_npv_tool(go_to=None):
     # AUTO CALCULATION
     # =====================================================
 
-    # NPV
-    discounted = []
-    npv = -initial_investment
-
-    for t, cf in enumerate(cash_flows, start=1):
-        dcf = cf / ((1 + discount_rate) ** t)
-        discounted.append(dcf)
-        npv += dcf
-
-    # IRR (high precision)
-    irr = float(nf.irr([-initial_investment] + cash_flows))
-
-    # Payback
-    cumulative = 0
-    payback = None
-
-    for year, cf in enumerate(cash_flows, start=1):
-        prev = cumulative
-        cumulative += cf
-
-        if cumulative >= initial_investment:
-            remaining = initial_investment - prev
-            fraction = remaining / cf
-            payback = year - 1 + fraction
-            break
+    # NPV, IRR and payback are kept in session state and updated in place:
+    # after a single-cell edit only that cell's discounted value changes the
+    # NPV, payback is a search down a Fenwick tree of cumulative sums and IRR
+    # restarts from the previous root. While the grid has not been reset
+    # (and no FX conversion touches every value), only its edited rows are
+    # compared.
+    grid_state = (st.session_state["cf_editor_version"], fx is None)
+    changed = None
+    if fx is None and st.session_state.get("npv_state_grid") == grid_state:
+        changed = st.session_state["cf_edited_rows"]
+    st.session_state["npv_state_grid"] = grid_state
+
+    state = st.session_state.get("npv_state")
+    if state is None:
+        state = st.session_state["npv_state"] = IncrementalNpv(initial_investment, cash_flows, discount_rate)
+    else:
+        state.update(initial_investment, cash_flows, discount_rate, changed)
+
+    factors = state.factors
+    discounted = state.discounted
+    npv = state.npv
+
+    irr = float(annual_rate(state.irr, periods_per_year))
+    irr_status = state.irr_status
+
+    payback_period = state.payback()
+    payback = None if np.isnan(payback_period) else payback_period / periods_per_year
 
     # -----------------------------
     # Results Summary
@@ -151,29 +214,38 @@ def render_npv_tool(go_to=None):
 
     col1, col2, col3 = st.columns(3)
 
-    col1.metric("💵 NPV", f"{format_number(npv)} SEK")
-    col2.metric("📈 IRR", f"{irr*100:.4f}%")  # ← 4 decimals
+    col1.metric("💵 NPV", f"{format_number(npv)} {currency}")
+    col2.metric("📈 IRR (per year)", f"{irr*100:.4f}%" if irr_status != "no_root" else "No IRR")  # ← 4 decimals
     col3.metric(
         "⏳ Payback Period",
         f"{payback:.2f} years" if payback else "Not reached"
     )
 
+    if irr_status == "no_root":
+        st.caption("No discount rate in the search range (up to 1,000% per period) makes the NPV zero.")
+    elif irr_status == "multiple_roots":
+        st.caption(
+            "The cash flows change sign more than once, so several discount rates make the NPV zero. "
+            "The IRR shown is the one closest to 0% per period; roots within a few percent of each "
+            "other may not be told apart."
+        )
+
     st.markdown("---")
 
     # -----------------------------
     # Table
     # -----------------------------
     df = pd.DataFrame({
-        "Year": list(range(1, int(years) + 1)),
-        "Cash Flow (SEK)": cash_flows,
-        "Discounted Cash Flow (SEK)": discounted
+        period_name: list(range(1, int(periods) + 1)),
+        f"Cash Flow ({currency})": cash_flows,
+        f"Discounted Cash Flow ({currency})": discounted
     })
 
     st.subheader("📋 Cash Flow Table")
     st.dataframe(
         df.style.format({
-            "Cash Flow (SEK)": lambda x: format_number(x),
-            "Discounted Cash Flow (SEK)": lambda x: format_number(x)
+            f"Cash Flow ({currency})": lambda x: format_number(x),
+            f"Discounted Cash Flow ({currency})": lambda x: format_number(x)
         })
     )
 
@@ -184,29 +256,13 @@ def render_npv_tool(go_to=None):
     # -----------------------------
     st.subheader("🌪️ Tornado Chart: ±10% Sensitivity")
 
-    def calc_npv(inv, cfs, dr):
-        total = -inv
-        for t, cf in enumerate(cfs, start=1):
-            total += cf / ((1 + dr) ** t)
-        return total
-
     base_npv = npv
-    variables = []
-
-    # Investment ±10%
-    inv_low = calc_npv(initial_investment * 0.9, cash_flows, discount_rate)
-    inv_high = calc_npv(initial_investment * 1.1, cash_flows, discount_rate)
-    variables.append(["Initial Investment", inv_low, inv_high])
-
-    # Cash Flows ±10%
-    cf_low = calc_npv(initial_investment, [cf * 0.9 for cf in cash_flows], discount_rate)
-    cf_high = calc_npv(initial_investment, [cf * 1.1 for cf in cash_flows], discount_rate)
-    variables.append(["Cash Flows", cf_low, cf_high])
-
-    # Discount Rate ±10%
-    dr_low = calc_npv(initial_investment, cash_flows, discount_rate * 0.9)
-    dr_high = calc_npv(initial_investment, cash_flows, discount_rate * 1.1)
-    variables.append(["Discount Rate", dr_low, dr_high])
+    variables = [
+        [name, low, high]
+        for name, (low, high) in npv_sensitivities(
+            initial_investment, cash_flows, discount_rate, factors
+        ).items()
+    ]
 
     tornado_df = pd.DataFrame(variables, columns=["Variable", "Low", "High"])
     tornado_df["Low Impact"] = tornado_df["Low"] - base_npv
@@ -239,7 +295,7 @@ def render_npv_tool(go_to=None):
     fig.update_layout(
         barmode="overlay",
         title="Tornado Sensitivity Chart (NPV Impact)",
-        xaxis_title="NPV Impact (SEK)",
+        xaxis_title=f"NPV Impact ({currency})",
         yaxis_title="Variable",
         template="simple_white",
         height=450
@@ -247,6 +303,89 @@ def render_npv_tool(go_to=None):
 
     st.plotly_chart(fig, use_container_width=True)
 
+    # -----------------------------
+    # Spider Chart & Top Drivers
+    # -----------------------------
+    st.markdown("---")
+    st.subheader("🕸️ Spider Chart & Top Drivers")
+
+    colS1, colS2, colS3 = st.columns(3)
+    with colS1:
+        spider_range = st.slider("Range (±%)", min_value=5, max_value=100, value=20, step=5, key="spider_range")
+    with colS2:
+        spider_points = st.number_input("Points per Curve", min_value=3, max_value=201, value=21, step=2, key="spider_points")
+    with colS3:
+        n_drivers = st.number_input("Top Drivers Shown", min_value=1, max_value=50, value=5, step=1, key="n_drivers")
+
+    # Every derivative comes from one analytic pass; the ranking uses the NPV
+    # change for a 1% move in each input, so a period's cash flow, the rate
+    # and the investment are compared on the same scale.
+    drivers = top_drivers(
+        npv_driver_impacts(initial_investment, cash_flows, annual_discount_rate, periods_per_year, period_name),
+        int(n_drivers)
+    )
+    top_periods = [
+        int(name.split()[1]) for name in drivers["Variable"] if name.endswith("Cash Flow")
+    ][:3]
+
+    spider = npv_spider(
+        initial_investment, cash_flows, annual_discount_rate, periods_per_year,
+        relative_shocks(-spider_range / 100, spider_range / 100, spider_points),
+        period_name, top_periods
+    )
+
+    fig = go.Figure()
+    for name in spider.columns:
+        fig.add_trace(go.Scatter(x=spider.index * 100, y=spider[name], mode="lines", name=name))
+
+    fig.update_layout(
+        title="Spider Chart (NPV vs. Change in Each Input)",
+        xaxis_title="Change in Input (%)",
+        yaxis_title=f"NPV ({currency})",
+        template="simple_white",
+        height=450
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(
+        drivers.rename(columns={"Impact": f"NPV Impact of +1% ({currency})", "Share": "Share of Total Impact"}).style.format({
+            f"NPV Impact of +1% ({currency})": lambda x: format_number(x),
+            "Share of Total Impact": "{:.1%}"
+        }),
+        hide_index=True
+    )
+
+    # -----------------------------
+    # Monte Carlo Simulation
+    # -----------------------------
+    st.markdown("---")
+    st.subheader("🎲 Monte Carlo Simulation")
+
+    if st.toggle("Simulate uncertain inputs", key="mc_enabled"):
+        render_monte_carlo(
+            initial_investment, cash_flows, annual_discount_rate, periods_per_year, state.irr, currency
+        )
+
+    # -----------------------------
+    # Goal Seek
+    # -----------------------------
+    st.markdown("---")
+    st.subheader("🎯 Goal Seek")
+    st.caption("Find the input that gives a target NPV, e.g. the break-even cash flows (NPV = 0).")
+
+    render_goal_seek(
+        "npv",
+        {
+            "initial_investment": initial_investment,
+            "cash_flows": cash_flows,
+            "annual_discount_rate": annual_discount_rate,
+            "periods_per_year": periods_per_year,
+            "cash_flow_scale": 1.0,
+        },
+        key="npv_goal"
+    )
+
     # =========================================================
     # ADDITIONAL INFORMATION SECTION
     # =========================================================
@@ -300,6 +439,41 @@ It ignores:
 - cash flows after payback  
 
 …but it is useful for quick risk assessments.
+""")
+
+    with st.expander("How are foreign-currency cash flows converted?"):
+        st.markdown(r"""
+Each cash flow is converted to the reporting currency at the **FX forward rate** for its own date,
+derived from the spot rate and the two currencies' interest rates (covered interest parity):
+
+\[
+F(T) = S \times \frac{(1 + r_{\text{reporting}})^{T}}{(1 + r_{\text{foreign}})^{T}}
+\]
+
+The initial investment is converted at the spot rate. NPV, IRR and every chart are then
+calculated on the converted cash flows, in the reporting currency.
+""")
+
+    with st.expander("Spider Chart & Top Drivers Explained"):
+        st.markdown("""
+The **spider chart** moves one input at a time across the chosen range and plots the resulting NPV.
+The steeper a line, the more the NPV depends on that input.
+
+- **Cash Flows** scales every cash flow together; the individual lines show the periods that matter most  
+- **Discount Rate** bends because discounting is non-linear; all other lines are straight  
+
+The **top drivers** table ranks every input, including each period's cash flow, by how much a
+**1% increase** in it moves the NPV. The impacts come from the exact derivatives of the NPV formula.
+""")
+
+    with st.expander("Monte Carlo Simulation Explained"):
+        st.markdown("""
+The **Monte Carlo simulation** draws thousands of possible outcomes for the investment,
+every period's cash flow and the discount rate, and calculates the NPV of each one.
+
+- **P(NPV < 0)** = the share of outcomes where the project loses value  
+- **Percentiles** show the range of likely NPVs (e.g. 5% of outcomes fall below the 5th percentile)  
+- **Expected Shortfall (5%)** = the average NPV in the worst 5% of outcomes  
 """)
 
     with st.expander("Sensitivity Analysis Explained"):
@@ -314,3 +488,632 @@ A wider bar = greater impact on NPV.
 """)
 
     
+
+
+# -----------------------------
+# MONTE CARLO SIMULATION
+# -----------------------------
+def histogram_chart(counts, edges, title, xaxis_title, color):
+    fig = go.Figure(go.Bar(
+        x=0.5 * (edges[:-1] + edges[1:]),
+        y=counts,
+        width=np.diff(edges),
+        marker_color=color
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title=xaxis_title,
+        yaxis_title="Paths",
+        template="simple_white",
+        bargap=0,
+        height=400
+    )
+    return fig
+
+
+def render_monte_carlo(initial_investment, cash_flows, discount_rate, periods_per_year, base_irr, currency="SEK"):
+    colA, colB, colC = st.columns(3)
+
+    with colA:
+        distribution = st.selectbox("Distribution", DISTRIBUTIONS, key="mc_distribution")
+        n_paths = int(st.number_input(
+            "Number of Paths", min_value=1_000, max_value=5_000_000, value=100_000, step=100_000, key="mc_paths"
+        ))
+
+    with colB:
+        investment_spread = st.number_input(
+            "Investment Uncertainty (±%)", min_value=0.0, value=10.0, step=1.0, key="mc_inv_spread"
+        ) / 100
+        cash_flow_spread = st.number_input(
+            "Cash Flow Uncertainty (±%)", min_value=0.0, value=20.0, step=1.0, key="mc_cf_spread"
+        ) / 100
+        rate_spread = st.number_input(
+            "Discount Rate Uncertainty (±%)", min_value=0.0, value=10.0, step=1.0, key="mc_rate_spread"
+        ) / 100
+
+    with colC:
+        with_irr = st.checkbox("Also simulate IRR", key="mc_irr")
+        processes = int(st.number_input(
+            "Worker Processes", min_value=1, max_value=64, value=1, step=1, key="mc_processes"
+        ))
+        seed = int(st.number_input("Random Seed", min_value=0, value=42, step=1, key="mc_seed"))
+
+    st.caption(
+        "Uncertainty is relative to each input: the standard deviation for Normal, "
+        "the ± range for Uniform and Triangular. Each period's cash flow is drawn independently."
+    )
+
+    result = simulate_npv(
+        initial_investment, cash_flows, discount_rate, periods_per_year,
+        investment_spread, cash_flow_spread, rate_spread, distribution,
+        n_paths, seed=seed, processes=processes, with_irr=with_irr, base_irr=base_irr
+    )
+    summary = npv_risk_summary(result["npv"])
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("💵 Mean NPV", f"{format_number(summary['mean'])} {currency}")
+    col2.metric("⚠️ P(NPV < 0)", f"{summary['prob_loss']*100:.2f}%")
+    col3.metric("📉 Expected Shortfall (5%)", f"{format_number(summary['expected_shortfall'])} {currency}")
+    col4.metric("📊 NPV Std. Deviation", f"{format_number(summary['std'])} {currency}")
+
+    percentiles = pd.DataFrame({
+        "Percentile": [k[1:] + "th" for k in summary if k.startswith("p") and k[1:].isdigit()],
+        f"NPV ({currency})": [v for k, v in summary.items() if k.startswith("p") and k[1:].isdigit()],
+    })
+    st.dataframe(
+        percentiles.style.format({f"NPV ({currency})": lambda x: format_number(x)}),
+        hide_index=True
+    )
+
+    counts, edges = binned_histogram(result["npv"])
+    st.plotly_chart(
+        histogram_chart(counts, edges, "Simulated NPV Distribution", f"NPV ({currency})", "steelblue"),
+        use_container_width=True
+    )
+
+    if with_irr:
+        irr_paths = result["irr"]
+        counts, edges = binned_histogram(irr_paths * 100)
+        st.plotly_chart(
+            histogram_chart(counts, edges, "Simulated IRR Distribution", "IRR (% per year)", "lightgreen"),
+            use_container_width=True
+        )
+        missing = np.isnan(irr_paths).mean()
+        if missing:
+            st.caption(f"{missing*100:.2f}% of paths have no IRR and are left out of the chart.")
+
+
+# -----------------------------
+# CURRENCIES
+# -----------------------------
+FX_TENORS = [1, 2, 3, 5, 10]
+
+
+def render_fx_settings(key):
+    """
+    Reporting currency and (optionally) the FX spot rates and interest
+    rates that drive the forward curve. Returns (FxCurve or None, currency);
+    the curve is kept in session state while its inputs are unchanged, so
+    its forward cache survives reruns.
+    """
+    with st.expander("🌍 Currencies"):
+        f1, f2 = st.columns(2)
+        with f1:
+            currency = st.selectbox("Reporting Currency", CURRENCIES, key=f"{key}_currency")
+        with f2:
+            st.markdown("<div style='height:28px;'></div>", unsafe_allow_html=True)
+            multi_currency = st.toggle("Cash flows in several currencies", key=f"{key}_multi_currency")
+
+        if not multi_currency:
+            return None, currency
+
+        market = st.data_editor(
+            pd.DataFrame({
+                "Currency": CURRENCIES,
+                "Spot (SEK per unit)": [DEFAULT_SPOTS[c] for c in CURRENCIES],
+                "Interest Rate (%)": [DEFAULT_RATES[c] * 100 for c in CURRENCIES],
+            }),
+            key=f"{key}_fx_market",
+            disabled=["Currency"],
+            hide_index=True,
+            num_rows="fixed",
+            use_container_width=True,
+        )
+
+        inputs = (
+            tuple(market["Spot (SEK per unit)"].to_numpy(dtype=float)),
+            tuple(market["Interest Rate (%)"].to_numpy(dtype=float)),
+        )
+        cached = st.session_state.get(f"{key}_fx")
+        if cached is None or cached[0] != inputs:
+            try:
+                fx = FxCurve(
+                    dict(zip(CURRENCIES, inputs[0])),
+                    dict(zip(CURRENCIES, np.asarray(inputs[1]) / 100)),
+                )
+            except ValueError as exc:
+                st.error(f"Could not build the FX curve: {exc}")
+                return None, currency
+            st.session_state[f"{key}_fx"] = cached = (inputs, fx)
+        fx = cached[1]
+
+        st.markdown(f"**FX forwards into {currency}** (covered interest parity)")
+        st.dataframe(
+            fx.forward_table(currency, FX_TENORS).rename(index=lambda t: f"{t:g}Y").style.format("{:.4f}"),
+            use_container_width=True
+        )
+
+    return fx, currency
+
+
+# -----------------------------
+# CASH FLOW GRID
+# -----------------------------
+PERIODS_PER_YEAR = {"Annual": 1, "Quarterly": 4, "Monthly": 12}
+PERIOD_NAMES = {"Annual": "Year", "Quarterly": "Quarter", "Monthly": "Month"}
+MAX_PERIODS = 1200
+DEFAULT_CASH_FLOW = 3000.0
+CASH_FLOW_COLUMN = "Cash Flow"
+CURRENCY_COLUMN = "Currency"
+
+
+def set_cash_flows(values):
+    """Replace the grid's contents; a new editor key makes the grid show them."""
+    st.session_state["cf_base"] = np.asarray(values, dtype=float)
+    if "cf_currencies" in st.session_state:
+        st.session_state["cf_currency_base"] = st.session_state["cf_currencies"]
+    st.session_state["cf_editor_version"] = st.session_state.get("cf_editor_version", 0) + 1
+
+
+def imported_cash_flows(uploaded):
+    table = read_table(uploaded)
+    if table.empty:
+        raise ValueError("The file has no cash flow rows")
+    if "cash_flow" in table.columns:
+        column = table["cash_flow"]
+    else:
+        numeric = table.select_dtypes("number")
+        if numeric.empty:
+            raise ValueError("The file has no numeric column of cash flows")
+        column = numeric.iloc[:, -1]
+    return column.fillna(0.0).to_numpy(dtype=float)
+
+
+def render_cash_flow_grid(periods, period_name, currency="SEK", multi_currency=False):
+    """
+    One editable grid for all cash flows, backed by a NumPy array in
+    session state. Edits (including pasted Excel ranges) arrive as one
+    rerun per edit batch; fill patterns and file imports replace the
+    array and reset the grid. With `multi_currency` every row also gets a
+    currency tag (defaulting to `currency`). Returns (values, currencies).
+    """
+    if "cf_base" not in st.session_state:
+        st.session_state["cf_base"] = np.full(periods, DEFAULT_CASH_FLOW)
+        st.session_state["cf_editor_version"] = 0
+
+    # Resize to the chosen horizon, keeping any edits and extending with the last value
+    current = st.session_state.get("cf_values", st.session_state["cf_base"])
+    if len(current) != periods:
+        fill = current[-1] if len(current) else DEFAULT_CASH_FLOW
+        set_cash_flows(np.concatenate([current[:periods], np.full(max(periods - len(current), 0), fill)]))
+
+    with st.expander("Fill pattern or import cash flows"):
+        p1, p2, p3, p4 = st.columns(4)
+
+        with p1:
+            pattern = st.selectbox("Pattern", FILL_PATTERNS, key="fill_pattern")
+            start = st.number_input(f"{period_name} 1 Cash Flow", value=DEFAULT_CASH_FLOW, step=500.0, key="fill_start")
+
+        with p2:
+            growth = st.number_input(
+                f"Growth per {period_name} (%)", value=0.0, step=0.5, key="fill_growth",
+                disabled=pattern != "Growth"
+            ) / 100
+
+        with p3:
+            step = st.number_input(
+                "Step Change", value=0.0, step=500.0, key="fill_step",
+                disabled=pattern != "Step"
+            )
+            step_every = st.number_input(
+                f"Every N {period_name}s", min_value=1, value=12 if period_name == "Month" else 1, key="fill_step_every",
+                disabled=pattern != "Step"
+            )
+
+        with p4:
+            st.markdown("<div style='height:28px;'></div>", unsafe_allow_html=True)
+            if st.button("Apply pattern", use_container_width=True):
+                set_cash_flows(fill_pattern(pattern, periods, start, growth, step, step_every))
+
+        uploaded = st.file_uploader(
+            "Import cash flows (CSV or Parquet: a `cash_flow` column, or the last numeric column)",
+            type=["csv", "parquet"],
+            key="cf_import"
+        )
+        if uploaded is not None and st.button("Load imported cash flows"):
+            try:
+                values = imported_cash_flows(uploaded)
+            except (ValueError, KeyError) as exc:
+                st.error(f"Could not import the cash flows: {exc}")
+            else:
+                values = values[:MAX_PERIODS]
+                st.session_state["imported_periods"] = len(values)
+                set_cash_flows(values)
+                st.rerun()
+
+    # Adding or removing the currency column rebuilds the grid, so carry the edits over
+    if st.session_state.get("cf_multi_currency", False) != multi_currency:
+        st.session_state["cf_multi_currency"] = multi_currency
+        set_cash_flows(st.session_state.get("cf_values", st.session_state["cf_base"]))
+
+    base = st.session_state["cf_base"]
+    grid = pd.DataFrame({period_name: np.arange(1, len(base) + 1), CASH_FLOW_COLUMN: base})
+    column_config = {
+        CASH_FLOW_COLUMN: st.column_config.NumberColumn(
+            CASH_FLOW_COLUMN if multi_currency else f"{CASH_FLOW_COLUMN} ({currency})", step=500.0, format="%.2f"
+        )
+    }
+
+    if multi_currency:
+        currency_base = st.session_state.get("cf_currency_base", np.empty(0, dtype=object))
+        if len(currency_base) != len(base):
+            currency_base = np.concatenate([
+                currency_base[:len(base)], np.full(max(len(base) - len(currency_base), 0), currency, dtype=object)
+            ])
+            st.session_state["cf_currency_base"] = currency_base
+        grid[CURRENCY_COLUMN] = currency_base
+        column_config[CURRENCY_COLUMN] = st.column_config.SelectboxColumn(options=CURRENCIES, required=True)
+
+    editor_key = f"cf_editor_{st.session_state['cf_editor_version']}"
+    edited = st.data_editor(
+        grid,
+        key=editor_key,
+        disabled=[period_name],
+        hide_index=True,
+        num_rows="fixed",
+        use_container_width=True,
+        height=min(38 + 35 * len(base), 420),
+        column_config=column_config,
+    )
+    st.caption("Tip: paste a column copied from Excel straight into the grid.")
+
+    values = edited[CASH_FLOW_COLUMN].fillna(0.0).to_numpy(dtype=float)
+    st.session_state["cf_values"] = values
+    # Rows edited since the grid was last reset, so the NPV can update just those
+    st.session_state["cf_edited_rows"] = np.array(
+        sorted(int(row) for row in st.session_state.get(editor_key, {}).get("edited_rows", {})), dtype=int
+    )
+
+    currencies = np.full(len(values), currency, dtype=object)
+    if multi_currency:
+        currencies = edited[CURRENCY_COLUMN].fillna(currency).to_numpy(dtype=object)
+        st.session_state["cf_currencies"] = currencies
+    return values, currencies
+
+
+# -----------------------------
+# DATED TRANSACTIONS (XNPV / XIRR)
+# -----------------------------
+def render_dated_transactions():
+    st.header("📥 Dated Transactions")
+
+    st.markdown(f"""
+Upload a **CSV or Parquet** file with one cash flow per row and the columns:
+
+`{', '.join(TRANSACTION_COLUMNS)}`
+
+Negative amounts are money invested, positive amounts money returned. Rows are grouped
+by `investment_id`, and each investment is discounted from its own first date.
+""")
+
+    colA, colB = st.columns(2)
+
+    with colA:
+        uploaded = st.file_uploader("Transaction file", type=["csv", "parquet"])
+
+    with colB:
+        discount_rate = st.number_input(
+            "Discount Rate for XNPV (% per year)",
+            min_value=0.0,
+            value=10.000,
+            step=0.01,
+            format="%.3f",
+            key="xnpv_rate"
+        ) / 100
+
+    if uploaded is None:
+        return
+
+    try:
+        transactions = read_table(uploaded)
+        require_columns(transactions, TRANSACTION_COLUMNS)
+        results = evaluate_transactions(transactions, discount_rate)
+    except (ValueError, KeyError) as exc:
+        st.error(f"Could not evaluate the uploaded transactions: {exc}")
+        return
+
+    st.markdown("---")
+    st.header("📊 Results Summary")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("📂 Investments", f"{len(results):,}")
+    col2.metric("🧾 Transactions", f"{len(transactions):,}")
+    col3.metric("💵 Total XNPV", format_number(results['xnpv'].sum()))
+
+    unsolved = (results["status"] != "ok").sum()
+    if unsolved:
+        st.caption(
+            f"{unsolved:,} investment(s) have no XIRR or more than one. "
+            "See the `status` column; with several roots the one closest to 0% is shown."
+        )
+
+    st.subheader("📋 Results by Investment")
+    st.dataframe(
+        results.style.format({
+            "invested": format_number,
+            "returned": format_number,
+            "xnpv": format_number,
+            "xirr": lambda x: f"{x*100:.4f}%",
+        }),
+        use_container_width=True
+    )
+
+    st.download_button(
+        "Download results (CSV)",
+        results.to_csv().encode("utf-8"),
+        file_name="xnpv_xirr_results.csv",
+        mime="text/csv",
+    )
+
+    with st.expander("What are XNPV and XIRR?"):
+        st.markdown(r"""
+**XNPV** and **XIRR** are NPV and IRR for cash flows on **actual dates** instead of whole years.
+
+Each cash flow is discounted by the exact time since the investment's first cash flow:
+
+\[
+XNPV = \sum_{i} \frac{CF_i}{(1+r)^{(d_i - d_0)/365}}
+\]
+
+**XIRR** is the rate that makes XNPV equal to zero — the same convention as Excel's functions.
+""")
+
+
+# -----------------------------
+# PROJECT PORTFOLIO (BATCH)
+# -----------------------------
+RANKING_METRICS = {
+    "NPV": ("npv", False),
+    "IRR": ("irr", False),
+    "MIRR": ("mirr", False),
+    "Profitability Index": ("profitability_index", False),
+    "Payback Period": ("payback", True),
+    "Discounted Payback Period": ("discounted_payback", True),
+}
+
+
+def render_project_batch():
+    st.header("📥 Project Portfolio")
+
+    st.markdown(f"""
+Upload a **CSV or Parquet** file with one capital project per row and the columns:
+
+`{', '.join(PROJECT_COLUMNS)}`, `cf_1`, `cf_2`, … `cf_N`
+
+Each `cf_t` is the cash flow of period t; projects with shorter lives can leave later periods blank.
+An optional `discount_rate` column (%) overrides the rate below for that project.
+With several currencies, add a `currency` column; every amount is converted to the
+reporting currency at the FX forward rate for its period.
+The file is read in chunks, so very large portfolios can be evaluated.
+""")
+
+    fx, currency = render_fx_settings("batch")
+
+    colA, colB, colC = st.columns(3)
+
+    with colA:
+        uploaded = st.file_uploader("Project file", type=["csv", "parquet"])
+
+    with colB:
+        discount_rate = st.number_input(
+            "Discount Rate (%)",
+            min_value=0.0,
+            value=10.000,
+            step=0.01,
+            format="%.3f",
+            key="batch_rate"
+        ) / 100
+
+    with colC:
+        reinvest_rate = st.number_input(
+            "MIRR Reinvestment Rate (%)",
+            min_value=0.0,
+            value=10.000,
+            step=0.01,
+            format="%.3f",
+            key="batch_reinvest_rate"
+        ) / 100
+
+    if uploaded is None:
+        return
+
+    chunks = iter_table(uploaded)
+    if fx is not None:
+        chunks = (
+            convert_columns(chunk, fx, currency, project_tenors(chunk.columns)) for chunk in chunks
+        )
+
+    try:
+        results = evaluate_projects(
+            chunks, discount_rate, reinvest_rate,
+            keep_columns=["initial_investment", *RATIONING_COLUMNS], keep_prefixes=[CAPEX_PREFIX]
+        )
+    except (ValueError, KeyError) as exc:
+        st.error(f"Could not evaluate the uploaded projects: {exc}")
+        return
+
+    st.markdown("---")
+    st.header("📊 Results Summary")
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("📂 Projects", f"{len(results):,}")
+    col2.metric("✅ Positive NPV", f"{(results['npv'] > 0).sum():,}")
+    col3.metric("💵 Total Positive NPV", f"{format_number(results['npv'].clip(lower=0).sum())} {currency}")
+
+    rank_by = st.selectbox("Rank projects by", list(RANKING_METRICS.keys()))
+    column, ascending = RANKING_METRICS[rank_by]
+    ranked = results.sort_values(column, ascending=ascending, na_position="last")
+    ranked.insert(0, "rank", np.arange(1, len(ranked) + 1))
+
+    st.subheader("📋 Ranked Projects")
+    st.dataframe(
+        ranked.style.format({
+            "npv": format_number,
+            "irr": lambda x: f"{x*100:.4f}%",
+            "mirr": lambda x: f"{x*100:.4f}%",
+            "payback": "{:.2f}",
+            "discounted_payback": "{:.2f}",
+            "profitability_index": "{:.3f}",
+        }),
+        use_container_width=True
+    )
+
+    st.download_button(
+        "Download ranked projects (CSV)",
+        ranked.to_csv().encode("utf-8"),
+        file_name="project_rankings.csv",
+        mime="text/csv",
+    )
+
+    with st.expander("What are MIRR, discounted payback and the profitability index?"):
+        st.markdown("""
+- **Discounted Payback** = how long it takes for the **discounted** cash flows to recover the investment  
+- **MIRR** (modified IRR) assumes positive cash flows are reinvested at the reinvestment rate
+  instead of at the IRR itself, and always has exactly one answer  
+- **Profitability Index** = present value of the cash flows ÷ initial investment;
+  above 1 means the project creates value  
+""")
+
+    render_capital_rationing(results, currency)
+
+
+def project_tenors(columns):
+    """Tenor in years of every money column of a project table (one period per year)."""
+    tenors = {"initial_investment": 0.0}
+    tenors.update({c: float(c[len(CASH_FLOW_PREFIX):]) for c in cash_flow_columns(columns)})
+    tenors.update({c: float(c[len(CAPEX_PREFIX):]) for c in capex_columns(columns)})
+    return tenors
+
+
+def render_capital_rationing(results, currency="SEK"):
+    st.markdown("---")
+    st.header("💰 Capital Rationing")
+
+    st.markdown(f"""
+Choose the set of projects with the **highest total NPV** that fits the capital budget.
+Optional columns in the project file add constraints:
+
+- `{CAPEX_PREFIX}0`, `{CAPEX_PREFIX}1`, … capital used in each budget period
+  (otherwise `initial_investment` is used against a single budget)  
+- `exclusive_group`: at most one project per group is funded  
+- `requires`: the `project_id` of a project that must be funded too  
+""")
+
+    periods = capex_columns(results.columns) or ["initial_investment"]
+    costs = results[periods].fillna(0)
+
+    budget_cols = st.columns(min(len(periods), 4))
+    budgets = []
+    for k, column in enumerate(periods):
+        label = f"Capital Budget ({currency})" if column == "initial_investment" else f"Budget, Period {column[len(CAPEX_PREFIX):]} ({currency})"
+        with budget_cols[k % len(budget_cols)]:
+            budgets.append(st.number_input(
+                label,
+                min_value=0.0,
+                value=float(round(costs[column][results["npv"] > 0].sum() / 2)),
+                step=1_000.0,
+                key=f"budget_{column}"
+            ))
+
+    method = st.selectbox("Optimization Method", list(RATIONING_METHODS.keys()), key="rationing_method")
+
+    # The selection is only solved on request and kept in session state, so
+    # other widgets on the page rerun without repeating the optimization.
+    request = (int(pd.util.hash_pandas_object(results).sum()), tuple(budgets), method)
+    rationing = st.session_state.get("capital_rationing")
+    if rationing is not None and rationing["request"] != request:
+        rationing = st.session_state["capital_rationing"] = None
+
+    if st.button("Select Projects", use_container_width=True):
+        try:
+            with st.spinner("Selecting projects..."):
+                selected, result = ration_capital(results, budgets, RATIONING_METHODS[method])
+        except ValueError as exc:
+            st.error(f"Could not select projects: {exc}")
+            return
+        rationing = st.session_state["capital_rationing"] = {
+            "request": request, "selected": selected, "result": result
+        }
+
+    if rationing is None:
+        return
+
+    selected, result = rationing["selected"], rationing["result"]
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("✅ Projects Funded", f"{len(selected):,} of {len(results):,}")
+    col2.metric("💵 Total NPV Funded", f"{format_number(result['npv'])} {currency}")
+    col3.metric("🏦 Capital Used", f"{format_number(result['spend'].sum())} {currency}")
+
+    if not np.isnan(result["upper_bound"]):
+        gap = result["upper_bound"] - result["npv"]
+        st.caption(
+            f"No selection can beat the LP relaxation bound of {format_number(result['upper_bound'])} {currency}, "
+            f"so this selection is at most {format_number(gap)} {currency} from the optimum."
+        )
+    if method == "Automatic":
+        st.caption(f"Method used: {next(k for k, v in RATIONING_METHODS.items() if v == result['method'])}.")
+    if result["rounded"]:
+        st.warning(
+            "Costs were rounded up to the dynamic programming grid, so the selection fits the budget "
+            "but may not be the optimum. Use integer programming for an exact answer."
+        )
+    elif result["method"] == "milp" and not result["optimal"]:
+        st.warning(
+            f"Integer programming stopped before proving this selection optimal: {result['message']}"
+        )
+
+    st.dataframe(
+        selected.sort_values("npv", ascending=False).style.format({
+            "npv": format_number,
+            "irr": lambda x: f"{x*100:.4f}%",
+            "mirr": lambda x: f"{x*100:.4f}%",
+            "payback": "{:.2f}",
+            "discounted_payback": "{:.2f}",
+            "profitability_index": "{:.3f}",
+        }),
+        use_container_width=True
+    )
+
+    st.download_button(
+        "Download funded projects (CSV)",
+        selected.to_csv().encode("utf-8"),
+        file_name="funded_projects.csv",
+        mime="text/csv",
+    )
+
+    with st.expander("How are the projects chosen?"):
+        st.markdown("""
+- **Dynamic Programming** tries every budget amount for every project; handles one budget
+  without dependencies and is fast for a few thousand projects. It is exact when costs and budget
+  are whole amounts up to 10,000; otherwise costs are rounded up to 1/10,000 of the budget  
+- **Integer Programming (Branch and Bound)** handles several budget periods, exclusive groups and
+  dependencies, and proves the selection optimal unless it runs out of time  
+- **LP Relaxation + Rounding** allows fractions of projects, then funds projects in order of
+  how much of each the relaxation takes; scales to tens of thousands of projects and reports
+  how far from the optimum the result can be  
+- **Greedy (Profitability Index)** funds projects from the highest NPV per unit of capital down,
+  while the budget lasts  
+- **Automatic** picks dynamic programming when it needs no rounding, integer programming when
+  the portfolio is small enough, and the LP relaxation otherwise  
+""")
@@ -0,0 +1,120 @@
+import numpy as np
+
+
+DEFAULT_COMPRESSION = 1_000
+
+
+class QuantileSketch:
+    """
+    Streaming quantile sketch (a merging t-digest) with exact count, mean,
+    standard deviation, minimum and maximum.
+
+    Values are added a chunk at a time and summarized into at most about
+    `compression` weighted centroids, so memory stays fixed however many
+    values pass through. Centroids are sized by the arcsine scale
+    function: small near the tails, large in the middle, which keeps
+    extreme percentiles accurate. Sketches merge, so chunks summarized in
+    different processes can be combined. NaNs are counted separately.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.count = 0
+        self.missing = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    # -----------------------------
+    # Updates
+    # -----------------------------
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        finite = np.isfinite(values)
+        self.missing += int(values.size - finite.sum())
+        values = values[finite]
+        if values.size == 0:
+            return self
+
+        chunk_mean = values.mean()
+        self._combine_moments(values.size, chunk_mean, ((values - chunk_mean) ** 2).sum())
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(values.size)]))
+        return self
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        if other.count:
+            self._combine_moments(other.count, other.mean, other._m2)
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        self.missing += other.missing
+        return self
+
+    def _combine_moments(self, n, mean, m2):
+        """Chan et al. parallel update of count, mean and sum of squared deviations."""
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self._m2 += m2 + delta ** 2 * self.count * n / total
+        self.count = total
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+
+        # Centroid midpoints on the arcsine scale; one output centroid per unit of k
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = np.floor(self.compression * (np.arcsin(2 * q - 1) / np.pi + 0.5)).astype(np.int64)
+        groups = np.concatenate([[0], np.cumsum(np.diff(k) != 0)])
+
+        merged_weights = np.bincount(groups, weights=weights)
+        self.means = np.bincount(groups, weights=means * weights) / merged_weights
+        self.weights = merged_weights
+
+    # -----------------------------
+    # Queries
+    # -----------------------------
+    @property
+    def std(self):
+        return np.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def quantile(self, q):
+        """Approximate quantiles (q in [0, 1]) by interpolating between centroids."""
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        cumulative = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], cumulative, [self.count]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(q * self.count, positions, values)
+
+    def percentile(self, p):
+        return self.quantile(np.asarray(p, dtype=float) / 100)
+
+    def cdf(self, x):
+        """Approximate share of values at or below x."""
+        x = np.asarray(x, dtype=float)
+        if self.count == 0:
+            return np.full(x.shape, np.nan)
+        cumulative = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], cumulative, [self.count]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(x, values, positions) / self.count
+
+    def histogram(self, bins=100, range=None):
+        """
+        Approximate histogram (counts, edges) built from the centroids.
+
+        Centroids outside `range` (by default the 0.1st to 99.9th
+        percentile) are left out rather than piled into the edge bins.
+        """
+        if range is None:
+            range = tuple(self.percentile([0.1, 99.9]))
+        return np.histogram(self.means, bins=bins, range=range, weights=self.weights)
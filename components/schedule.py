@@ -0,0 +1,216 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from components.bond_engine import _as_frequency, annuity_factor
+
+
+DAY_COUNTS = ["30/360", "ACT/ACT", "ACT/365"]
+SCHEDULE_CACHE_SIZE = 4096
+MAX_SCHEDULE_YEARS = 50
+
+
+# ---------------------------------------------------------
+# DATE HELPERS
+# ---------------------------------------------------------
+def _to_date(value):
+    return pd.Timestamp(value).date()
+
+
+def _ymd(dates):
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    months = dates.astype("datetime64[M]")
+    year = months.astype("datetime64[Y]").astype(int) + 1970
+    month = months.astype(int) % 12 + 1
+    day = (dates - months).astype(int) + 1
+    return year, month, day
+
+
+# ---------------------------------------------------------
+# DAY COUNTS
+# ---------------------------------------------------------
+def actual_days(start, end):
+    return (np.asarray(end, dtype="datetime64[D]") - np.asarray(start, dtype="datetime64[D]")).astype(int)
+
+
+def days_30_360(start, end):
+    """30/360 US (bond basis) day count."""
+    y1, m1, d1 = _ymd(start)
+    y2, m2, d2 = _ymd(end)
+    d1 = np.minimum(d1, 30)
+    d2 = np.where(d1 == 30, np.minimum(d2, 30), d2)
+    return 360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)
+
+
+def accrual_fraction(start, end, period_start, period_end, frequency, convention):
+    """
+    Share of a coupon period between start and end under a day-count convention.
+
+    For ACT/ACT the denominator is the actual length of the regular period
+    from period_start to period_end; for a short first coupon that is the
+    notional period starting at the quasi-coupon date, not at issue.
+    """
+    if convention == "30/360":
+        return days_30_360(start, end) * frequency / 360
+    if convention == "ACT/365":
+        return actual_days(start, end) * frequency / 365
+    if convention == "ACT/ACT":
+        return actual_days(start, end) / actual_days(period_start, period_end)
+    raise ValueError(f"Unknown day-count convention: {convention}")
+
+
+# ---------------------------------------------------------
+# COUPON SCHEDULES (memoized)
+# ---------------------------------------------------------
+@lru_cache(maxsize=SCHEDULE_CACHE_SIZE)
+def _cached_schedule(maturity, frequency, issue):
+    step = 12 // frequency
+    maturity = np.datetime64(maturity, "D")
+    maturity_month = maturity.astype("datetime64[M]")
+    maturity_day = int((maturity - maturity_month.astype("datetime64[D]")).astype(int)) + 1
+
+    earliest = np.datetime64(issue, "D") if issue is not None else maturity - np.timedelta64(366 * MAX_SCHEDULE_YEARS, "D")
+    months_back = int((maturity_month - earliest.astype("datetime64[M]")).astype(int))
+    k = np.arange(months_back // step + 2)[::-1]
+
+    months = maturity_month - step * k
+    days_in_month = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(int)
+    # End-of-month rolling only for maturities on the 29th-31st that end their month;
+    # a 28 February maturity keeps paying on the 28th (never the 29th in leap years)
+    end_of_month = maturity_day == days_in_month[-1] and maturity_day > 28
+    day = days_in_month if end_of_month else np.minimum(maturity_day, days_in_month)
+    dates = months.astype("datetime64[D]") + (day - 1)
+
+    # Keep one roll date on or before the earliest date, replaced by the issue date if given;
+    # the roll date itself is the quasi-coupon date that starts a short first period
+    dates = dates[np.searchsorted(dates, earliest, side="right") - 1:]
+    quasi_start = dates[0]
+    if issue is not None:
+        dates[0] = earliest
+
+    dates.setflags(write=False)
+    return dates, quasi_start
+
+
+def _schedule(maturity, frequency, issue):
+    return _cached_schedule(
+        _to_date(maturity), int(frequency), None if issue is None or pd.isna(issue) else _to_date(issue)
+    )
+
+
+def coupon_schedule(maturity, frequency, issue=None):
+    """
+    Coupon dates rolled back from maturity, oldest first, as a read-only
+    datetime64 array.
+
+    The first entry is the issue date (or the roll date just before
+    MAX_SCHEDULE_YEARS back), so every settlement after it falls in a
+    period with a known start. The dates do not depend on the day-count
+    convention, so books share few distinct schedules; they are memoized
+    by (maturity, frequency, issue) with an LRU bound.
+    """
+    return _schedule(maturity, frequency, issue)[0]
+
+
+# ---------------------------------------------------------
+# DATED PRICING (clean / dirty / accrued)
+# ---------------------------------------------------------
+def price_dated_bonds(face_value, coupon_rate, yield_rate, maturity, frequency,
+                      settlement, convention="30/360", issue=None):
+    """
+    Clean price, dirty price and accrued interest for bonds priced on a
+    settlement date.
+
+    Bonds are grouped by schedule (maturity, frequency, issue); each group
+    reads its memoized schedule once and locates every settlement date with
+    searchsorted. Day counts are then applied to the whole book at once.
+    Dirty price discounts the N remaining cash flows over a fractional
+    first period w:  dirty = (1 + y/f)^(1 - w) * P_N,  where P_N is the
+    whole-period closed-form price. In a short first coupon period w and
+    the accrual are measured against the notional regular period that
+    starts at the quasi-coupon date before issue. A settlement date before
+    the issue date raises a ValueError.
+    """
+    face_value, coupon_rate, yield_rate = (
+        np.atleast_1d(np.asarray(a, dtype=float)) for a in np.broadcast_arrays(face_value, coupon_rate, yield_rate)
+    )
+    size = face_value.size
+    shape = (size,)
+    maturity = np.broadcast_to(np.asarray(maturity, dtype="datetime64[D]"), shape)
+    settlement = np.broadcast_to(np.asarray(settlement, dtype="datetime64[D]"), shape)
+    issue = np.broadcast_to(np.asarray(issue if issue is not None else "NaT", dtype="datetime64[D]"), shape)
+    frequency = np.broadcast_to(_as_frequency(frequency), shape)
+    convention = np.broadcast_to(np.asarray(convention), shape)
+
+    if np.any(settlement < issue):
+        raise ValueError("Settlement date is before the issue date")
+
+    period_start = np.empty(size, dtype="datetime64[D]")
+    notional_start = np.empty(size, dtype="datetime64[D]")
+    period_end = np.empty(size, dtype="datetime64[D]")
+    remaining = np.zeros(size)
+
+    keys = np.stack([maturity.astype(np.int64), frequency.astype(np.int64), issue.astype(np.int64)])
+    _, group = np.unique(keys, axis=1, return_inverse=True)
+    order = np.argsort(group.ravel(), kind="stable")
+    bounds = np.cumsum(np.bincount(group.ravel()))[:-1]
+
+    for rows in np.split(order, bounds):
+        first = rows[0]
+        schedule, quasi_start = _schedule(maturity[first], frequency[first], issue[first])
+        settle = settlement[rows]
+        nxt = np.clip(np.searchsorted(schedule, settle, side="right"), 1, len(schedule) - 1)
+        period_start[rows] = schedule[nxt - 1]
+        notional_start[rows] = np.where(nxt == 1, quasi_start, schedule[nxt - 1])
+        period_end[rows] = schedule[nxt]
+        remaining[rows] = np.where(settle < schedule[-1], len(schedule) - nxt, 0)
+
+    fraction = np.zeros(size)
+    elapsed = np.zeros(size)
+    for conv in np.unique(convention):
+        mask = convention == conv
+        fraction[mask] = accrual_fraction(
+            period_start[mask], settlement[mask], notional_start[mask], period_end[mask], frequency[mask], conv
+        )
+        elapsed[mask] = accrual_fraction(
+            notional_start[mask], settlement[mask], notional_start[mask], period_end[mask], frequency[mask], conv
+        )
+
+    coupon_payment = face_value * coupon_rate / frequency
+    period_yield = yield_rate / frequency
+
+    annuity, discount_n = annuity_factor(period_yield, remaining)
+    whole_period_price = coupon_payment * annuity + face_value * discount_n
+    dirty = np.where(remaining > 0, whole_period_price * (1 + period_yield) ** elapsed, 0.0)
+    accrued = np.where(remaining > 0, coupon_payment * fraction, 0.0)
+
+    return {
+        "clean_price": dirty - accrued,
+        "dirty_price": dirty,
+        "accrued_interest": accrued,
+        "periods_remaining": remaining,
+    }
+
+
+def price_dated_book(book, settlement):
+    """
+    Add clean price, dirty price and accrued interest to a priced book.
+
+    Uses the book's `maturity_date` column, plus optional `settlement_date`,
+    `day_count` (default 30/360) and `issue_date` columns. Rates are in percent.
+    """
+    out = book.copy()
+    dated = price_dated_bonds(
+        book["face_value"].to_numpy(dtype=float),
+        book["coupon_rate"].to_numpy(dtype=float) / 100,
+        book["yield_rate"].to_numpy(dtype=float) / 100,
+        pd.to_datetime(book["maturity_date"]).to_numpy(),
+        book["frequency"].to_numpy(),
+        pd.to_datetime(book["settlement_date"]).to_numpy() if "settlement_date" in book else settlement,
+        book["day_count"].to_numpy() if "day_count" in book else "30/360",
+        pd.to_datetime(book["issue_date"]).to_numpy() if "issue_date" in book else None,
+    )
+    for name, values in dated.items():
+        out[name] = values
+    return out
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from components.npv_engine import discount_factors, npv, period_rate
+
+
+DEFAULT_SHOCKS = np.linspace(-0.2, 0.2, 9)
+
+
+def relative_shocks(low=-0.2, high=0.2, points=9):
+    """Evenly spaced relative moves (decimals) for spider curves, always including 0."""
+    return np.union1d(np.linspace(low, high, int(points)), [0.0])
+
+
+# ---------------------------------------------------------
+# GENERIC MODELS (any vectorized pricing function)
+# ---------------------------------------------------------
+def _scaled(value, shocks):
+    """`value` times (1 + shock), with the shocks on a new leading axis."""
+    value = np.asarray(value, dtype=float)
+    return value * (1 + shocks.reshape(shocks.shape + (1,) * value.ndim))
+
+
+def spider_curves(model, inputs, variables, shocks=DEFAULT_SHOCKS):
+    """
+    Model output as each variable moves by the relative `shocks`, one at a time.
+
+    `model` is any function of keyword arrays that broadcasts (npv,
+    price_bonds, a DCF engine, ...). Each variable is scaled along a new
+    leading axis, so one model call evaluates a whole curve; array-valued
+    inputs such as a cash-flow vector are scaled as a whole.
+    Returns a DataFrame indexed by shock with one column per variable.
+    """
+    shocks = np.asarray(shocks, dtype=float)
+    curves = {}
+    for name in variables:
+        curves[name] = np.broadcast_to(model(**{**inputs, name: _scaled(inputs[name], shocks)}), shocks.shape)
+    return pd.DataFrame(curves, index=pd.Index(shocks, name="shock"))
+
+
+def numeric_gradient(model, inputs, variables, rel_step=1e-6):
+    """
+    Central-difference derivative of a scalar model output with respect to
+    each variable, for models without analytic derivatives. Both bumps of a
+    variable are evaluated in one broadcast call.
+    """
+    gradient = {}
+    for name in variables:
+        value = float(inputs[name])
+        h = rel_step * max(abs(value), 1.0)
+        low, high = model(**{**inputs, name: np.array([value - h, value + h])})
+        gradient[name] = (high - low) / (2 * h)
+    return gradient
+
+
+def top_drivers(impacts, n=None):
+    """
+    Rank variables by the size of their impact, largest first.
+
+    `impacts` maps a variable name to the output change it causes (for
+    example gradient * value * 1%). Returns a DataFrame with the impact and
+    each variable's share of the total absolute impact (0 when nothing
+    moves the output).
+    """
+    drivers = pd.DataFrame({"Variable": list(impacts), "Impact": np.asarray(list(impacts.values()), dtype=float)})
+    total = drivers["Impact"].abs().sum()
+    drivers["Share"] = drivers["Impact"].abs() / total if total > 0 else 0.0
+    drivers = drivers.reindex(drivers["Impact"].abs().sort_values(ascending=False).index)
+    return drivers.head(n).reset_index(drop=True) if n else drivers.reset_index(drop=True)
+
+
+# ---------------------------------------------------------
+# NPV (analytic)
+# ---------------------------------------------------------
+def npv_gradient(initial_investment, cash_flows, annual_discount_rate, periods_per_year=1):
+    """
+    Analytic derivatives of NPV with respect to every input, in one pass.
+
+    NPV is linear in the investment (derivative -1) and in each cash flow
+    (derivative = its discount factor). For the rate,
+    dNPV/dr = -sum(t * CF_t * v^t) / (1 + r) per period, converted to the
+    annually compounded rate the page uses. Cash flows have the periods on
+    the last axis, so many projects are handled at once.
+    Returns {"initial_investment", "cash_flows", "discount_rate"}.
+    """
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    rate = period_rate(annual_discount_rate, periods_per_year)
+    factors = discount_factors(rate, cash_flows.shape[-1])
+    t = np.arange(1, cash_flows.shape[-1] + 1)
+
+    d_period_rate = -np.einsum("...t,...t->...", cash_flows * t, factors) / (1 + rate)
+    d_annual_rate = d_period_rate / (periods_per_year * (1 + rate) ** (periods_per_year - 1))
+
+    return {
+        "initial_investment": -np.ones_like(np.asarray(initial_investment, dtype=float)),
+        "cash_flows": factors,
+        "discount_rate": d_annual_rate,
+    }
+
+
+def npv_driver_impacts(initial_investment, cash_flows, annual_discount_rate, periods_per_year=1,
+                       period_name="Year", move=0.01):
+    """NPV change for a `move` (relative) in each input of one project, from the analytic gradient."""
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    gradient = npv_gradient(initial_investment, cash_flows, annual_discount_rate, periods_per_year)
+    impacts = {
+        "Initial Investment": gradient["initial_investment"] * initial_investment * move,
+        "Discount Rate": gradient["discount_rate"] * annual_discount_rate * move,
+    }
+    for k, impact in enumerate(gradient["cash_flows"] * cash_flows * move, start=1):
+        impacts[f"{period_name} {k} Cash Flow"] = impact
+    return impacts
+
+
+def npv_spider(initial_investment, cash_flows, annual_discount_rate, periods_per_year=1,
+               shocks=DEFAULT_SHOCKS, period_name="Year", periods=None):
+    """
+    Spider curves of NPV for the investment, all cash flows together, the
+    discount rate and (optionally) individual periods.
+
+    Investment and cash-flow curves are exact straight lines through the
+    base NPV with the analytic gradient as slope; the rate curve is one
+    broadcast NPV call over all shocked rates. `periods` lists the 1-based
+    periods that get their own curve.
+    """
+    shocks = np.asarray(shocks, dtype=float)
+    cash_flows = np.asarray(cash_flows, dtype=float)
+    gradient = npv_gradient(initial_investment, cash_flows, annual_discount_rate, periods_per_year)
+    pv_by_period = gradient["cash_flows"] * cash_flows
+    base = pv_by_period.sum() - initial_investment
+
+    rates = period_rate(annual_discount_rate * (1 + shocks), periods_per_year)
+    curves = {
+        "Initial Investment": base - shocks * initial_investment,
+        "Cash Flows": base + shocks * pv_by_period.sum(),
+        "Discount Rate": npv(initial_investment, cash_flows, rates),
+    }
+    for k in periods or []:
+        curves[f"{period_name} {k} Cash Flow"] = base + shocks * pv_by_period[k - 1]
+    return pd.DataFrame(curves, index=pd.Index(shocks, name="shock"))
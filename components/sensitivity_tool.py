@@ -0,0 +1,52 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+
+from components.sensitivity import numeric_gradient, relative_shocks, spider_curves, top_drivers
+
+
+def render_sensitivity(model, inputs, variables, output_label, key):
+    """
+    Spider chart and top-driver ranking for any calculator.
+
+    `model` maps keyword inputs to one output array (it must broadcast, as
+    the engines do); `variables` maps the inputs to vary to their labels.
+    Impacts are the output change for a +1% move in each input, from
+    central differences.
+    """
+    col1, col2 = st.columns(2)
+    with col1:
+        spider_range = st.slider("Range (±%)", min_value=5, max_value=100, value=20, step=5, key=f"{key}_range")
+    with col2:
+        spider_points = st.number_input(
+            "Points per Curve", min_value=3, max_value=201, value=21, step=2, key=f"{key}_points"
+        )
+
+    spider = spider_curves(
+        model, inputs, list(variables), relative_shocks(-spider_range / 100, spider_range / 100, spider_points)
+    ).rename(columns=variables)
+
+    fig = go.Figure()
+    for name in spider.columns:
+        fig.add_trace(go.Scatter(x=spider.index * 100, y=spider[name], mode="lines", name=name))
+
+    fig.update_layout(
+        title=f"Spider Chart ({output_label} vs. Change in Each Input)",
+        xaxis_title="Change in Input (%)",
+        yaxis_title=output_label,
+        template="simple_white",
+        height=450
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    gradient = numeric_gradient(model, inputs, list(variables))
+    drivers = top_drivers({label: gradient[name] * inputs[name] * 0.01 for name, label in variables.items()})
+
+    st.dataframe(
+        drivers.rename(columns={"Impact": f"{output_label} Impact of +1%", "Share": "Share of Total Impact"}).style.format({
+            f"{output_label} Impact of +1%": "{:,.4f}",
+            "Share of Total Impact": lambda x: f"{x:.1%}" if np.isfinite(x) else "–"
+        }),
+        hide_index=True
+    )
@@ -1,6 +1,11 @@
+import numpy as np
 import streamlit as st
 import streamlit.components.v1 as components
 
+
+HISTOGRAM_BINS = 100
+
+
 def scroll_top():
     components.html(
         """
@@ -10,3 +15,20 @@ def scroll_top():
         """,
         height=0,
     )
+
+
+def binned_histogram(values, bins=HISTOGRAM_BINS, clip_percentiles=(0.1, 99.9)):
+    """
+    Histogram counts computed server-side, so the chart receives `bins`
+    bars instead of every path. Values outside the clip percentiles are
+    counted in the outermost bins.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return np.zeros(0), np.zeros(1)
+    low, high = np.percentile(values, clip_percentiles)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    counts, edges = np.histogram(np.clip(values, low, high), bins=bins, range=(low, high))
+    return counts, edges
@@ -1,5 +1,8 @@
 import streamlit as st
 
+from components import wacc_engine
+from components.goal_seek_tool import render_goal_seek
+
 
 def render_wacc_tool():
 
@@ -126,18 +129,12 @@ def render_wacc_tool():
     # ---------------------------------------------------------
     # CALCULATIONS
     # ---------------------------------------------------------
-    total_value = equity_value + debt_value
-
-    if total_value > 0:
-        weight_equity = equity_value / total_value
-        weight_debt = debt_value / total_value
-    else:
-        weight_equity = 0
-        weight_debt = 0
+    result = wacc_engine.wacc(equity_value, debt_value, cost_of_equity, cost_of_debt, tax_rate)
 
-    after_tax_cost_of_debt = cost_of_debt * (1 - tax_rate)
-
-    wacc = (weight_equity * cost_of_equity) + (weight_debt * after_tax_cost_of_debt)
+    weight_equity = float(result["weight_equity"])
+    weight_debt = float(result["weight_debt"])
+    after_tax_cost_of_debt = float(result["after_tax_cost_of_debt"])
+    wacc = float(result["wacc"])
 
     # ---------------------------------------------------------
     # RESULTS
@@ -160,6 +157,23 @@ def render_wacc_tool():
     | After-Tax Cost of Debt | **{after_tax_cost_of_debt*100:.2f}%** |
     """)
 
+    # ---------------------------------------------------------
+    # GOAL SEEK
+    # ---------------------------------------------------------
+    st.divider()
+    st.subheader("🎯 Goal Seek")
+
+    render_goal_seek(
+        "wacc",
+        {
+            "debt_weight": weight_debt,
+            "cost_of_equity": cost_of_equity,
+            "cost_of_debt": cost_of_debt,
+            "tax_rate": tax_rate,
+        },
+        key="wacc_goal"
+    )
+
     # ---------------------------------------------------------
     # INFORMATION SECTION (ALL TOGETHER AT BOTTOM)
     # ---------------------------------------------------------
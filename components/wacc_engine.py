@@ -0,0 +1,30 @@
+import numpy as np
+
+
+# ---------------------------------------------------------
+# WACC (vectorized)
+# ---------------------------------------------------------
+def wacc(equity_value, debt_value, cost_of_equity, cost_of_debt, tax_rate):
+    """
+    Weighted average cost of capital, WACC = E/V * Re + D/V * Rd * (1 - T).
+
+    Rates are decimals and every input may be an array; they broadcast
+    against each other. With no capital (V = 0) both weights are zero, as
+    on the page. Returns the weights, the after-tax cost of debt and WACC.
+    """
+    equity_value = np.asarray(equity_value, dtype=float)
+    debt_value = np.asarray(debt_value, dtype=float)
+    total_value = equity_value + debt_value
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weight_equity = np.where(total_value > 0, equity_value / total_value, 0.0)
+        weight_debt = np.where(total_value > 0, debt_value / total_value, 0.0)
+
+    after_tax_cost_of_debt = np.asarray(cost_of_debt, dtype=float) * (1 - np.asarray(tax_rate, dtype=float))
+
+    return {
+        "weight_equity": weight_equity,
+        "weight_debt": weight_debt,
+        "after_tax_cost_of_debt": after_tax_cost_of_debt,
+        "wacc": weight_equity * np.asarray(cost_of_equity, dtype=float) + weight_debt * after_tax_cost_of_debt,
+    }
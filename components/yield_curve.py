@@ -0,0 +1,239 @@
+import numpy as np
+
+from components.bond_engine import bond_arrays, bond_terms
+
+
+INTERPOLATION_METHODS = {"Linear": "linear", "Monotone Convex": "monotone_convex"}
+DISCOUNT_CACHE_SIZE = 100_000
+
+
+# ---------------------------------------------------------
+# MONOTONE CONVEX INTERPOLATION (Hagan & West, 2006)
+# ---------------------------------------------------------
+def _monotone_convex_forwards(times, rt):
+    """Discrete forwards per interval and instantaneous forwards at the nodes."""
+    dt = np.diff(times)
+    f_discrete = np.diff(rt) / dt
+
+    f_nodes = np.empty(len(times))
+    if len(f_discrete) == 1:
+        f_nodes[:] = f_discrete[0]
+        return f_discrete, f_nodes
+
+    w = dt[:-1] / (dt[:-1] + dt[1:])
+    f_nodes[1:-1] = w * f_discrete[1:] + (1 - w) * f_discrete[:-1]
+    f_nodes[0] = f_discrete[0] - 0.5 * (f_nodes[1] - f_discrete[0])
+    f_nodes[-1] = f_discrete[-1] - 0.5 * (f_nodes[-2] - f_discrete[-1])
+    return f_discrete, f_nodes
+
+
+def _ratio(num, den):
+    return np.divide(num, den, out=np.zeros(np.broadcast(num, den).shape), where=den != 0)
+
+
+def _monotone_convex_integral(g0, g1, x):
+    """Integral over [0, x] of the Hagan-West forward correction g on one interval."""
+    # Region (i): quadratic
+    r1 = ((g0 < 0) & (-g0 / 2 <= g1) & (g1 <= -2 * g0)) | (
+        (g0 > 0) & (-g0 / 2 >= g1) & (g1 >= -2 * g0)
+    )
+    # Region (ii): flat, then quadratic
+    r2 = ~r1 & (((g0 < 0) & (g1 > -2 * g0)) | ((g0 > 0) & (g1 < -2 * g0)))
+    # Region (iii): quadratic, then flat
+    r3 = ~r1 & ~r2 & (((g0 > 0) & (0 > g1) & (g1 > -g0 / 2)) | ((g0 < 0) & (0 < g1) & (g1 < -g0 / 2)))
+    # Region (iv): both ends the same sign
+    r4 = ~r1 & ~r2 & ~r3
+
+    G = np.where(r1, g0 * (x - 2 * x ** 2 + x ** 3) + g1 * (x ** 3 - x ** 2), 0.0)
+
+    eta = _ratio(g1 + 2 * g0, g1 - g0)
+    tail = np.clip(x - eta, 0, None)
+    G = np.where(r2, g0 * x + _ratio((g1 - g0) * tail ** 3, 3 * (1 - eta) ** 2), G)
+
+    eta = _ratio(3 * g1, g1 - g0)
+    head = np.clip(eta - x, 0, None)
+    G = np.where(r3, g1 * x + _ratio((g0 - g1) * (eta ** 3 - head ** 3), 3 * eta ** 2), G)
+
+    eta = _ratio(g1, g1 + g0)
+    a = _ratio(-g0 * g1, g0 + g1)
+    head = np.clip(eta - x, 0, None)
+    tail = np.clip(x - eta, 0, None)
+    G = np.where(
+        r4,
+        a * x
+        + _ratio((g0 - a) * (eta ** 3 - head ** 3), 3 * eta ** 2)
+        + _ratio((g1 - a) * tail ** 3, 3 * (1 - eta) ** 2),
+        G,
+    )
+    return G
+
+
+# ---------------------------------------------------------
+# YIELD CURVE
+# ---------------------------------------------------------
+class YieldCurve:
+    """
+    Zero curve with cached discount factors.
+
+    Rates are annually compounded decimals at the given tenors (years).
+    Interpolation runs on continuously compounded rates: "linear" on zero
+    rates, "monotone_convex" on forwards (Hagan & West). Discount factors
+    are cached on a sorted time grid and looked up with searchsorted, so
+    repeated cash-flow dates across a book are interpolated only once. The
+    grid holds at most DISCOUNT_CACHE_SIZE times; lookups that would grow
+    it further are interpolated without being cached.
+    """
+
+    def __init__(self, tenors, zero_rates, method="linear"):
+        tenors = np.asarray(tenors, dtype=float)
+        zero_rates = np.asarray(zero_rates, dtype=float)
+        if tenors.shape != zero_rates.shape or tenors.size == 0:
+            raise ValueError("Tenors and zero rates must be non-empty and of equal length")
+        if np.any(tenors <= 0):
+            raise ValueError("Tenors must be positive")
+        if method not in INTERPOLATION_METHODS.values():
+            raise ValueError(f"Unknown interpolation method: {method}")
+
+        order = np.argsort(tenors)
+        self.tenors = tenors[order]
+        self.zero_rates = zero_rates[order]
+        self.method = method
+
+        self._times = np.concatenate([[0.0], self.tenors])
+        self._rt = np.concatenate([[0.0], np.log1p(self.zero_rates) * self.tenors])
+        if method == "monotone_convex":
+            self._f_discrete, self._f_nodes = _monotone_convex_forwards(self._times, self._rt)
+
+        self._grid_t = np.empty(0)
+        self._grid_df = np.empty(0)
+
+    # -----------------------------
+    # Constructors
+    # -----------------------------
+    @classmethod
+    def from_zero(cls, tenors, zero_rates, method="linear"):
+        return cls(tenors, zero_rates, method)
+
+    @classmethod
+    def from_par(cls, tenors, par_rates, frequency=2, method="linear"):
+        """
+        Bootstrap from par yields of bonds paying `frequency` coupons a year.
+
+        Par rates are linearly interpolated onto every coupon date and the
+        discount factors solved date by date from 1 = c/f * sum(DF) + DF_N.
+        """
+        tenors = np.asarray(tenors, dtype=float)
+        par_rates = np.asarray(par_rates, dtype=float)
+        order = np.argsort(tenors)
+        tenors, par_rates = tenors[order], par_rates[order]
+
+        grid = np.arange(1, int(np.ceil(tenors[-1] * frequency)) + 1) / frequency
+        coupons = np.interp(grid, tenors, par_rates) / frequency
+
+        dfs = np.empty(len(grid))
+        annuity = 0.0
+        for k, c in enumerate(coupons):
+            dfs[k] = (1 - c * annuity) / (1 + c)
+            annuity += dfs[k]
+
+        zero_rates = dfs ** (-1 / grid) - 1
+        return cls(grid, zero_rates, method)
+
+    # -----------------------------
+    # Interpolation
+    # -----------------------------
+    def _log_discount(self, t):
+        """-ln DF(t), i.e. the continuously compounded zero rate times t."""
+        t = np.asarray(t, dtype=float)
+        times, rt = self._times, self._rt
+        i = np.clip(np.searchsorted(times, t, side="left"), 1, len(times) - 1)
+        dt = times[i] - times[i - 1]
+        x = (t - times[i - 1]) / dt
+
+        if self.method == "linear":
+            r = rt[1:] / self.tenors
+            r_nodes = np.concatenate([[r[0]], r])
+            zero = r_nodes[i - 1] + (r_nodes[i] - r_nodes[i - 1]) * np.clip(x, 0, 1)
+            return zero * t
+
+        fd = self._f_discrete[i - 1]
+        g0 = self._f_nodes[i - 1] - fd
+        g1 = self._f_nodes[i] - fd
+        inside = rt[i - 1] + dt * (fd * x + _monotone_convex_integral(g0, g1, np.clip(x, 0, 1)))
+        beyond = rt[-1] + self._f_nodes[-1] * (t - times[-1])
+        return np.where(t > times[-1], beyond, inside)
+
+    def zero_rate(self, t):
+        """Annually compounded zero rate at t."""
+        t = np.asarray(t, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.expm1(self._log_discount(t) / t)
+        return np.where(t > 0, rate, self.zero_rates[0])
+
+    def forward_rate(self, t1, t2):
+        """Annually compounded forward rate between t1 and t2."""
+        t1 = np.asarray(t1, dtype=float)
+        t2 = np.asarray(t2, dtype=float)
+        return np.expm1((self._log_discount(t2) - self._log_discount(t1)) / (t2 - t1))
+
+    # -----------------------------
+    # Cached discount factors
+    # -----------------------------
+    def discount(self, t):
+        """Discount factors at times t (years), served from the sorted grid cache when it has room."""
+        t = np.asarray(t, dtype=float)
+        flat = t.ravel()
+
+        idx = np.searchsorted(self._grid_t, flat)
+        hit = idx < len(self._grid_t)
+        hit[hit] = self._grid_t[idx[hit]] == flat[hit]
+
+        if not hit.all():
+            new_t = np.unique(flat[~hit])
+            new_df = np.exp(-self._log_discount(new_t))
+            if len(self._grid_t) + len(new_t) > DISCOUNT_CACHE_SIZE:
+                df = np.empty(flat.shape)
+                df[hit] = self._grid_df[idx[hit]]
+                df[~hit] = new_df[np.searchsorted(new_t, flat[~hit])]
+                return df.reshape(t.shape)
+            grid_t = np.concatenate([self._grid_t, new_t])
+            order = np.argsort(grid_t, kind="stable")
+            self._grid_t = grid_t[order]
+            self._grid_df = np.concatenate([self._grid_df, new_df])[order]
+            idx = np.searchsorted(self._grid_t, flat)
+
+        return self._grid_df[idx].reshape(t.shape)
+
+    def annuity_table(self, frequency, periods):
+        """Discount factors and their running sums on the coupon grid k / f, k = 1..periods."""
+        dfs = self.discount(np.arange(1, int(periods) + 1) / frequency)
+        return dfs, np.cumsum(dfs)
+
+    # -----------------------------
+    # Bond pricing
+    # -----------------------------
+    def price_bonds(self, face_value, coupon_rate, years, frequency):
+        """
+        Price many bullet bonds off this curve.
+
+        Bonds are grouped by coupon frequency; each group needs one discount
+        factor vector on its coupon grid, and every bond's price is then
+        C * sum(DF[1..N]) + F * DF[N] read straight from the running sums.
+        """
+        face_value, coupon_rate, _, years, frequency = bond_arrays(
+            face_value, coupon_rate, 0.0, years, frequency
+        )
+        coupon_payment, total_periods = bond_terms(face_value, coupon_rate, years, frequency)
+        periods = total_periods.astype(int)
+
+        price = face_value.copy()
+        for f in np.unique(frequency):
+            group = frequency == f
+            n = periods[group]
+            if n.max() <= 0:
+                continue
+            dfs, annuity = self.annuity_table(f, n.max())
+            dfs = np.concatenate([[1.0], dfs])
+            annuity = np.concatenate([[0.0], annuity])
+            price[group] = coupon_payment[group] * annuity[n] + face_value[group] * dfs[n]
+        return price
@@ -0,0 +1,6 @@
+import streamlit as st
+from components.loan_tool import render_loan_tool
+
+st.session_state["visited_tool"] = True
+
+render_loan_tool()